@@ -10,7 +10,6 @@ import secrets
 import streamlit as st
 from datetime import datetime, timedelta
 import sys
-import sqlite3
 import bcrypt
 from pathlib import Path
 from contextlib import contextmanager
@@ -20,6 +19,9 @@ sys.path.insert(0, str(Path(__file__).parent))
 
 from utils.styling import get_css
 from utils.database import DatabaseManager, format_integer, format_percent
+from utils.db_pool import close_pool, read_connection, write_connection
+from utils.migrations import apply_migrations
+from utils.warmup import start_warmup
 
 # ---------------------------------------------------------------------------
 # Auth helpers (inline – avoids import issues on Streamlit Cloud)
@@ -55,9 +57,8 @@ def _db_is_valid() -> bool:
     if not _AUTH_DB.exists():
         return False
     try:
-        conn = sqlite3.connect(_AUTH_DB, check_same_thread=False)
-        result = conn.execute("PRAGMA integrity_check").fetchone()[0]
-        conn.close()
+        with read_connection(_AUTH_DB) as conn:
+            result = conn.execute("PRAGMA integrity_check").fetchone()[0]
         return result == "ok"
     except Exception:
         return False
@@ -65,6 +66,8 @@ def _db_is_valid() -> bool:
 
 def _recreate_auth_db():
     """Delete corrupted DB (keeping a backup) and create a fresh one."""
+    # Pooled connections would keep pointing at the old file
+    close_pool(_AUTH_DB)
     if _AUTH_DB.exists():
         backup = _AUTH_DB.with_suffix(".db.backup")
         try:
@@ -78,17 +81,16 @@ def _recreate_auth_db():
 
 @contextmanager
 def _auth_conn():
-    conn = sqlite3.connect(_AUTH_DB, check_same_thread=False)
-    conn.execute("PRAGMA journal_mode=WAL")
-    conn.row_factory = sqlite3.Row
-    try:
+    """Pooled, serialized writer connection to auth.db."""
+    with write_connection(_AUTH_DB) as conn:
+        yield conn
+
+
+@contextmanager
+def _auth_read_conn():
+    """Pooled read-only connection to auth.db."""
+    with read_connection(_AUTH_DB) as conn:
         yield conn
-        conn.commit()
-    except Exception:
-        conn.rollback()
-        raise
-    finally:
-        conn.close()
 
 
 def _init_auth_tables():
@@ -132,7 +134,7 @@ def _init_auth_tables():
 def _ensure_admin_exists():
     """Create default admin user if the users table is empty."""
     try:
-        with _auth_conn() as conn:
+        with _auth_read_conn() as conn:
             cnt = conn.execute("SELECT COUNT(*) as c FROM users").fetchone()["c"]
         if cnt == 0:
             try:
@@ -158,7 +160,7 @@ def _create_user(email: str, password: str):
 
 
 def _verify_user(email: str, password: str):
-    with _auth_conn() as conn:
+    with _auth_read_conn() as conn:
         row = conn.execute(
             "SELECT id, email, hashed_password, is_active FROM users WHERE email = ?",
             (email.lower().strip(),),
@@ -171,7 +173,7 @@ def _verify_user(email: str, password: str):
 
 
 def _user_exists(email: str) -> bool:
-    with _auth_conn() as conn:
+    with _auth_read_conn() as conn:
         cnt = conn.execute(
             "SELECT COUNT(*) as c FROM users WHERE email = ?",
             (email.lower().strip(),),
@@ -198,7 +200,7 @@ def _validate_session_token(token: str):
     if not token:
         return None
     try:
-        with _auth_conn() as conn:
+        with _auth_read_conn() as conn:
             row = conn.execute(
                 "SELECT email, expires_at FROM sessions WHERE token = ?",
                 (token,),
@@ -497,6 +499,12 @@ def _login_page():
 def main():
     """Main dashboard application."""
 
+    # Create missing query indexes before anything reads (one PRAGMA once up to date)
+    apply_migrations()
+
+    # Prefill query caches for every page's default view (once per process)
+    start_warmup()
+
     # Initialize auth system
     _init_auth_tables()
     _ensure_admin_exists()
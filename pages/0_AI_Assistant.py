@@ -6,7 +6,6 @@ Chat with AI about display industry data using Google Gemini.
 import streamlit as st
 import pandas as pd
 from datetime import datetime, date
-import sqlite3
 import json
 import time
 import requests
@@ -17,6 +16,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from utils.styling import get_css
 from utils.database import format_integer
+from utils.db_pool import DB_PATH, read_connection
 
 # Page config
 st.set_page_config(
@@ -34,9 +34,6 @@ if not st.session_state.get("password_correct", False):
     st.warning("Please login from the main page.")
     st.stop()
 
-# Database path
-DB_PATH = Path(__file__).parent.parent / "displayintel.db"
-
 # =============================================================================
 # Constants
 # =============================================================================
@@ -129,40 +126,38 @@ def can_make_request():
 
 def get_database_context():
     """Get summary of database contents for context."""
-    conn = sqlite3.connect(DB_PATH)
-
-    context_parts = []
+    with read_connection(DB_PATH) as conn:
+        context_parts = []
 
-    # News summary
-    try:
-        cursor = conn.execute("SELECT COUNT(*) FROM news")
-        news_count = cursor.fetchone()[0]
-        cursor = conn.execute("SELECT source, COUNT(*) FROM news GROUP BY source")
-        sources = dict(cursor.fetchall())
-        context_parts.append(f"News: {news_count} articles from {', '.join(sources.keys())}")
-    except:
-        pass
-
-    # Factories summary
-    try:
-        cursor = conn.execute("SELECT COUNT(*) FROM factories")
-        factory_count = cursor.fetchone()[0]
-        cursor = conn.execute("SELECT manufacturer, COUNT(*) FROM factories GROUP BY manufacturer ORDER BY COUNT(*) DESC LIMIT 5")
-        top_mfrs = [f"{r[0]} ({r[1]})" for r in cursor.fetchall()]
-        context_parts.append(f"Factories: {factory_count} facilities. Top: {', '.join(top_mfrs)}")
-    except:
-        pass
-
-    # Equipment orders summary
-    try:
-        cursor = conn.execute("SELECT COUNT(*), SUM(value_usd) FROM equipment_orders")
-        row = cursor.fetchone()
-        if row[0]:
-            context_parts.append(f"Equipment Orders: {row[0]} orders, ${row[1]/1e9:.1f}B total value")
-    except:
-        pass
+        # News summary
+        try:
+            cursor = conn.execute("SELECT COUNT(*) FROM news")
+            news_count = cursor.fetchone()[0]
+            cursor = conn.execute("SELECT source, COUNT(*) FROM news GROUP BY source")
+            sources = dict(cursor.fetchall())
+            context_parts.append(f"News: {news_count} articles from {', '.join(sources.keys())}")
+        except:
+            pass
+
+        # Factories summary
+        try:
+            cursor = conn.execute("SELECT COUNT(*) FROM factories")
+            factory_count = cursor.fetchone()[0]
+            cursor = conn.execute("SELECT manufacturer, COUNT(*) FROM factories GROUP BY manufacturer ORDER BY COUNT(*) DESC LIMIT 5")
+            top_mfrs = [f"{r[0]} ({r[1]})" for r in cursor.fetchall()]
+            context_parts.append(f"Factories: {factory_count} facilities. Top: {', '.join(top_mfrs)}")
+        except:
+            pass
+
+        # Equipment orders summary
+        try:
+            cursor = conn.execute("SELECT COUNT(*), SUM(value_usd) FROM equipment_orders")
+            row = cursor.fetchone()
+            if row[0]:
+                context_parts.append(f"Equipment Orders: {row[0]} orders, ${row[1]/1e9:.1f}B total value")
+        except:
+            pass
 
-    conn.close()
     return "\n".join(context_parts)
 
 
@@ -187,9 +182,9 @@ def execute_sql_query(query: str) -> tuple:
             return False, f"Query contains forbidden keyword: {keyword}"
 
     try:
-        conn = sqlite3.connect(DB_PATH)
-        df = pd.read_sql_query(query, conn)
-        conn.close()
+        # The pooled reader is query_only, so writes are rejected by SQLite too
+        with read_connection(DB_PATH) as conn:
+            df = pd.read_sql_query(query, conn)
 
         # Limit results
         if len(df) > 100:
@@ -6,7 +6,6 @@ Industry news, market updates, and media monitoring.
 import streamlit as st
 import pandas as pd
 from datetime import datetime, date, timedelta
-import sqlite3
 import sys
 from pathlib import Path
 
@@ -14,7 +13,11 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from utils.styling import get_css, get_plotly_theme
 from utils.database import format_integer
-from utils.news_scraper import scrape_all_korea_sources, update_all_articles_with_ai, analyze_sentiment
+from utils.data_version import bump_data_version
+from utils.db_pool import DB_PATH, read_connection, write_connection
+from utils.migrations import apply_migrations
+from utils.news_scraper import scrape_all_korea_sources, analyze_sentiment
+from utils.news_enrichment import enrichment_status, start_enrichment
 
 # Page config
 st.set_page_config(
@@ -32,9 +35,6 @@ if not st.session_state.get("password_correct", False):
     st.warning("Please login from the main page.")
     st.stop()
 
-# Database path
-DB_PATH = Path(__file__).parent.parent / "displayintel.db"
-
 # =============================================================================
 # Constants
 # =============================================================================
@@ -51,40 +51,13 @@ SENTIMENTS = ["Positive", "Neutral", "Negative", "Mixed"]
 
 def init_news_table():
     """Create news table if it doesn't exist, or migrate old schema."""
-    conn = sqlite3.connect(DB_PATH)
-
-    # Check if table exists and get its columns
-    cursor = conn.execute("PRAGMA table_info(news)")
-    columns = {row[1] for row in cursor.fetchall()}
-
-    if not columns:
-        # Table doesn't exist - create new schema
-        conn.execute("""
-            CREATE TABLE news (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                title TEXT NOT NULL,
-                source TEXT NOT NULL,
-                source_url TEXT,
-                article_url TEXT,
-                published_date DATE,
-                summary TEXT,
-                full_text TEXT,
-                suppliers_mentioned TEXT,
-                technologies_mentioned TEXT,
-                products_mentioned TEXT,
-                category TEXT,
-                sentiment TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        """)
-    else:
-        # Table exists - check if it has old schema (has 'content' but not 'sentiment')
-        if 'content' in columns and 'sentiment' not in columns:
-            # Migrate from old schema to new schema
-            # Rename old table
-            conn.execute("ALTER TABLE news RENAME TO news_old")
+    with write_connection(DB_PATH) as conn:
+        # Check if table exists and get its columns
+        cursor = conn.execute("PRAGMA table_info(news)")
+        columns = {row[1] for row in cursor.fetchall()}
 
-            # Create new table with correct schema
+        if not columns:
+            # Table doesn't exist - create new schema
             conn.execute("""
                 CREATE TABLE news (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -103,220 +76,237 @@ def init_news_table():
                     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
                 )
             """)
+        else:
+            # Table exists - check if it has old schema (has 'content' but not 'sentiment')
+            if 'content' in columns and 'sentiment' not in columns:
+                # Migrate from old schema to new schema
+                # Rename old table
+                conn.execute("ALTER TABLE news RENAME TO news_old")
+
+                # Create new table with correct schema
+                conn.execute("""
+                    CREATE TABLE news (
+                        id INTEGER PRIMARY KEY AUTOINCREMENT,
+                        title TEXT NOT NULL,
+                        source TEXT NOT NULL,
+                        source_url TEXT,
+                        article_url TEXT,
+                        published_date DATE,
+                        summary TEXT,
+                        full_text TEXT,
+                        suppliers_mentioned TEXT,
+                        technologies_mentioned TEXT,
+                        products_mentioned TEXT,
+                        category TEXT,
+                        sentiment TEXT,
+                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                    )
+                """)
+
+                # Migrate data from old table to new table
+                conn.execute("""
+                    INSERT INTO news (id, title, source, article_url, published_date, summary,
+                                      full_text, suppliers_mentioned, category, created_at)
+                    SELECT id, title, source, url, published_date, summary,
+                           content, manufacturers, category, created_at
+                    FROM news_old
+                """)
+
+                # Drop old table
+                conn.execute("DROP TABLE news_old")
+            elif 'sentiment' not in columns:
+                # Just add missing columns
+                try:
+                    conn.execute("ALTER TABLE news ADD COLUMN sentiment TEXT")
+                except:
+                    pass
+                try:
+                    conn.execute("ALTER TABLE news ADD COLUMN suppliers_mentioned TEXT")
+                except:
+                    pass
+                try:
+                    conn.execute("ALTER TABLE news ADD COLUMN technologies_mentioned TEXT")
+                except:
+                    pass
+                try:
+                    conn.execute("ALTER TABLE news ADD COLUMN products_mentioned TEXT")
+                except:
+                    pass
+                try:
+                    conn.execute("ALTER TABLE news ADD COLUMN full_text TEXT")
+                except:
+                    pass
+                try:
+                    conn.execute("ALTER TABLE news ADD COLUMN source_url TEXT")
+                except:
+                    pass
+                try:
+                    conn.execute("ALTER TABLE news ADD COLUMN article_url TEXT")
+                except:
+                    pass
 
-            # Migrate data from old table to new table
-            conn.execute("""
-                INSERT INTO news (id, title, source, article_url, published_date, summary,
-                                  full_text, suppliers_mentioned, category, created_at)
-                SELECT id, title, source, url, published_date, summary,
-                       content, manufacturers, category, created_at
-                FROM news_old
-            """)
+    # Indexes for a table created or altered above
+    apply_migrations(DB_PATH)
 
-            # Drop old table
-            conn.execute("DROP TABLE news_old")
-        elif 'sentiment' not in columns:
-            # Just add missing columns
-            try:
-                conn.execute("ALTER TABLE news ADD COLUMN sentiment TEXT")
-            except:
-                pass
-            try:
-                conn.execute("ALTER TABLE news ADD COLUMN suppliers_mentioned TEXT")
-            except:
-                pass
-            try:
-                conn.execute("ALTER TABLE news ADD COLUMN technologies_mentioned TEXT")
-            except:
-                pass
-            try:
-                conn.execute("ALTER TABLE news ADD COLUMN products_mentioned TEXT")
-            except:
-                pass
-            try:
-                conn.execute("ALTER TABLE news ADD COLUMN full_text TEXT")
-            except:
-                pass
-            try:
-                conn.execute("ALTER TABLE news ADD COLUMN source_url TEXT")
-            except:
-                pass
-            try:
-                conn.execute("ALTER TABLE news ADD COLUMN article_url TEXT")
-            except:
-                pass
-
-    conn.commit()
-    conn.close()
 
 def get_news_articles(supplier=None, source=None, category=None, sentiment=None,
                       start_date=None, end_date=None, search=None, limit=100, offset=0):
     """Get news articles with filters."""
-    conn = sqlite3.connect(DB_PATH)
-
-    query = "SELECT * FROM news WHERE 1=1"
-    params = []
+    with read_connection(DB_PATH) as conn:
+        query = "SELECT * FROM news WHERE 1=1"
+        params = []
 
-    if supplier and supplier != "All":
-        query += " AND suppliers_mentioned LIKE ?"
-        params.append(f"%{supplier}%")
+        if supplier and supplier != "All":
+            query += " AND suppliers_mentioned LIKE ?"
+            params.append(f"%{supplier}%")
 
-    if source and source != "All":
-        query += " AND source = ?"
-        params.append(source)
+        if source and source != "All":
+            query += " AND source = ?"
+            params.append(source)
 
-    if category and category != "All":
-        query += " AND category = ?"
-        params.append(category)
+        if category and category != "All":
+            query += " AND category = ?"
+            params.append(category)
 
-    if sentiment and sentiment != "All":
-        query += " AND sentiment = ?"
-        params.append(sentiment)
+        if sentiment and sentiment != "All":
+            query += " AND sentiment = ?"
+            params.append(sentiment)
 
-    if start_date:
-        query += " AND published_date >= ?"
-        params.append(start_date)
+        if start_date:
+            query += " AND published_date >= ?"
+            params.append(start_date)
 
-    if end_date:
-        query += " AND published_date <= ?"
-        params.append(end_date)
+        if end_date:
+            query += " AND published_date <= ?"
+            params.append(end_date)
 
-    if search:
-        query += " AND (title LIKE ? OR summary LIKE ? OR full_text LIKE ?)"
-        params.extend([f"%{search}%", f"%{search}%", f"%{search}%"])
+        if search:
+            query += " AND (title LIKE ? OR summary LIKE ? OR full_text LIKE ?)"
+            params.extend([f"%{search}%", f"%{search}%", f"%{search}%"])
 
-    query += " ORDER BY published_date DESC, created_at DESC LIMIT ? OFFSET ?"
-    params.extend([limit, offset])
+        query += " ORDER BY published_date DESC, created_at DESC LIMIT ? OFFSET ?"
+        params.extend([limit, offset])
 
-    df = pd.read_sql_query(query, conn, params=params)
-    conn.close()
+        df = pd.read_sql_query(query, conn, params=params)
     return df
 
 def get_news_count(supplier=None, source=None, category=None, sentiment=None,
                    start_date=None, end_date=None, search=None):
     """Get total count of news articles matching filters."""
-    conn = sqlite3.connect(DB_PATH)
+    with read_connection(DB_PATH) as conn:
+        query = "SELECT COUNT(*) as count FROM news WHERE 1=1"
+        params = []
 
-    query = "SELECT COUNT(*) as count FROM news WHERE 1=1"
-    params = []
+        if supplier and supplier != "All":
+            query += " AND suppliers_mentioned LIKE ?"
+            params.append(f"%{supplier}%")
 
-    if supplier and supplier != "All":
-        query += " AND suppliers_mentioned LIKE ?"
-        params.append(f"%{supplier}%")
+        if source and source != "All":
+            query += " AND source = ?"
+            params.append(source)
 
-    if source and source != "All":
-        query += " AND source = ?"
-        params.append(source)
+        if category and category != "All":
+            query += " AND category = ?"
+            params.append(category)
 
-    if category and category != "All":
-        query += " AND category = ?"
-        params.append(category)
+        if sentiment and sentiment != "All":
+            query += " AND sentiment = ?"
+            params.append(sentiment)
 
-    if sentiment and sentiment != "All":
-        query += " AND sentiment = ?"
-        params.append(sentiment)
+        if start_date:
+            query += " AND published_date >= ?"
+            params.append(start_date)
 
-    if start_date:
-        query += " AND published_date >= ?"
-        params.append(start_date)
+        if end_date:
+            query += " AND published_date <= ?"
+            params.append(end_date)
 
-    if end_date:
-        query += " AND published_date <= ?"
-        params.append(end_date)
+        if search:
+            query += " AND (title LIKE ? OR summary LIKE ? OR full_text LIKE ?)"
+            params.extend([f"%{search}%", f"%{search}%", f"%{search}%"])
 
-    if search:
-        query += " AND (title LIKE ? OR summary LIKE ? OR full_text LIKE ?)"
-        params.extend([f"%{search}%", f"%{search}%", f"%{search}%"])
-
-    cursor = conn.execute(query, params)
-    count = cursor.fetchone()[0]
-    conn.close()
+        cursor = conn.execute(query, params)
+        count = cursor.fetchone()[0]
     return count
 
 def get_unique_sources():
     """Get list of unique news sources."""
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.execute("SELECT DISTINCT source FROM news ORDER BY source")
-    sources = [row[0] for row in cursor.fetchall()]
-    conn.close()
+    with read_connection(DB_PATH) as conn:
+        cursor = conn.execute("SELECT DISTINCT source FROM news ORDER BY source")
+        sources = [row[0] for row in cursor.fetchall()]
     return sources
 
 def save_news_article(article):
     """Save a news article to the database."""
-    conn = sqlite3.connect(DB_PATH)
     try:
-        conn.execute("""
-            INSERT INTO news (title, source, source_url, article_url, published_date,
-                            summary, full_text, suppliers_mentioned, technologies_mentioned,
-                            products_mentioned, category, sentiment)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
-            article.get('title'),
-            article.get('source'),
-            article.get('source_url'),
-            article.get('article_url'),
-            article.get('published_date'),
-            article.get('summary'),
-            article.get('full_text'),
-            article.get('suppliers_mentioned'),
-            article.get('technologies_mentioned'),
-            article.get('products_mentioned'),
-            article.get('category'),
-            article.get('sentiment')
-        ))
-        conn.commit()
+        with write_connection(DB_PATH) as conn:
+            conn.execute("""
+                INSERT INTO news (title, source, source_url, article_url, published_date,
+                                summary, full_text, suppliers_mentioned, technologies_mentioned,
+                                products_mentioned, category, sentiment)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, (
+                article.get('title'),
+                article.get('source'),
+                article.get('source_url'),
+                article.get('article_url'),
+                article.get('published_date'),
+                article.get('summary'),
+                article.get('full_text'),
+                article.get('suppliers_mentioned'),
+                article.get('technologies_mentioned'),
+                article.get('products_mentioned'),
+                article.get('category'),
+                article.get('sentiment')
+            ))
+            bump_data_version(conn, 'news')
         return True, None
     except Exception as e:
         return False, str(e)
-    finally:
-        conn.close()
 
 def delete_news_article(article_id):
     """Delete a news article."""
-    conn = sqlite3.connect(DB_PATH)
-    conn.execute("DELETE FROM news WHERE id = ?", (article_id,))
-    conn.commit()
-    conn.close()
+    with write_connection(DB_PATH) as conn:
+        conn.execute("DELETE FROM news WHERE id = ?", (article_id,))
+        bump_data_version(conn, 'news')
 
 def get_news_stats():
     """Get news statistics."""
-    conn = sqlite3.connect(DB_PATH)
-
-    stats = {}
-
-    # Total articles
-    cursor = conn.execute("SELECT COUNT(*) FROM news")
-    stats['total'] = cursor.fetchone()[0]
-
-    # By sentiment
-    cursor = conn.execute("""
-        SELECT sentiment, COUNT(*) as count FROM news
-        WHERE sentiment IS NOT NULL
-        GROUP BY sentiment
-    """)
-    stats['by_sentiment'] = {row[0]: row[1] for row in cursor.fetchall()}
-
-    # Most mentioned supplier
-    cursor = conn.execute("SELECT suppliers_mentioned FROM news WHERE suppliers_mentioned IS NOT NULL")
-    supplier_counts = {}
-    for row in cursor.fetchall():
-        for supplier in row[0].split(','):
-            supplier = supplier.strip()
-            if supplier:
-                supplier_counts[supplier] = supplier_counts.get(supplier, 0) + 1
-    if supplier_counts:
-        stats['top_supplier'] = max(supplier_counts, key=supplier_counts.get)
-        stats['top_supplier_count'] = supplier_counts[stats['top_supplier']]
-    else:
-        stats['top_supplier'] = None
-        stats['top_supplier_count'] = 0
-
-    # Latest article
-    cursor = conn.execute("SELECT published_date FROM news ORDER BY published_date DESC LIMIT 1")
-    row = cursor.fetchone()
-    stats['latest_date'] = row[0] if row else None
+    with read_connection(DB_PATH) as conn:
+        stats = {}
+
+        # Total articles
+        cursor = conn.execute("SELECT COUNT(*) FROM news")
+        stats['total'] = cursor.fetchone()[0]
+
+        # By sentiment
+        cursor = conn.execute("""
+            SELECT sentiment, COUNT(*) as count FROM news
+            WHERE sentiment IS NOT NULL
+            GROUP BY sentiment
+        """)
+        stats['by_sentiment'] = {row[0]: row[1] for row in cursor.fetchall()}
+
+        # Most mentioned supplier
+        cursor = conn.execute("SELECT suppliers_mentioned FROM news WHERE suppliers_mentioned IS NOT NULL")
+        supplier_counts = {}
+        for row in cursor.fetchall():
+            for supplier in row[0].split(','):
+                supplier = supplier.strip()
+                if supplier:
+                    supplier_counts[supplier] = supplier_counts.get(supplier, 0) + 1
+        if supplier_counts:
+            stats['top_supplier'] = max(supplier_counts, key=supplier_counts.get)
+            stats['top_supplier_count'] = supplier_counts[stats['top_supplier']]
+        else:
+            stats['top_supplier'] = None
+            stats['top_supplier_count'] = 0
+
+        # Latest article
+        cursor = conn.execute("SELECT published_date FROM news ORDER BY published_date DESC LIMIT 1")
+        row = cursor.fetchone()
+        stats['latest_date'] = row[0] if row else None
 
-    conn.close()
     return stats
 
 def insert_sample_data():
@@ -408,30 +398,30 @@ def insert_sample_data():
         }
     ]
 
-    conn = sqlite3.connect(DB_PATH)
-    inserted = 0
-    for article in sample_articles:
-        try:
-            # Check if article already exists
-            cursor = conn.execute("SELECT id FROM news WHERE title = ?", (article['title'],))
-            if cursor.fetchone() is None:
-                conn.execute("""
-                    INSERT INTO news (title, source, source_url, article_url, published_date,
-                                    summary, full_text, suppliers_mentioned, technologies_mentioned,
-                                    products_mentioned, category, sentiment)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    article['title'], article['source'], article['source_url'],
-                    article['article_url'], article['published_date'], article['summary'],
-                    article['full_text'], article['suppliers_mentioned'],
-                    article['technologies_mentioned'], article['products_mentioned'],
-                    article['category'], article['sentiment']
-                ))
-                inserted += 1
-        except:
-            pass
-    conn.commit()
-    conn.close()
+    with write_connection(DB_PATH) as conn:
+        inserted = 0
+        for article in sample_articles:
+            try:
+                # Check if article already exists
+                cursor = conn.execute("SELECT id FROM news WHERE title = ?", (article['title'],))
+                if cursor.fetchone() is None:
+                    conn.execute("""
+                        INSERT INTO news (title, source, source_url, article_url, published_date,
+                                        summary, full_text, suppliers_mentioned, technologies_mentioned,
+                                        products_mentioned, category, sentiment)
+                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    """, (
+                        article['title'], article['source'], article['source_url'],
+                        article['article_url'], article['published_date'], article['summary'],
+                        article['full_text'], article['suppliers_mentioned'],
+                        article['technologies_mentioned'], article['products_mentioned'],
+                        article['category'], article['sentiment']
+                    ))
+                    inserted += 1
+            except:
+                pass
+        if inserted:
+            bump_data_version(conn, 'news')
     return inserted
 
 # Initialize table
@@ -558,16 +548,30 @@ with tab1:
             help="Required for AI summaries"
         )
 
-        if st.button("Generate AI Summaries", use_container_width=True):
+        # Runs in a background thread so the page stays usable; progress is
+        # read from enrichment_status on each rerun
+        enrichment_running = enrichment_status.get('running', False)
+        if st.button("Generate AI Summaries", use_container_width=True, disabled=enrichment_running):
             if not api_key:
                 st.warning("Enter API key above")
+            elif start_enrichment(api_key=api_key, limit=50):
+                st.rerun()
+
+        if enrichment_running:
+            total = enrichment_status.get('total')
+            if total:
+                st.info(f"Generating summaries: {enrichment_status.get('sentiments_updated', 0)} "
+                        f"of {total} articles updated")
             else:
-                with st.spinner("Generating summaries..."):
-                    results = update_all_articles_with_ai(api_key)
-                st.success(f"Updated {results['sentiments_updated']} articles")
-                if results['summaries_generated'] > 0:
-                    st.info(f"Generated {results['summaries_generated']} AI summaries")
+                st.info("Generating summaries...")
+            if st.button("Refresh Status", use_container_width=True):
                 st.rerun()
+        elif enrichment_status.get('finished_at'):
+            if 'error' in enrichment_status:
+                st.error(f"AI processing failed: {enrichment_status['error'][:80]}")
+            else:
+                st.success(f"Updated {enrichment_status.get('sentiments_updated', 0)} articles, "
+                           f"{enrichment_status.get('summaries_generated', 0)} AI summaries")
 
         st.divider()
 
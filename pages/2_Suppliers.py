@@ -24,6 +24,7 @@ from utils.database import (
     PROCESS_STEP_NAMES
 )
 from utils.exports import create_download_buttons
+from utils.page_defaults import SUPPLIERS_YEAR_OPTIONS, SUPPLIERS_YEARS
 
 # Page config
 st.set_page_config(
@@ -53,9 +54,12 @@ st.markdown("""
 with st.sidebar:
     st.markdown("### Filters")
 
+    # All filter vocabularies in one cached lookup
+    dimensions = DatabaseManager.get_dimension_catalog()
+
     manufacturer = st.selectbox(
         "Manufacturer",
-        options=DatabaseManager.get_manufacturers(),
+        options=dimensions['manufacturers'],
         key="supplier_manufacturer"
     )
 
@@ -72,13 +76,13 @@ with st.sidebar:
 
     vendor = st.selectbox(
         "Vendor",
-        options=DatabaseManager.get_vendors(),
+        options=dimensions['vendors'],
         key="supplier_vendor"
     )
 
     equipment_type = st.selectbox(
         "Equipment Type",
-        options=DatabaseManager.get_equipment_types(),
+        options=dimensions['equipment_types'],
         key="supplier_equipment"
     )
 
@@ -89,15 +93,15 @@ with st.sidebar:
     with col1:
         start_year = st.selectbox(
             "Start Year",
-            options=list(range(2018, 2027)),
-            index=0,
+            options=SUPPLIERS_YEAR_OPTIONS,
+            index=SUPPLIERS_YEAR_OPTIONS.index(SUPPLIERS_YEARS[0]),
             key="supplier_start_year"
         )
     with col2:
         end_year = st.selectbox(
             "End Year",
-            options=list(range(2018, 2027)),
-            index=8,  # Default to 2026
+            options=SUPPLIERS_YEAR_OPTIONS,
+            index=SUPPLIERS_YEAR_OPTIONS.index(SUPPLIERS_YEARS[1]),
             key="supplier_end_year"
         )
 
@@ -126,6 +130,23 @@ if process_step_filter != "All":
     orders_df = orders_df[orders_df['_process_step'] == step_num]
     orders_df = orders_df.drop(columns=['_process_step'])
 
+# The same filters for charts aggregated in SQLite (DatabaseManager.aggregate)
+order_filters = {
+    'po_year': (start_year, end_year),
+    'manufacturer': manufacturer,
+    'vendor': vendor,
+    'equipment_type': equipment_type,
+}
+if factory != "All" and factory != "All Factories":
+    order_filters['factory'] = factory
+if process_step_filter != "All":
+    order_filters['process_step_num'] = step_num
+
+
+def order_totals(group_by, **measures):
+    """Aggregate the filtered orders by ``group_by``; measures as in DataFrame.agg."""
+    return DatabaseManager.aggregate('equipment_orders', group_by, measures, order_filters)
+
 # Add derived columns once
 if len(orders_df) > 0:
     orders_df = orders_df.copy()
@@ -217,7 +238,7 @@ with tab1:
             # Chart: top 10 vendors by spend
             st.markdown("#### Top 10 Vendors by Spend")
 
-            vendor_spend = orders_df.groupby('vendor')['amount_usd'].sum().reset_index()
+            vendor_spend = order_totals(['vendor'], amount_usd=('amount_usd', 'sum'))
             vendor_spend.columns = ['Vendor', 'Total Spend']
             vendor_spend = vendor_spend[vendor_spend['Vendor'].notna() & (vendor_spend['Vendor'] != '')]
             vendor_spend = vendor_spend.sort_values('Total Spend', ascending=True).tail(10)
@@ -269,16 +290,17 @@ with tab1:
             # Table: Equipment Type × Vendor × Tool Category × Process
             st.markdown("#### Equipment Purchases by Type, Vendor & Process")
 
-            group_cols = ['equipment_type', 'vendor', 'process_step']
+            group_cols = ['equipment_label', 'vendor', 'process_step']
             rename_cols = ['Equipment Type', 'Vendor', 'Process Step']
             if 'tool_category' in orders_df.columns:
                 group_cols.insert(2, 'tool_category')
                 rename_cols.insert(2, 'Tool Category')
 
-            equipment_vendor_df = orders_df.groupby(group_cols).agg({
-                'amount_usd': 'sum',
-                'units': 'sum'
-            }).reset_index()
+            equipment_vendor_df = order_totals(
+                group_cols,
+                amount_usd=('amount_usd', 'sum'),
+                units=('units', 'sum')
+            )
             equipment_vendor_df.columns = rename_cols + ['Total Spend', 'Units']
             equipment_vendor_df = equipment_vendor_df.sort_values('Total Spend', ascending=False)
 
@@ -298,7 +320,7 @@ with tab1:
             # Spend by Process Step — table with % of total + chart
             st.markdown("#### Spend by Process Step")
 
-            step_spend = orders_df.groupby('process_step')['amount_usd'].sum().reset_index()
+            step_spend = order_totals(['process_step'], amount_usd=('amount_usd', 'sum'))
             step_spend.columns = ['Process Step', 'Total Spend']
             step_total = step_spend['Total Spend'].sum()
             step_spend['% of Total'] = (step_spend['Total Spend'] / step_total * 100) if step_total > 0 else 0
@@ -364,8 +386,7 @@ with tab1:
             with col1:
                 st.markdown("#### Equipment Spend by Year")
 
-                valid_years = orders_df[orders_df['po_year'].notna()]
-                spend_by_year = valid_years.groupby('po_year')['amount_usd'].sum().reset_index()
+                spend_by_year = order_totals(['po_year'], amount_usd=('amount_usd', 'sum'))
                 spend_by_year.columns = ['year', 'amount_usd']
 
                 if len(spend_by_year) > 0:
@@ -390,11 +411,12 @@ with tab1:
             with col2:
                 st.markdown("#### Orders by Equipment Type")
 
-                valid_types = orders_df[orders_df['equipment_type'].notna() & (orders_df['equipment_type'] != '')]
-                type_counts = valid_types.groupby('equipment_type').agg({
-                    'amount_usd': 'sum',
-                    'id': 'count'
-                }).reset_index()
+                type_counts = order_totals(
+                    ['equipment_label'],
+                    amount_usd=('amount_usd', 'sum'),
+                    id=('id', 'count')
+                )
+                type_counts = type_counts[type_counts['equipment_label'] != '']
                 type_counts.columns = ['Equipment Type', 'Total Spend', 'Order Count']
                 type_counts = type_counts.nlargest(10, 'Total Spend')
 
@@ -416,7 +438,7 @@ with tab1:
             # Spend by Process Step with % of total
             st.markdown("#### Spend by Process Step")
 
-            step_spend = orders_df.groupby('process_step')['amount_usd'].sum().reset_index()
+            step_spend = order_totals(['process_step'], amount_usd=('amount_usd', 'sum'))
             step_spend.columns = ['Process Step', 'Total Spend']
             step_total = step_spend['Total Spend'].sum()
             step_spend['% of Total'] = (step_spend['Total Spend'] / step_total * 100) if step_total > 0 else 0
@@ -431,7 +453,7 @@ with tab1:
                 st.dataframe(step_display, use_container_width=True, hide_index=True)
             with col2:
                 chart_data = step_spend.sort_values('Total Spend', ascending=True).copy()
-                chart_data['spend_raw'] = orders_df.groupby('process_step')['amount_usd'].sum().reindex(chart_data['Process Step']).values
+                chart_data['spend_raw'] = chart_data['Total Spend']
                 if len(chart_data) > 0:
                     fig = px.bar(
                         chart_data,
@@ -458,19 +480,21 @@ with tab1:
             st.markdown("#### Equipment Unit Economics")
 
             has_tool_cat = 'tool_category' in orders_df.columns
-            group_cols_econ = ['equipment_type']
+            group_cols_econ = ['equipment_label']
             if has_tool_cat:
                 group_cols_econ.append('tool_category')
             group_cols_econ.append('process_step')
 
-            unit_economics = orders_df[orders_df['units'] > 0].groupby(group_cols_econ).agg({
-                'amount_usd': 'sum',
-                'units': 'sum'
-            }).reset_index()
+            # Only orders with a unit count (units > 0)
+            unit_economics = order_totals(
+                group_cols_econ,
+                amount_usd=('priced_amount_usd', 'sum'),
+                units=('priced_units', 'sum')
+            ).dropna(subset=['units'])
             unit_economics['Avg Unit Cost'] = unit_economics['amount_usd'] / unit_economics['units']
             unit_economics = unit_economics.sort_values('Avg Unit Cost', ascending=False)
 
-            rename_map = {'equipment_type': 'Equipment Type', 'amount_usd': 'Total Spend',
+            rename_map = {'equipment_label': 'Equipment Type', 'amount_usd': 'Total Spend',
                           'units': 'Total Units', 'process_step': 'Process Step'}
             if has_tool_cat:
                 rename_map['tool_category'] = 'Tool Category'
@@ -539,11 +563,12 @@ with tab2:
             st.markdown("#### Vendor Performance by Equipment Type")
 
             # Group by vendor and equipment type
-            vendor_equip = orders_df.groupby(['vendor', 'equipment_type']).agg({
-                'amount_usd': 'sum',
-                'units': 'sum',
-                'id': 'count'
-            }).reset_index()
+            vendor_equip = order_totals(
+                ['vendor', 'equipment_label'],
+                amount_usd=('amount_usd', 'sum'),
+                units=('units', 'sum'),
+                id=('id', 'count')
+            )
             vendor_equip.columns = ['Vendor', 'Equipment Type', 'Total Spend', 'Total Units', 'Order Count']
 
             # Calculate average order value
@@ -677,12 +702,13 @@ with tab3:
         st.divider()
         st.markdown("#### Orders by Manufacturer")
 
-        valid_mfr = orders_df[orders_df['manufacturer'].notna() & (orders_df['manufacturer'] != '')]
-        mfr_summary = valid_mfr.groupby('manufacturer').agg({
-            'amount_usd': 'sum',
-            'units': 'sum',
-            'id': 'count'
-        }).reset_index()
+        mfr_summary = order_totals(
+            ['manufacturer'],
+            amount_usd=('amount_usd', 'sum'),
+            units=('units', 'sum'),
+            id=('id', 'count')
+        )
+        mfr_summary = mfr_summary[mfr_summary['manufacturer'] != '']
         mfr_summary.columns = ['Manufacturer', 'Total Spend', 'Total Units', 'Order Count']
         mfr_summary = mfr_summary.sort_values('Total Spend', ascending=False)
 
@@ -7,7 +7,7 @@ import streamlit as st
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
-from datetime import datetime, date
+from datetime import datetime
 import re
 import sys
 from pathlib import Path
@@ -17,6 +17,8 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 from utils.styling import get_css, get_plotly_theme, apply_chart_theme, format_with_commas, format_percent
 from utils.database import DatabaseManager
 from utils.exports import create_download_buttons
+from utils.page_defaults import UTILIZATION_START, default_utilization_end
+from utils.scenario import load_scenario_by_fab
 
 # Page config
 st.set_page_config(
@@ -54,9 +56,12 @@ st.markdown("""
 with st.sidebar:
     st.markdown("### Filters")
 
+    # All filter vocabularies in one cached lookup
+    dimensions = DatabaseManager.get_dimension_catalog()
+
     manufacturer = st.selectbox(
         "Manufacturer",
-        options=DatabaseManager.get_manufacturers(),
+        options=dimensions['manufacturers'],
         key="factory_manufacturer"
     )
 
@@ -74,13 +79,13 @@ with st.sidebar:
     if selected_factory == "All Factories":
         technology = st.selectbox(
             "Technology",
-            options=DatabaseManager.get_technologies(),
+            options=dimensions['technologies'],
             key="factory_technology"
         )
 
         region = st.selectbox(
             "Region",
-            options=DatabaseManager.get_regions(),
+            options=dimensions['regions'],
             key="factory_region"
         )
 
@@ -106,17 +111,15 @@ with st.sidebar:
     with col1:
         start_date = st.date_input(
             "Start",
-            value=date(2023, 1, 1),
+            value=UTILIZATION_START,
             min_value=datetime.strptime(min_date, "%Y-%m-%d").date(),
             max_value=datetime.strptime(max_date, "%Y-%m-%d").date(),
             key="util_start"
         )
     with col2:
-        # Default end date to today (not max DB date which may be years in the future)
-        default_end = min(date.today(), datetime.strptime(max_date, "%Y-%m-%d").date())
         end_date = st.date_input(
             "End",
-            value=default_end,
+            value=default_utilization_end(max_date),
             min_value=datetime.strptime(min_date, "%Y-%m-%d").date(),
             max_value=datetime.strptime(max_date, "%Y-%m-%d").date(),
             key="util_end"
@@ -825,30 +828,37 @@ else:
 
     # Tab 3: Capacity Overview
     with tab3:
-        # Load utilization data for capacity analysis
+        # Capacity totals are aggregated in SQLite; future quarters with no
+        # actual data are left out
+        current_quarter_end = pd.Timestamp.today().to_period('Q').end_time.strftime("%Y-%m-%d")
+        capacity_filters = {
+            'date': (start_date.strftime("%Y-%m-%d"),
+                     min(end_date.strftime("%Y-%m-%d"), current_quarter_end))
+        }
+
+        def capacity_totals(group_by, filters=capacity_filters):
+            return DatabaseManager.aggregate(
+                'utilization', group_by,
+                {'capacity_ksheets': ('capacity_ksheets', 'sum')}, filters
+            ).set_index(group_by[0])['capacity_ksheets']
+
         try:
-            util_df = DatabaseManager.get_utilization(
-                start_date=start_date.strftime("%Y-%m-%d"),
-                end_date=end_date.strftime("%Y-%m-%d")
+            capacity_by_date = DatabaseManager.aggregate(
+                'utilization', ['date'],
+                {
+                    'capacity_ksheets': ('capacity_ksheets', 'sum'),
+                    'actual_input_ksheets': ('actual_input_ksheets', 'sum'),
+                    'capacity_sqm_k': ('capacity_sqm_k', 'sum')
+                },
+                capacity_filters
             )
         except Exception as e:
             st.error(f"Error loading capacity data: {str(e)}")
             st.stop()
 
-        # Filter out future quarters with no actual data
-        if len(util_df) > 0:
-            current_quarter_end = pd.Timestamp.today().to_period('Q').end_time.strftime("%Y-%m-%d")
-            util_df = util_df[util_df['date'] <= current_quarter_end]
-
-        if len(util_df) > 0:
+        if len(capacity_by_date) > 0:
             st.markdown("#### Total Industry Capacity Over Time")
 
-            capacity_by_date = util_df.groupby('date').agg({
-                'capacity_ksheets': 'sum',
-                'actual_input_ksheets': 'sum',
-                'capacity_sqm_k': 'sum'
-            }).reset_index()
-
             fig = go.Figure()
 
             fig.add_trace(go.Scatter(
@@ -889,12 +899,10 @@ else:
             with col1:
                 st.markdown("#### Capacity Share by Manufacturer")
 
-                latest_date = util_df['date'].max()
+                latest_date = capacity_by_date['date'].max()
                 # Filter out NULL/empty manufacturers
-                capacity_df = util_df[(util_df['date'] == latest_date) &
-                                       util_df['manufacturer'].notna() &
-                                       (util_df['manufacturer'] != '')]
-                latest_capacity = capacity_df.groupby('manufacturer')['capacity_ksheets'].sum()
+                latest_capacity = capacity_totals(['manufacturer'], {'date': latest_date})
+                latest_capacity = latest_capacity[latest_capacity.index != '']
 
                 if len(latest_capacity) > 0:
                     fig = px.pie(
@@ -912,8 +920,8 @@ else:
                 st.markdown("#### Capacity by Technology")
 
                 # Filter out NULL/empty technologies
-                tech_util_df = util_df[util_df['technology'].notna() & (util_df['technology'] != '')]
-                capacity_by_tech = tech_util_df.groupby('technology')['capacity_ksheets'].sum()
+                capacity_by_tech = capacity_totals(['technology'])
+                capacity_by_tech = capacity_by_tech[capacity_by_tech.index != '']
 
                 if len(capacity_by_tech) > 0:
                     fig = px.bar(
@@ -935,8 +943,8 @@ else:
             st.markdown("#### Regional Capacity Distribution")
 
             # Filter out NULL/empty regions
-            region_df = util_df[util_df['region'].notna() & (util_df['region'] != '')]
-            capacity_by_region = region_df.groupby('region')['capacity_ksheets'].sum().sort_values(ascending=False)
+            capacity_by_region = capacity_totals(['region'])
+            capacity_by_region = capacity_by_region[capacity_by_region.index != ''].sort_values(ascending=False)
 
             if len(capacity_by_region) > 0:
                 fig = px.bar(
@@ -1215,55 +1223,7 @@ else:
                 "app_split": dict(app_split),
             }
 
-        # ── Load ScenarioByFab from Excel (cached) ──
-        @st.cache_data(ttl=600)
-        def _load_scenario_by_fab():
-            """Load ScenarioByFab sheet from CapacityData Excel file."""
-            import openpyxl
-            src = Path(__file__).parent.parent / "source_data"
-            candidates = list(src.glob("*CapSpendReport*CapacityData*"))
-            if not candidates:
-                return pd.DataFrame()
-            fpath = candidates[0]
-            try:
-                wb = openpyxl.load_workbook(fpath, data_only=True, read_only=True)
-            except Exception:
-                return pd.DataFrame()
-            if "ScenarioByFab" not in wb.sheetnames:
-                wb.close()
-                return pd.DataFrame()
-            ws = wb["ScenarioByFab"]
-            # Headers on row 7, data starts row 9
-            col_map = {
-                3: "region", 4: "manufacturer", 5: "factory1", 6: "location",
-                7: "phase", 8: "backplane",
-                9: "tft_mg_v", 10: "tft_mg_h", 11: "tft_gen",
-                12: "tft_max_input", 13: "octa_ksheets", 14: "octa_mp",
-                15: "oled_mg_v", 16: "oled_mg_h", 17: "oled_gen",
-                18: "oled_max_input",
-                19: "application", 20: "main_application",
-                21: "type", 22: "substrate", 23: "depo", 24: "encapsulation",
-                25: "eqpt_po", 26: "install", 27: "mp_ramp", 28: "end",
-                29: "status", 30: "probability", 31: "client",
-                32: "standard_panel",
-            }
-            rows = []
-            for row_idx, row in enumerate(ws.iter_rows(min_row=9, max_col=32, values_only=True), start=9):
-                if row[2] is None and row[3] is None:
-                    continue  # skip empty
-                record = {}
-                for ci, name in col_map.items():
-                    val = row[ci - 1] if ci - 1 < len(row) else None
-                    record[name] = val
-                rows.append(record)
-            wb.close()
-            df = pd.DataFrame(rows)
-            # Convert numeric columns
-            for c in ["tft_max_input", "octa_ksheets", "oled_max_input"]:
-                df[c] = pd.to_numeric(df[c], errors="coerce").fillna(0)
-            return df
-
-        scenario_df = _load_scenario_by_fab()
+        scenario_df = load_scenario_by_fab()
         has_scenario = len(scenario_df) > 0
 
         # ── Build factory selection list ──
@@ -16,6 +16,12 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 from utils.styling import get_css, get_plotly_theme, apply_chart_theme, format_with_commas, format_percent
 from utils.database import DatabaseManager
 from utils.exports import create_download_buttons
+from utils.page_defaults import MARKET_YEAR_OPTIONS, MARKET_YEARS
+from utils.shipments_pipeline import derive_shipment_columns, shipment_derived_data_status
+from utils.shipment_cube import (
+    confident_products, cube_from_shipments, quarterly, ranked, rollup, valid_applications,
+    valid_makers,
+)
 from product_inference import enrich_shipments
 
 # Page config
@@ -46,15 +52,18 @@ st.markdown("""
 with st.sidebar:
     st.markdown("### Filters")
 
+    # All filter vocabularies in one cached lookup
+    dimensions = DatabaseManager.get_dimension_catalog()
+
     panel_maker = st.selectbox(
         "Panel Maker",
-        options=DatabaseManager.get_panel_makers(),
+        options=dimensions['panel_makers'],
         key="intel_panel_maker"
     )
 
     application = st.selectbox(
         "Application",
-        options=DatabaseManager.get_applications(),
+        options=dimensions['applications'],
         key="intel_application"
     )
 
@@ -65,15 +74,15 @@ with st.sidebar:
     with col1:
         start_year = st.selectbox(
             "Start Year",
-            options=list(range(2016, 2030)),
-            index=6,  # Default to 2022
+            options=MARKET_YEAR_OPTIONS,
+            index=MARKET_YEAR_OPTIONS.index(MARKET_YEARS[0]),
             key="intel_start_year"
         )
     with col2:
         end_year = st.selectbox(
             "End Year",
-            options=list(range(2016, 2030)),
-            index=10,  # Default to 2026
+            options=MARKET_YEAR_OPTIONS,
+            index=MARKET_YEAR_OPTIONS.index(MARKET_YEARS[1]),
             key="intel_end_year"
         )
 
@@ -99,33 +108,55 @@ def format_units_k(value_k):
     return f"{value_k:,.0f}K"
 
 
-# Load shipment data
-shipments_df = DatabaseManager.get_shipments(
-    start_year=start_year,
-    end_year=end_year,
-    panel_maker=panel_maker,
-    application=application
-)
-shipments_df = enrich_shipments(shipments_df)
+# Parsed periods, inferred products and the cube are built by the shipments
+# pipeline after an import, never while rendering
+derived_status = shipment_derived_data_status()
+if derived_status == "missing":
+    st.warning("Shipment data has not been prepared yet, so figures are computed from "
+               "the raw rows on every load. Run `python -m utils.shipments_pipeline` "
+               "after importing shipments.")
+    # No stored year column to filter on: derive the columns, then filter here
+    shipments_df = derive_shipment_columns(DatabaseManager.get_shipments(
+        panel_maker=panel_maker,
+        application=application
+    ))
+    shipments_df = shipments_df[shipments_df['year'].between(start_year, end_year).fillna(False)]
+    cube_df = cube_from_shipments(shipments_df)
+else:
+    if derived_status == "stale":
+        st.info("Shipments changed since their derived data was built; figures may lag "
+                "until `python -m utils.shipments_pipeline` is run.")
+
+    # Load shipment data
+    shipments_df = DatabaseManager.get_shipments(
+        start_year=start_year,
+        end_year=end_year,
+        panel_maker=panel_maker,
+        application=application
+    )
+    if 'inferred_product' not in shipments_df.columns:
+        shipments_df = enrich_shipments(shipments_df)
+
+    # Charts are aggregated from the pre-built shipment cube, not the raw rows
+    cube_df = DatabaseManager.get_shipment_cube(
+        start_year=start_year,
+        end_year=end_year,
+        panel_maker=panel_maker,
+        application=application
+    )
 
 # Get theme colors
 theme = get_plotly_theme()
 colors = theme['color_discrete_sequence']
 
-# Pre-compute common filtered dataframes once
-if len(shipments_df) > 0:
+# Pre-compute common filtered cube slices once
+if len(cube_df) > 0:
     # Valid panel makers (exclude ALL and /Others aggregates)
-    valid_makers_df = shipments_df[
-        shipments_df['panel_maker'].notna() &
-        (shipments_df['panel_maker'] != '') &
-        (shipments_df['panel_maker'] != 'ALL') &
-        (~shipments_df['panel_maker'].str.contains('/Others', na=False))
-    ]
+    valid_makers_df = valid_makers(cube_df)
     # Valid applications
-    valid_apps_df = shipments_df[shipments_df['application'].notna() & (shipments_df['application'] != '')]
+    valid_apps_df = valid_applications(cube_df)
     # Time series base (exclude annual aggregates)
-    ts_df = shipments_df[~shipments_df['date'].str.contains('ALL', na=False)].copy()
-    ts_df['period'] = ts_df['date'].str.split(' ').str[0]
+    ts_df = quarterly(cube_df)
 
 # Main content tabs
 tab1, tab2, tab3, tab4, tab5 = st.tabs(["Market Overview", "Supplier Analysis", "Application Analysis", "Product Analysis", "Detailed Data"])
@@ -134,12 +165,12 @@ tab1, tab2, tab3, tab4, tab5 = st.tabs(["Market Overview", "Supplier Analysis",
 # Tab 1: Market Overview
 # =============================================================================
 with tab1:
-    if len(shipments_df) > 0:
+    if len(cube_df) > 0:
         # Summary metrics row
         col1, col2, col3, col4 = st.columns(4)
 
-        total_revenue = shipments_df['revenue_m'].sum()
-        total_units = shipments_df['units_k'].sum()
+        total_revenue = cube_df['revenue_m'].sum()
+        total_units = cube_df['units_k'].sum()
 
         with col1:
             st.metric(f"Total Revenue ({start_year}-{end_year})", format_revenue_m(total_revenue))
@@ -161,17 +192,14 @@ with tab1:
         # OLED Market Trends - quarterly revenue + units dual-axis
         st.markdown("#### OLED Market Trends")
 
-        quarterly = ts_df.groupby('period').agg({
-            'units_k': 'sum',
-            'revenue_m': 'sum'
-        }).reset_index().sort_values('period')
+        quarterly_df = rollup(ts_df, ['period'], ['units_k', 'revenue_m']).sort_values('period')
 
-        if len(quarterly) > 0:
+        if len(quarterly_df) > 0:
             fig = go.Figure()
 
             fig.add_trace(go.Bar(
-                x=quarterly['period'].tolist(),
-                y=quarterly['units_k'].tolist(),
+                x=quarterly_df['period'].tolist(),
+                y=quarterly_df['units_k'].tolist(),
                 name='Units (K)',
                 marker_color=colors[0],
                 opacity=0.7,
@@ -179,8 +207,8 @@ with tab1:
             ))
 
             fig.add_trace(go.Scatter(
-                x=quarterly['period'].tolist(),
-                y=quarterly['revenue_m'].tolist(),
+                x=quarterly_df['period'].tolist(),
+                y=quarterly_df['revenue_m'].tolist(),
                 name='Revenue ($M)',
                 mode='lines+markers',
                 yaxis='y2',
@@ -208,7 +236,7 @@ with tab1:
         with col1:
             st.markdown("#### Revenue by Application")
 
-            app_revenue = valid_apps_df.groupby('application')['revenue_m'].sum().sort_values(ascending=False)
+            app_revenue = ranked(valid_apps_df, 'application')
 
             if len(app_revenue) > 0:
                 fig = px.pie(
@@ -225,7 +253,7 @@ with tab1:
         with col2:
             st.markdown("#### Revenue by Supplier")
 
-            maker_revenue = valid_makers_df.groupby('panel_maker')['revenue_m'].sum().sort_values(ascending=False)
+            maker_revenue = ranked(valid_makers_df, 'panel_maker')
 
             if len(maker_revenue) > 0:
                 top_5 = maker_revenue.head(5)
@@ -253,20 +281,17 @@ with tab1:
 # Tab 2: Supplier Analysis
 # =============================================================================
 with tab2:
-    if len(shipments_df) > 0:
+    if len(cube_df) > 0:
         # --- Top Suppliers Table ---
         st.markdown("#### Top Suppliers")
 
-        maker_agg = valid_makers_df.groupby('panel_maker').agg({
-            'revenue_m': 'sum',
-            'units_k': 'sum'
-        }).reset_index().sort_values('revenue_m', ascending=False)
+        maker_agg = rollup(valid_makers_df, ['panel_maker']).sort_values('revenue_m', ascending=False)
 
         total_market_revenue = maker_agg['revenue_m'].sum()
         maker_agg['Market Share %'] = (maker_agg['revenue_m'] / total_market_revenue * 100) if total_market_revenue > 0 else 0
 
         # Find top application per supplier
-        maker_app = valid_makers_df.groupby(['panel_maker', 'application'])['revenue_m'].sum().reset_index()
+        maker_app = rollup(valid_makers_df, ['panel_maker', 'application'], ['revenue_m'])
         top_app_per_maker = maker_app.loc[maker_app.groupby('panel_maker')['revenue_m'].idxmax()][['panel_maker', 'application']]
         top_app_per_maker.columns = ['panel_maker', 'Top Application']
 
@@ -292,9 +317,10 @@ with tab2:
         st.markdown("#### Supplier Revenue Trends")
 
         top_5_suppliers = maker_agg.head(5)['panel_maker'].tolist()
-        maker_ts = ts_df[
-            ts_df['panel_maker'].isin(top_5_suppliers)
-        ].groupby(['period', 'panel_maker'])['revenue_m'].sum().reset_index().sort_values('period')
+        maker_ts = rollup(
+            ts_df[ts_df['panel_maker'].isin(top_5_suppliers)],
+            ['period', 'panel_maker'], ['revenue_m']
+        ).sort_values('period')
 
         if len(maker_ts) > 0:
             fig = px.line(
@@ -368,10 +394,7 @@ with tab2:
 
         if selected_supplier:
             supplier_data = valid_makers_df[valid_makers_df['panel_maker'] == selected_supplier]
-            supplier_app = supplier_data.groupby('application').agg({
-                'revenue_m': 'sum',
-                'units_k': 'sum'
-            }).reset_index().sort_values('revenue_m', ascending=False)
+            supplier_app = rollup(supplier_data, ['application']).sort_values('revenue_m', ascending=False)
 
             if len(supplier_app) > 0:
                 col1, col2 = st.columns(2)
@@ -424,25 +447,17 @@ with tab2:
 # Tab 3: Application Analysis
 # =============================================================================
 with tab3:
-    if len(shipments_df) > 0:
+    if len(cube_df) > 0:
         # --- Application Summary Table ---
         st.markdown("#### Application Summary")
 
-        app_summary = valid_apps_df.groupby('application').agg({
-            'units_k': 'sum',
-            'revenue_m': 'sum'
-        }).reset_index()
+        app_summary = rollup(valid_apps_df, ['application'], ['units_k', 'revenue_m'])
         app_summary['ASP ($)'] = (app_summary['revenue_m'] * 1000 / app_summary['units_k']).where(
             app_summary['units_k'] > 0, 0
         )
 
         # Top supplier per application
-        app_maker = valid_apps_df[
-            valid_apps_df['panel_maker'].notna() &
-            (valid_apps_df['panel_maker'] != '') &
-            (valid_apps_df['panel_maker'] != 'ALL') &
-            (~valid_apps_df['panel_maker'].str.contains('/Others', na=False))
-        ].groupby(['application', 'panel_maker'])['revenue_m'].sum().reset_index()
+        app_maker = rollup(valid_makers(valid_apps_df), ['application', 'panel_maker'], ['revenue_m'])
 
         if len(app_maker) > 0:
             top_supplier_per_app = app_maker.loc[
@@ -474,14 +489,13 @@ with tab3:
         # --- Application Revenue Trends (top 5) ---
         st.markdown("#### Application Trends")
 
-        app_revenue_totals = valid_apps_df.groupby('application')['revenue_m'].sum().sort_values(ascending=False)
+        app_revenue_totals = ranked(valid_apps_df, 'application')
         top_5_apps = app_revenue_totals.head(5).index.tolist()
 
-        app_ts = ts_df[
-            ts_df['application'].isin(top_5_apps) &
-            ts_df['application'].notna() &
-            (ts_df['application'] != '')
-        ].groupby(['period', 'application'])['revenue_m'].sum().reset_index().sort_values('period')
+        app_ts = rollup(
+            ts_df[ts_df['application'].isin(top_5_apps)],
+            ['period', 'application'], ['revenue_m']
+        ).sort_values('period')
 
         if len(app_ts) > 0:
             fig = px.line(
@@ -519,10 +533,7 @@ with tab3:
                 valid_makers_df['application'].notna() &
                 (valid_makers_df['application'] == selected_app)
             ]
-            app_supplier = app_drill_data.groupby('panel_maker').agg({
-                'revenue_m': 'sum',
-                'units_k': 'sum'
-            }).reset_index().sort_values('revenue_m', ascending=False)
+            app_supplier = rollup(app_drill_data, ['panel_maker']).sort_values('revenue_m', ascending=False)
 
             if len(app_supplier) > 0:
                 col1, col2 = st.columns(2)
@@ -599,11 +610,9 @@ with tab3:
 # Tab 4: Product Analysis
 # =============================================================================
 with tab4:
-    if len(shipments_df) > 0:
+    if len(cube_df) > 0:
         # Filter to high/medium confidence only
-        product_df = shipments_df[
-            shipments_df['inference_confidence'].isin(['high', 'medium'])
-        ]
+        product_df = confident_products(cube_df)
 
         if len(product_df) > 0:
             # --- Summary metrics row ---
@@ -611,11 +620,13 @@ with tab4:
 
             identified_count = product_df['inferred_product'].nunique()
             product_revenue = product_df['revenue_m'].sum()
-            total_revenue_all = shipments_df['revenue_m'].sum()
+            total_revenue_all = cube_df['revenue_m'].sum()
             revenue_coverage = (product_revenue / total_revenue_all * 100) if total_revenue_all > 0 else 0
+            product_rows = product_df['row_count'].sum()
             high_conf_pct = (
-                (product_df['inference_confidence'] == 'high').sum() / len(product_df) * 100
-            ) if len(product_df) > 0 else 0
+                product_df.loc[product_df['inference_confidence'] == 'high', 'row_count'].sum()
+                / product_rows * 100
+            ) if product_rows > 0 else 0
 
             with col1:
                 st.metric("Identified Products", format_with_commas(identified_count))
@@ -631,10 +642,9 @@ with tab4:
             # --- Top Products Table (top 15) ---
             st.markdown("#### Top Products")
 
-            product_agg = product_df.groupby(['inferred_product', 'brand']).agg({
-                'revenue_m': 'sum',
-                'units_k': 'sum'
-            }).reset_index().sort_values('revenue_m', ascending=False).head(15)
+            product_agg = rollup(
+                product_df, ['inferred_product', 'brand']
+            ).sort_values('revenue_m', ascending=False).head(15)
 
             total_product_revenue = product_agg['revenue_m'].sum()
             product_agg['Share %'] = (
@@ -670,20 +680,13 @@ with tab4:
             # --- Product Revenue Trends (top 8, quarterly) ---
             st.markdown("#### Product Revenue Trends")
 
-            top_8_products = (
-                product_df.groupby('inferred_product')['revenue_m']
-                .sum().sort_values(ascending=False).head(8).index.tolist()
-            )
+            top_8_products = ranked(product_df, 'inferred_product').head(8).index.tolist()
 
-            product_ts = product_df[
-                product_df['inferred_product'].isin(top_8_products) &
-                ~product_df['date'].str.contains('ALL', na=False)
-            ].copy()
-            product_ts['period'] = product_ts['date'].str.split(' ').str[0]
+            product_ts = quarterly(product_df[product_df['inferred_product'].isin(top_8_products)])
 
-            product_ts_agg = product_ts.groupby(
-                ['period', 'inferred_product']
-            )['revenue_m'].sum().reset_index().sort_values('period')
+            product_ts_agg = rollup(
+                product_ts, ['period', 'inferred_product'], ['revenue_m']
+            ).sort_values('period')
 
             if len(product_ts_agg) > 0:
                 fig = px.line(
@@ -709,10 +712,7 @@ with tab4:
             # --- Brand Drill-down ---
             st.markdown("#### Brand Drill-down")
 
-            brand_list = (
-                product_df.groupby('brand')['revenue_m']
-                .sum().sort_values(ascending=False).index.tolist()
-            )
+            brand_list = ranked(product_df, 'brand').index.tolist()
             selected_brand = st.selectbox(
                 "Select a brand",
                 options=brand_list,
@@ -721,10 +721,9 @@ with tab4:
 
             if selected_brand:
                 brand_data = product_df[product_df['brand'] == selected_brand]
-                brand_product_agg = brand_data.groupby('inferred_product').agg({
-                    'revenue_m': 'sum',
-                    'units_k': 'sum'
-                }).reset_index().sort_values('revenue_m', ascending=False)
+                brand_product_agg = rollup(
+                    brand_data, ['inferred_product']
+                ).sort_values('revenue_m', ascending=False)
 
                 if len(brand_product_agg) > 0:
                     col1, col2 = st.columns(2)
@@ -8,7 +8,6 @@ import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
 from datetime import datetime, date
-import sqlite3
 import re
 import os
 from pathlib import Path
@@ -18,6 +17,8 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from utils.styling import get_css, get_plotly_theme, apply_chart_theme
 from utils.database import DatabaseManager, format_currency, format_percent, format_integer
+from utils.data_version import bump_data_version
+from utils.db_pool import DB_PATH, read_connection, write_connection
 
 # Page config
 st.set_page_config(
@@ -35,9 +36,6 @@ if not st.session_state.get("password_correct", False):
     st.warning("Please login from the main page.")
     st.stop()
 
-# Database path
-DB_PATH = Path(__file__).parent.parent / "displayintel.db"
-
 # PDF directory with fallback logic for local vs Streamlit Cloud
 def get_pdf_directory():
     """Get PDF directory path with fallback for different environments."""
@@ -67,27 +65,25 @@ PDF_DIR = get_pdf_directory()
 
 def init_financials_table():
     """Create financials table if it doesn't exist."""
-    conn = sqlite3.connect(DB_PATH)
-    conn.execute("""
-        CREATE TABLE IF NOT EXISTS company_financials (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            company TEXT NOT NULL,
-            year INTEGER NOT NULL,
-            quarter TEXT NOT NULL,
-            total_revenue_m REAL,
-            operating_income_m REAL,
-            operating_margin_pct REAL,
-            display_revenue_m REAL,
-            capex_m REAL,
-            ebitda_m REAL,
-            notes TEXT,
-            source_file TEXT,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            UNIQUE(company, year, quarter)
-        )
-    """)
-    conn.commit()
-    conn.close()
+    with write_connection(DB_PATH) as conn:
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS company_financials (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                company TEXT NOT NULL,
+                year INTEGER NOT NULL,
+                quarter TEXT NOT NULL,
+                total_revenue_m REAL,
+                operating_income_m REAL,
+                operating_margin_pct REAL,
+                display_revenue_m REAL,
+                capex_m REAL,
+                ebitda_m REAL,
+                notes TEXT,
+                source_file TEXT,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                UNIQUE(company, year, quarter)
+            )
+        """)
 
 # Initialize table
 init_financials_table()
@@ -298,52 +294,48 @@ def scan_pdf_directory():
 
 def save_financial_record(record):
     """Save a financial record to the database."""
-    conn = sqlite3.connect(DB_PATH)
     try:
-        conn.execute("""
-            INSERT OR REPLACE INTO company_financials
-            (company, year, quarter, total_revenue_m, operating_income_m,
-             operating_margin_pct, display_revenue_m, capex_m, ebitda_m, notes, source_file)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
-            record.get('company'),
-            record.get('year'),
-            record.get('quarter'),
-            record.get('total_revenue_m'),
-            record.get('operating_income_m'),
-            record.get('operating_margin_pct'),
-            record.get('display_revenue_m'),
-            record.get('capex_m'),
-            record.get('ebitda_m'),
-            record.get('notes'),
-            record.get('source_file')
-        ))
-        conn.commit()
+        with write_connection(DB_PATH) as conn:
+            conn.execute("""
+                INSERT OR REPLACE INTO company_financials
+                (company, year, quarter, total_revenue_m, operating_income_m,
+                 operating_margin_pct, display_revenue_m, capex_m, ebitda_m, notes, source_file)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, (
+                record.get('company'),
+                record.get('year'),
+                record.get('quarter'),
+                record.get('total_revenue_m'),
+                record.get('operating_income_m'),
+                record.get('operating_margin_pct'),
+                record.get('display_revenue_m'),
+                record.get('capex_m'),
+                record.get('ebitda_m'),
+                record.get('notes'),
+                record.get('source_file')
+            ))
+            bump_data_version(conn, 'company_financials')
         return True, None
     except Exception as e:
         return False, str(e)
-    finally:
-        conn.close()
 
 def get_all_financials():
     """Get all financial records from database."""
-    conn = sqlite3.connect(DB_PATH)
     try:
-        df = pd.read_sql_query("""
-            SELECT * FROM company_financials
-            ORDER BY year DESC, quarter DESC, company
-        """, conn)
+        with read_connection(DB_PATH) as conn:
+            df = pd.read_sql_query("""
+                SELECT * FROM company_financials
+                ORDER BY year DESC, quarter DESC, company
+            """, conn)
     except:
         df = pd.DataFrame()
-    conn.close()
     return df
 
 def delete_financial_record(record_id):
     """Delete a financial record."""
-    conn = sqlite3.connect(DB_PATH)
-    conn.execute("DELETE FROM company_financials WHERE id = ?", (record_id,))
-    conn.commit()
-    conn.close()
+    with write_connection(DB_PATH) as conn:
+        conn.execute("DELETE FROM company_financials WHERE id = ?", (record_id,))
+        bump_data_version(conn, 'company_financials')
 
 # =============================================================================
 # Page Header
@@ -5,8 +5,14 @@ Infers product names from brand + size_inches + application + panel_maker
 when the model column is empty. Designed for ~38K OLED-only shipment rows.
 """
 
+import hashlib
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+
+import numpy as np
 import pandas as pd
-from typing import Tuple, List, Optional
+from typing import Dict, Tuple, List, Optional
 
 
 # ---------------------------------------------------------------------------
@@ -113,21 +119,16 @@ def infer_product(
         confidence is "high", "medium", or "low".
         alternatives lists other plausible products (empty if unambiguous).
     """
-    brand = str(row.get("brand", "") or "").strip()
-    application = str(row.get("application", "") or "").strip()
-    panel_maker = str(row.get("panel_maker", "") or "").strip()
-
-    try:
-        size = float(row.get("size_inches", 0) or 0)
-    except (ValueError, TypeError):
-        size = 0.0
+    brand = _clean_text(row.get("brand", ""))
+    application = _clean_text(row.get("application", ""))
+    panel_maker = _clean_text(row.get("panel_maker", ""))
+    size = _clean_size(row.get("size_inches", 0))
 
     # ---- Step 1: look up rules for (brand, application) ----
     rules = PRODUCT_RULES.get((brand, application))
     if rules is None:
         # No rules → generic fallback
-        generic = f"{brand} {application}" if brand and application else "Unknown"
-        return (generic, "low", [])
+        return (_generic_product(brand, application), "low", [])
 
     # ---- Step 2: find all matching size ranges ----
     matches: list[str] = []
@@ -139,6 +140,30 @@ def infer_product(
         generic = f"{brand} {application}"
         return (generic, "low", [])
 
+    return _resolve_matches(brand, panel_maker, matches)
+
+
+def _clean_text(value) -> str:
+    return str(value or "").strip()
+
+
+def _clean_size(value) -> float:
+    try:
+        return float(value or 0)
+    except (ValueError, TypeError):
+        return 0.0
+
+
+def _generic_product(brand: str, application: str) -> str:
+    return f"{brand} {application}" if brand and application else "Unknown"
+
+
+def _resolve_matches(
+    brand: str,
+    panel_maker: str,
+    matches: List[str],
+) -> Tuple[str, str, List[str]]:
+    """Pick one product from the non-empty list of size-range matches."""
     # ---- Step 3: single match → straightforward ----
     if len(matches) == 1:
         product = matches[0]
@@ -190,6 +215,226 @@ def infer_product(
     return (best, "medium", alternatives)
 
 
+# ---------------------------------------------------------------------------
+# Vectorized engine
+#
+# Each (brand, application) rule list is compiled into sorted size breakpoints.
+# Every breakpoint and every open gap between two breakpoints has a fixed set
+# of matching products, so np.searchsorted maps a whole size column to its
+# match set at once. Supplier disambiguation then only runs once per distinct
+# (rule key, size segment, panel_maker), not once per row.
+# ---------------------------------------------------------------------------
+
+class _CompiledRules:
+    """Size breakpoints and per-segment matches for one (brand, application)."""
+
+    def __init__(self, rules: List[Tuple[float, float, str]]):
+        self.edges = np.array(sorted({b for lo, hi, _ in rules for b in (lo, hi)}),
+                              dtype=np.float64)
+        # Segment 2*i is the gap below edges[i], segment 2*i + 1 is edges[i]
+        # itself; the last segment is everything above the highest edge.
+        self.segment_matches: List[List[str]] = []
+        for i, edge in enumerate(self.edges):
+            if i == 0:
+                self.segment_matches.append([])
+            else:
+                mid = (self.edges[i - 1] + edge) / 2
+                self.segment_matches.append([p for lo, hi, p in rules if lo <= mid <= hi])
+            self.segment_matches.append([p for lo, hi, p in rules if lo <= edge <= hi])
+        self.segment_matches.append([])
+
+    def segments(self, sizes: np.ndarray) -> np.ndarray:
+        """Segment index for each size (NaN lands in the empty top segment)."""
+        idx = np.searchsorted(self.edges, sizes, side="left")
+        on_edge = np.zeros(len(sizes), dtype=bool)
+        inside = idx < len(self.edges)
+        on_edge[inside] = self.edges[idx[inside]] == sizes[inside]
+        return 2 * idx + on_edge
+
+
+def rules_version() -> str:
+    """Short hash of the rule tables; changes whenever any rule changes."""
+    payload = repr((
+        sorted(PRODUCT_RULES.items()),
+        sorted((maker, list(brands)) for maker, brands in SUPPLIER_CUSTOMERS.items()),
+        sorted((product, sorted(makers)) for product, makers in _SUPPLIER_HINTS.items()),
+    ))
+    return hashlib.sha1(payload.encode()).hexdigest()[:16]
+
+
+@lru_cache(maxsize=4)
+def _compiled_rules(version: str) -> Dict[tuple, _CompiledRules]:
+    return {key: _CompiledRules(rules) for key, rules in PRODUCT_RULES.items()}
+
+
+def _factorize_column(df: pd.DataFrame, column: str, clean, default) -> Tuple[np.ndarray, list]:
+    """Codes and cleaned unique values, calling ``clean`` once per raw value."""
+    if column not in df.columns:
+        return np.zeros(len(df), dtype=np.intp), [clean(default)]
+    codes, uniques = pd.factorize(df[column], use_na_sentinel=False)
+    # Different raw values can clean to the same value (e.g. " SDC" and "SDC")
+    merged: Dict[object, int] = {}
+    remap = np.array([merged.setdefault(clean(u), len(merged)) for u in uniques],
+                     dtype=np.intp)
+    return remap[codes], list(merged)
+
+
+def _infer_frame(df: pd.DataFrame, version: str) -> Tuple[List[tuple], np.ndarray]:
+    """Vectorized infer_product over a frame.
+
+    Returns the distinct (product, confidence, alternatives) outcomes and the
+    outcome index of every row.
+    """
+    compiled_rules = _compiled_rules(version)
+    n = len(df)
+    brand_codes, brands = _factorize_column(df, "brand", _clean_text, "")
+    app_codes, applications = _factorize_column(df, "application", _clean_text, "")
+    maker_codes, makers = _factorize_column(df, "panel_maker", _clean_text, "")
+    size_codes, sizes = _factorize_column(df, "size_inches", _clean_size, 0)
+    sizes = np.asarray(sizes, dtype=np.float64)
+
+    # Distinct (product, confidence, alternatives) results and each row's pick
+    outcomes: Dict[tuple, int] = {}
+    outcome_idx = np.zeros(n, dtype=np.intp)
+
+    # Group rows by (brand, application) rule key
+    key_codes = brand_codes * len(applications) + app_codes
+    order = np.argsort(key_codes)
+    sorted_keys = key_codes[order]
+    bounds = np.flatnonzero(np.diff(sorted_keys)) + 1
+    for rows in np.split(order, bounds) if n else []:
+        brand = brands[brand_codes[rows[0]]]
+        application = applications[app_codes[rows[0]]]
+        compiled = compiled_rules.get((brand, application))
+
+        if compiled is None:
+            outcome = (_generic_product(brand, application), "low", ())
+            outcome_idx[rows] = outcomes.setdefault(outcome, len(outcomes))
+            continue
+
+        # Resolve once per distinct (size segment, panel_maker)
+        combos = compiled.segments(sizes[size_codes[rows]]) * len(makers) + maker_codes[rows]
+        uniq_combos, inverse = np.unique(combos, return_inverse=True)
+        resolved = np.empty(len(uniq_combos), dtype=np.intp)
+        for j, combo in enumerate(uniq_combos):
+            segment, maker_code = divmod(int(combo), len(makers))
+            matches = compiled.segment_matches[segment]
+            if matches:
+                product, confidence, alternatives = _resolve_matches(
+                    brand, makers[maker_code], list(matches)
+                )
+            else:
+                product, confidence, alternatives = f"{brand} {application}", "low", []
+            outcome = (product, confidence, tuple(alternatives))
+            resolved[j] = outcomes.setdefault(outcome, len(outcomes))
+        outcome_idx[rows] = resolved[inverse.ravel()]
+
+    return list(outcomes), outcome_idx
+
+
+# ---------------------------------------------------------------------------
+# Memoization
+#
+# Shipments repeat the same brand/application/size/panel_maker combination in
+# every quarter, so inference runs only on distinct input tuples. Results are
+# kept in a bounded LRU keyed on the rules version and broadcast back to rows.
+# ---------------------------------------------------------------------------
+
+_INFERENCE_CACHE_SIZE = 65_536
+_inference_cache: "OrderedDict[tuple, tuple]" = OrderedDict()
+_inference_cache_lock = threading.Lock()
+
+
+def clear_inference_cache():
+    """Forget all memoized inference results."""
+    with _inference_cache_lock:
+        _inference_cache.clear()
+
+
+def infer_products(df: pd.DataFrame, with_alternatives: bool = True) -> pd.DataFrame:
+    """Vectorized, memoized infer_product over a whole shipments frame.
+
+    Returns a frame aligned to ``df.index`` with columns inferred_product,
+    inference_confidence and (unless ``with_alternatives`` is False)
+    inference_alternatives, identical to applying infer_product row by row.
+    """
+    version = rules_version()
+    brand_codes, brands = _factorize_column(df, "brand", _clean_text, "")
+    app_codes, applications = _factorize_column(df, "application", _clean_text, "")
+    maker_codes, makers = _factorize_column(df, "panel_maker", _clean_text, "")
+    size_codes, sizes = _factorize_column(df, "size_inches", _clean_size, 0)
+
+    combos = ((brand_codes * len(applications) + app_codes) * len(makers)
+              + maker_codes) * len(sizes) + size_codes
+    uniq_combos, inverse = np.unique(combos, return_inverse=True)
+
+    if len(uniq_combos) * 2 > len(df):
+        # Rows barely repeat, so memoizing would cost more than it saves
+        table, outcome_idx = _infer_frame(df, version)
+        return _outcome_frame(table, outcome_idx, df.index, with_alternatives)
+
+    rest, size_idx = np.divmod(uniq_combos, len(sizes))
+    rest, maker_idx = np.divmod(rest, len(makers))
+    brand_idx, app_idx = np.divmod(rest, len(applications))
+    # NaN never equals itself, so it cannot be a dict key
+    size_keys = [None if size != size else size for size in sizes]
+    keys = list(zip(
+        [version] * len(uniq_combos),
+        np.array(brands, dtype=object)[brand_idx].tolist(),
+        np.array(applications, dtype=object)[app_idx].tolist(),
+        np.array(size_keys, dtype=object)[size_idx].tolist(),
+        np.array(makers, dtype=object)[maker_idx].tolist(),
+    ))
+
+    with _inference_cache_lock:
+        results = [_inference_cache.get(key) for key in keys]
+        for key, hit in zip(keys, results):
+            if hit is not None:
+                _inference_cache.move_to_end(key)
+    misses = [i for i, r in enumerate(results) if r is None]
+
+    if misses:
+        pending = pd.DataFrame({
+            "brand": [keys[i][1] for i in misses],
+            "application": [keys[i][2] for i in misses],
+            "size_inches": np.array(
+                [np.nan if keys[i][3] is None else keys[i][3] for i in misses],
+                dtype=np.float64,
+            ),
+            "panel_maker": [keys[i][4] for i in misses],
+        })
+        table, outcome_idx = _infer_frame(pending, version)
+        with _inference_cache_lock:
+            for i, j in zip(misses, outcome_idx.tolist()):
+                results[i] = table[j]
+                _inference_cache[keys[i]] = table[j]
+            while len(_inference_cache) > _INFERENCE_CACHE_SIZE:
+                _inference_cache.popitem(last=False)
+
+    return _outcome_frame(results, inverse.ravel(), df.index, with_alternatives)
+
+
+def _outcome_frame(
+    table: List[tuple],
+    outcome_idx: np.ndarray,
+    index: pd.Index,
+    with_alternatives: bool,
+) -> pd.DataFrame:
+    """Broadcast distinct outcomes back to one row per input row."""
+    table = table or [("", "", ())]
+    products = np.array([o[0] for o in table], dtype=object)
+    confidences = np.array([o[1] for o in table], dtype=object)
+    out = pd.DataFrame({
+        "inferred_product": pd.Series(products[outcome_idx], index=index, dtype=object),
+        "inference_confidence": pd.Series(confidences[outcome_idx], index=index, dtype=object),
+    })
+    if with_alternatives:
+        out["inference_alternatives"] = pd.Series(
+            [list(table[i][2]) for i in outcome_idx], index=index, dtype=object
+        )
+    return out
+
+
 def enrich_shipments(df: pd.DataFrame) -> pd.DataFrame:
     """Add inferred_product and inference_confidence columns to a shipments DataFrame.
 
@@ -203,14 +448,10 @@ def enrich_shipments(df: pd.DataFrame) -> pd.DataFrame:
     pd.DataFrame
         Copy of the input with two new columns added.
     """
-    results = df.apply(
-        lambda r: infer_product(r),
-        axis=1,
-        result_type="expand",
-    )
+    results = infer_products(df, with_alternatives=False)
     out = df.copy()
-    out["inferred_product"] = results[0]
-    out["inference_confidence"] = results[1]
+    out["inferred_product"] = results["inferred_product"]
+    out["inference_confidence"] = results["inference_confidence"]
     return out
 
 
@@ -306,3 +547,48 @@ if __name__ == "__main__":
     ])
     enriched = enrich_shipments(sample)
     print(enriched[["brand", "size_inches", "inferred_product", "inference_confidence"]].to_string(index=False))
+
+    # Vectorized engine must match infer_product exactly
+    print("\ninfer_products() equivalence test:")
+    sweep = pd.DataFrame(
+        [{k: v for k, v in t.items() if k != "expect"} for t in tests]
+        + [
+            {"brand": b, "application": a, "size_inches": s / 100, "panel_maker": m}
+            for (b, a) in PRODUCT_RULES
+            for s in range(350, 1750, 1)
+            for m in ("SDC", "LGD", "BOE", "")
+        ]
+    )
+    expected = sweep.apply(lambda r: infer_product(r), axis=1, result_type="expand")
+    vectorized = infer_products(sweep)
+    same = (
+        list(expected[0]) == list(vectorized["inferred_product"])
+        and list(expected[1]) == list(vectorized["inference_confidence"])
+        and list(expected[2]) == list(vectorized["inference_alternatives"])
+    )
+    print(f"  [{'PASS' if same else 'FAIL'}] {len(sweep):,} rows identical to infer_product")
+
+    import time
+    start = time.perf_counter()
+    sweep.apply(lambda r: infer_product(r), axis=1, result_type="expand")
+    row_wise = time.perf_counter() - start
+    start = time.perf_counter()
+    infer_products(sweep, with_alternatives=False)
+    vector = time.perf_counter() - start
+    print(f"  row-wise {row_wise * 1000:.0f} ms, vectorized {vector * 1000:.1f} ms "
+          f"({row_wise / vector:.0f}x)")
+
+    # Memoized path: every combination repeats once per quarter
+    quarterly = pd.concat([sweep.iloc[::40]] * 40, ignore_index=True)
+    expected = quarterly.apply(lambda r: infer_product(r), axis=1, result_type="expand")
+    clear_inference_cache()
+    cold = infer_products(quarterly)
+    warm = infer_products(quarterly)
+    same = all(
+        list(expected[i]) == list(result[col])
+        for result in (cold, warm)
+        for i, col in enumerate(["inferred_product", "inference_confidence",
+                                 "inference_alternatives"])
+    )
+    print(f"  [{'PASS' if same else 'FAIL'}] {len(quarterly):,} repeated rows identical "
+          f"(cold and cached, rules {rules_version()})")
@@ -10,6 +10,7 @@ from .database import (
     PROCESS_STEP_MAPPING,
     PROCESS_STEP_NAMES
 )
+from .result_cache import result_cache_stats
 from .exports import export_to_csv, export_to_pdf, create_download_buttons
 from .styling import (
     get_css,
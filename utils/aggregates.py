@@ -0,0 +1,120 @@
+"""
+Server-side aggregation for Display Intelligence Dashboard.
+
+Pages used to fetch whole tables and run groupby in pandas for each chart.
+DatabaseManager.aggregate instead pushes the GROUP BY into SQLite and returns
+only the aggregated rows. This module holds the query builder; the sources
+that can be aggregated (and their whitelisted dimensions and measures) are
+defined in utils.database as AGGREGATE_SOURCES.
+"""
+
+from typing import Any, Dict, List, Mapping, NamedTuple, Optional, Sequence, Tuple
+
+
+class AggregateSource(NamedTuple):
+    from_clause: str            # table, or join, the rows come from
+    tables: Tuple[str, ...]     # tables read (for versioned_cache)
+    dimensions: Dict[str, str]  # name -> SQL expression; usable in group_by and filters
+    measures: Dict[str, str]    # name -> SQL expression to aggregate
+    where: Optional[str] = None     # condition every row must meet
+
+
+# pandas aggregation names -> SQL, so measures read like DataFrame.agg specs
+AGGREGATE_FUNCTIONS = {
+    'sum': 'SUM({})',
+    'mean': 'AVG({})',
+    'min': 'MIN({})',
+    'max': 'MAX({})',
+    'count': 'COUNT({})',
+    'nunique': 'COUNT(DISTINCT {})',
+}
+
+# (output column, (measure or dimension, function))
+MeasureSpec = Mapping[str, Tuple[str, str]]
+
+
+def case_expression(column: str, mapping: Mapping[str, Any], default: Any) -> str:
+    """SQL CASE mapping each value of ``column`` through ``mapping``."""
+    def literal(value):
+        if isinstance(value, str):
+            return "'" + value.replace("'", "''") + "'"
+        return str(value)
+
+    whens = " ".join(f"WHEN {literal(k)} THEN {literal(v)}" for k, v in mapping.items())
+    return f"CASE {column} {whens} ELSE {literal(default)} END"
+
+
+def _filter_clause(expr: str, value) -> Tuple[str, List]:
+    """WHERE fragment for one filter value.
+
+    A list or set matches any of its values, a (low, high) tuple is an
+    inclusive range with None for an open end, anything else is equality.
+    """
+    if isinstance(value, (list, set, frozenset)):
+        values = list(value)
+        if not values:
+            return "0", []
+        return f"{expr} IN ({','.join('?' * len(values))})", values
+    if isinstance(value, tuple):
+        low, high = value
+        parts, params = [], []
+        if low is not None:
+            parts.append(f"{expr} >= ?")
+            params.append(low)
+        if high is not None:
+            parts.append(f"{expr} <= ?")
+            params.append(high)
+        return " AND ".join(parts) or "1", params
+    return f"{expr} = ?", [value]
+
+
+def build_aggregate_query(
+    source: AggregateSource,
+    group_by: Sequence[str],
+    measures: MeasureSpec,
+    filters: Optional[Mapping[str, Any]] = None,
+    dropna: bool = True
+) -> Tuple[str, List]:
+    """SQL and parameters for a grouped aggregate over ``source``.
+
+    Filters whose value is None or "All" are ignored, matching the sidebar
+    convention of the DatabaseManager getters. With ``dropna`` rows with a
+    NULL in any group_by column are left out, as DataFrame.groupby does.
+    Results are ordered by the group_by columns.
+    """
+    group_by = list(group_by)
+    for name in group_by:
+        if name not in source.dimensions:
+            raise ValueError(f"Unknown dimension {name!r}")
+
+    select = [f"{source.dimensions[name]} AS {name}" for name in group_by]
+    for output, (column, func) in measures.items():
+        if func not in AGGREGATE_FUNCTIONS:
+            raise ValueError(f"Unknown aggregate function {func!r}")
+        expr = source.measures.get(column, source.dimensions.get(column))
+        if expr is None:
+            raise ValueError(f"Unknown measure {column!r}")
+        select.append(f"{AGGREGATE_FUNCTIONS[func].format(expr)} AS {output}")
+    if not select:
+        raise ValueError("Nothing to aggregate")
+
+    where = [source.where] if source.where else []
+    params = []
+    for name, value in (filters or {}).items():
+        if value is None or (isinstance(value, str) and value == "All"):
+            continue
+        if name not in source.dimensions:
+            raise ValueError(f"Unknown filter dimension {name!r}")
+        clause, clause_params = _filter_clause(source.dimensions[name], value)
+        where.append(clause)
+        params.extend(clause_params)
+    if dropna:
+        where.extend(f"{source.dimensions[name]} IS NOT NULL" for name in group_by)
+
+    query = f"SELECT {', '.join(select)} FROM {source.from_clause}"
+    if where:
+        query += " WHERE " + " AND ".join(where)
+    if group_by:
+        positions = ", ".join(str(i) for i in range(1, len(group_by) + 1))
+        query += f" GROUP BY {positions} ORDER BY {positions}"
+    return query, params
@@ -3,35 +3,32 @@ Authentication module for Display Intelligence Dashboard.
 Provides per-user accounts, bcrypt-hashed passwords, and cookie-based persistent sessions.
 """
 
-import sqlite3
 import secrets
 import bcrypt
 import streamlit as st
-from pathlib import Path
 from contextlib import contextmanager
 from datetime import datetime, timedelta
 
 import extra_streamlit_components as stx
 
-DB_PATH = Path(__file__).parent.parent / "displayintel.db"
+from .db_pool import DB_PATH, read_connection, write_connection
+
 SESSION_EXPIRY_DAYS = 7
 COOKIE_NAME = "displayintel_session"
 
 
 @contextmanager
 def _get_auth_connection():
-    """Context manager for auth database connections with WAL mode."""
-    conn = sqlite3.connect(DB_PATH, check_same_thread=False)
-    conn.execute("PRAGMA journal_mode=WAL")
-    conn.row_factory = sqlite3.Row
-    try:
+    """Context manager for auth writes on the pooled, serialized writer."""
+    with write_connection(DB_PATH) as conn:
+        yield conn
+
+
+@contextmanager
+def _get_auth_read_connection():
+    """Context manager for auth lookups on the pooled read-only connection."""
+    with read_connection(DB_PATH) as conn:
         yield conn
-        conn.commit()
-    except Exception:
-        conn.rollback()
-        raise
-    finally:
-        conn.close()
 
 
 def init_auth_tables():
@@ -81,19 +78,19 @@ def create_user(email: str, password: str):
 
 def verify_user(email: str, password: str):
     """Check credentials. Returns a user dict or None."""
-    with _get_auth_connection() as conn:
+    with _get_auth_read_connection() as conn:
         cursor = conn.execute(
             "SELECT id, email, hashed_password, is_active FROM users WHERE email = ?",
             (email.lower().strip(),),
         )
         row = cursor.fetchone()
-        if row is None:
-            return None
-        if not row["is_active"]:
-            return None
-        if bcrypt.checkpw(password.encode("utf-8"), row["hashed_password"].encode("utf-8")):
-            return {"id": row["id"], "email": row["email"]}
+    if row is None:
         return None
+    if not row["is_active"]:
+        return None
+    if bcrypt.checkpw(password.encode("utf-8"), row["hashed_password"].encode("utf-8")):
+        return {"id": row["id"], "email": row["email"]}
+    return None
 
 
 def create_session(user_id: int) -> str:
@@ -114,7 +111,7 @@ def validate_session(token: str):
     """Look up token, check expiry. Returns user dict or None."""
     if not token:
         return None
-    with _get_auth_connection() as conn:
+    with _get_auth_read_connection() as conn:
         cursor = conn.execute(
             """
             SELECT s.token, s.expires_at, u.id, u.email, u.is_active
@@ -125,15 +122,15 @@ def validate_session(token: str):
             (token,),
         )
         row = cursor.fetchone()
-        if row is None:
-            return None
-        if not row["is_active"]:
-            return None
-        expires_at = datetime.strptime(row["expires_at"], "%Y-%m-%d %H:%M:%S")
-        if datetime.utcnow() > expires_at:
-            conn.execute("DELETE FROM sessions WHERE token = ?", (token,))
-            return None
-        return {"id": row["id"], "email": row["email"]}
+    if row is None:
+        return None
+    if not row["is_active"]:
+        return None
+    expires_at = datetime.strptime(row["expires_at"], "%Y-%m-%d %H:%M:%S")
+    if datetime.utcnow() > expires_at:
+        delete_session(token)
+        return None
+    return {"id": row["id"], "email": row["email"]}
 
 
 def delete_session(token: str):
@@ -209,7 +206,7 @@ def logout(cookie_manager):
 
 def ensure_admin_exists():
     """If the users table is empty, create a default admin user."""
-    with _get_auth_connection() as conn:
+    with _get_auth_read_connection() as conn:
         cursor = conn.execute("SELECT COUNT(*) as cnt FROM users")
         count = cursor.fetchone()["cnt"]
 
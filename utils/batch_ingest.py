@@ -0,0 +1,159 @@
+"""
+Batch ingest of every DSCC workbook in source_data/.
+
+Workbook parsing is CPU-bound pure-Python openpyxl work, so each
+(file, sheet) parse runs in its own process. Parsed frames come back to the
+parent, which is the only process that writes to the database. The loaders
+bump the data versions of what they write, so running dashboards warm their
+caches again on their next poll (see utils.warmup).
+
+Run from the project root with:
+    python -m utils.batch_ingest [--workers N] [--clear]
+"""
+
+import sys
+import time
+import zipfile
+import xml.etree.ElementTree as ET
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+import pandas as pd
+
+from .data_import import (
+    SOURCE_DATA_PATH, STATIC_DB_SHEET, load_utilization, prepare_utilization,
+    read_static_db,
+)
+from .db_pool import DB_PATH, bulk_write_connection
+from .migrations import apply_migrations
+
+WORKBOOK_PATTERNS = ("*.xlsm", "*.xlsx")
+
+
+@dataclass(frozen=True)
+class SheetImporter:
+    """How to parse one kind of sheet and write it to the database.
+
+    ``parse(path)`` runs in a worker process and must return a picklable
+    DataFrame. ``load(conn, df, path, clear_existing)`` runs in the parent
+    with the bulk writer connection.
+    """
+    name: str
+    sheet: str
+    parse: Callable[[Path], pd.DataFrame]
+    load: Callable
+
+
+def _parse_utilization(path: Path) -> pd.DataFrame:
+    agg_df, _ = read_static_db(path)
+    return agg_df
+
+
+def _load_utilization(conn, agg_df: pd.DataFrame, path: Path, clear_existing: bool):
+    factories_df, util_df = prepare_utilization(agg_df, path.name)
+    load_utilization(conn, factories_df, util_df, clear_existing)
+    return len(util_df)
+
+
+# Every sheet the dashboard knows how to import; add new importers here
+SHEET_IMPORTERS: Dict[str, SheetImporter] = {
+    importer.name: importer for importer in [
+        SheetImporter("utilization", STATIC_DB_SHEET, _parse_utilization, _load_utilization),
+    ]
+}
+
+
+def discover_workbooks(source_dir: Optional[Path] = None) -> List[Path]:
+    source_dir = Path(source_dir or SOURCE_DATA_PATH)
+    found = {p for pattern in WORKBOOK_PATTERNS for p in source_dir.glob(pattern)}
+    # Skip Excel lock files (~$Report.xlsm)
+    return sorted(p for p in found if not p.name.startswith("~$"))
+
+
+def workbook_sheets(path: Path) -> List[str]:
+    """Sheet names from the workbook manifest, without parsing any sheet."""
+    with zipfile.ZipFile(path) as zf:
+        root = ET.fromstring(zf.read("xl/workbook.xml"))
+    ns = {"m": root.tag.split("}")[0].strip("{")} if root.tag.startswith("{") else {}
+    sheets = root.findall("m:sheets/m:sheet", ns) if ns else root.findall("sheets/sheet")
+    return [s.get("name") for s in sheets]
+
+
+def _parse_task(path: str, importer_name: str):
+    """Worker entry point: parse one (file, sheet) and time it."""
+    start = time.perf_counter()
+    df = SHEET_IMPORTERS[importer_name].parse(Path(path))
+    return df, time.perf_counter() - start
+
+
+def ingest_all(
+    source_dir: Optional[Path] = None,
+    workers: Optional[int] = None,
+    clear_existing: bool = False,
+) -> List[dict]:
+    """Parse every known sheet of every workbook in parallel and load it.
+
+    Returns one timing record per (file, sheet): parse and load seconds and
+    rows written, or the error if that task failed.
+    """
+    tasks = []
+    for path in discover_workbooks(source_dir):
+        try:
+            sheets = set(workbook_sheets(path))
+        except (zipfile.BadZipFile, KeyError, ET.ParseError) as e:
+            print(f"Skipping {path.name}: {e}")
+            continue
+        for importer in SHEET_IMPORTERS.values():
+            if importer.sheet in sheets:
+                tasks.append((path, importer))
+
+    if not tasks:
+        print("No importable sheets found.")
+        return []
+
+    results = []
+    # Each importer clears its tables at most once, before its first load
+    cleared = set()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {
+            pool.submit(_parse_task, str(path), importer.name): (path, importer)
+            for path, importer in tasks
+        }
+        for future in as_completed(futures):
+            path, importer = futures[future]
+            record = {"file": path.name, "sheet": importer.sheet, "importer": importer.name}
+            try:
+                df, record["parse_s"] = future.result()
+                start = time.perf_counter()
+                clear = clear_existing and importer.name not in cleared
+                with bulk_write_connection(DB_PATH) as conn:
+                    record["rows"] = importer.load(conn, df, path, clear)
+                cleared.add(importer.name)
+                record["load_s"] = time.perf_counter() - start
+            except Exception as e:
+                record["error"] = str(e)
+            results.append(record)
+    apply_migrations(DB_PATH)
+    return results
+
+
+def main():
+    args = sys.argv[1:]
+    workers = int(args[args.index("--workers") + 1]) if "--workers" in args else None
+    start = time.perf_counter()
+    results = ingest_all(workers=workers, clear_existing="--clear" in args)
+
+    print("\n=== Ingest Summary ===")
+    for r in sorted(results, key=lambda r: r["file"]):
+        if "error" in r:
+            print(f"  {r['file']} [{r['sheet']}]: FAILED - {r['error']}")
+        else:
+            print(f"  {r['file']} [{r['sheet']}]: {r['rows']:,} rows, "
+                  f"parse {r['parse_s']:.1f}s, load {r['load_s']:.1f}s")
+    print(f"Total: {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
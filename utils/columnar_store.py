@@ -0,0 +1,238 @@
+"""
+In-memory columnar snapshot of the core analytics tables.
+
+Loads factories, utilization, equipment_orders and shipments into typed
+pandas frames (low-cardinality text columns become categoricals) and serves
+the DatabaseManager filter signatures with vectorized boolean masks instead
+of SQL round-trips. The snapshot is keyed on the data versions of those
+tables (utils.data_version) and reloaded on the first query after any of
+them is written, so every writer must call bump_data_version in the same
+transaction as its change.
+
+Enable with the DISPLAYINTEL_COLUMNAR_STORE=1 environment variable.
+"""
+
+import os
+import sqlite3
+import threading
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from .data_version import get_data_version
+
+COLUMNAR_STORE_ENABLED = os.environ.get("DISPLAYINTEL_COLUMNAR_STORE", "0") == "1"
+
+# Text columns with at most this share of distinct values are stored as categoricals
+_CATEGORICAL_MAX_RATIO = 0.5
+
+# Tables the snapshot is built from; a write to any of them triggers a reload
+STORE_TABLES = ('factories', 'utilization', 'equipment_orders', 'shipments')
+
+
+class _ColumnarTable:
+    """A pre-sorted frame plus the encoded columns used for filtering."""
+
+    def __init__(self, df: pd.DataFrame):
+        df = df.reset_index(drop=True)
+        self.columns = list(df.columns)
+        self.frame = df
+        self.arrays: Dict[str, np.ndarray] = {}
+        self.codes: Dict[str, np.ndarray] = {}
+        self.categories: Dict[str, pd.Index] = {}
+        # Object array of categories with a trailing None so that code -1 maps to NULL
+        self._decode: Dict[str, np.ndarray] = {}
+
+        for col in df.columns:
+            series = df[col]
+            self.arrays[col] = series.to_numpy()
+            if not pd.api.types.is_string_dtype(series.dtype) or len(series) == 0:
+                continue
+            non_null = series.dropna()
+            if not all(isinstance(v, str) for v in non_null):
+                continue
+            if non_null.nunique() > len(series) * _CATEGORICAL_MAX_RATIO:
+                continue
+            cat = series.astype("category")
+            self.frame[col] = cat
+            self.codes[col] = cat.cat.codes.to_numpy()
+            self.categories[col] = cat.cat.categories
+            self._decode[col] = np.append(
+                np.asarray(cat.cat.categories, dtype=object), None
+            )
+
+    def __len__(self) -> int:
+        return len(self.frame)
+
+    def all_rows(self) -> np.ndarray:
+        return np.ones(len(self.frame), dtype=bool)
+
+    def equals(self, col: str, value) -> np.ndarray:
+        """Boolean mask for ``col = value``."""
+        if col in self.codes:
+            cats = self.categories[col]
+            if value not in cats:
+                return np.zeros(len(self.frame), dtype=bool)
+            return self.codes[col] == cats.get_loc(value)
+        return self.arrays[col] == value
+
+    def select(self, mask: np.ndarray) -> pd.DataFrame:
+        """Materialize the masked rows with the same dtypes SQLite would return."""
+        idx = np.flatnonzero(mask)
+        out = {}
+        for col in self.columns:
+            if col in self.codes:
+                out[col] = self._decode[col][self.codes[col][idx]]
+            else:
+                out[col] = self.arrays[col][idx]
+        return pd.DataFrame(out, columns=self.columns)
+
+
+class ColumnarStore:
+    """Process-wide snapshot of the dashboard's analytics tables."""
+
+    def __init__(self, conn: sqlite3.Connection):
+        factories = pd.read_sql_query("SELECT * FROM factories", conn)
+        self._factories = _ColumnarTable(
+            factories.sort_values(['manufacturer', 'factory_name'],
+                                  na_position='first', kind='stable')
+        )
+
+        utilization = pd.read_sql_query("""
+            SELECT u.*, f.manufacturer, f.factory_name, f.technology, f.region, f.backplane
+            FROM utilization u
+            JOIN factories f ON u.factory_id = f.factory_id
+        """, conn)
+        self._utilization = _ColumnarTable(
+            utilization.sort_values(['date', 'manufacturer', 'backplane'],
+                                    na_position='first', kind='stable')
+        )
+        self._utilization_dates = self._utilization.frame['date'].to_numpy(dtype=str)
+
+        orders = pd.read_sql_query(
+            "SELECT * FROM equipment_orders WHERE po_year IS NOT NULL", conn
+        )
+        self._equipment_orders = _ColumnarTable(
+            orders.sort_values(['po_year', 'po_quarter'], ascending=False,
+                               na_position='last', kind='stable')
+        )
+        self._po_years = self._equipment_orders.frame['po_year'].to_numpy()
+
+        shipments = pd.read_sql_query("SELECT * FROM shipments", conn)
+        shipments = shipments.sort_values('date', ascending=False,
+                                          na_position='last', kind='stable')
+        self._shipments = _ColumnarTable(shipments)
+        # year is parsed from date at import; NULL (NaN) never matches a
+        # year filter, as in SQL
+        years = shipments['year'] if 'year' in shipments else pd.Series(np.nan, index=shipments.index)
+        self._shipment_years = pd.to_numeric(years, errors='coerce').to_numpy(dtype=float)
+
+    @staticmethod
+    def _selected(value) -> bool:
+        return bool(value) and value != "All"
+
+    def factories(
+        self,
+        manufacturer: Optional[str] = None,
+        technology: Optional[str] = None,
+        region: Optional[str] = None,
+        status: Optional[str] = None
+    ) -> pd.DataFrame:
+        """Columnar equivalent of DatabaseManager.get_factories."""
+        table = self._factories
+        mask = table.all_rows()
+        for col, value in (('manufacturer', manufacturer), ('technology', technology),
+                           ('region', region), ('status', status)):
+            if self._selected(value):
+                mask &= table.equals(col, value)
+        return table.select(mask)
+
+    def utilization(
+        self,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        factory_id: Optional[str] = None,
+        factory_name: Optional[str] = None,
+        manufacturer: Optional[str] = None
+    ) -> pd.DataFrame:
+        """Columnar equivalent of DatabaseManager.get_utilization."""
+        table = self._utilization
+        mask = table.all_rows()
+        if start_date:
+            mask &= self._utilization_dates >= str(start_date)
+        if end_date:
+            mask &= self._utilization_dates <= str(end_date)
+        if factory_id:
+            mask &= table.equals('factory_id', factory_id)
+        if factory_name:
+            mask &= table.equals('factory_name', factory_name)
+        if self._selected(manufacturer):
+            mask &= table.equals('manufacturer', manufacturer)
+        return table.select(mask)
+
+    def equipment_orders(
+        self,
+        start_year: Optional[int] = None,
+        end_year: Optional[int] = None,
+        manufacturer: Optional[str] = None,
+        vendor: Optional[str] = None,
+        equipment_type: Optional[str] = None
+    ) -> pd.DataFrame:
+        """Columnar equivalent of DatabaseManager.get_equipment_orders."""
+        table = self._equipment_orders
+        mask = table.all_rows()
+        if start_year:
+            mask &= self._po_years >= start_year
+        if end_year:
+            mask &= self._po_years <= end_year
+        for col, value in (('manufacturer', manufacturer), ('vendor', vendor),
+                           ('equipment_type', equipment_type)):
+            if self._selected(value):
+                mask &= table.equals(col, value)
+        return table.select(mask)
+
+    def shipments(
+        self,
+        start_year: Optional[int] = None,
+        end_year: Optional[int] = None,
+        panel_maker: Optional[str] = None,
+        technology: Optional[str] = None,
+        application: Optional[str] = None
+    ) -> pd.DataFrame:
+        """Columnar equivalent of DatabaseManager.get_shipments."""
+        table = self._shipments
+        mask = table.all_rows()
+        if start_year:
+            mask &= self._shipment_years >= start_year
+        if end_year:
+            mask &= self._shipment_years <= end_year
+        for col, value in (('panel_maker', panel_maker), ('technology', technology),
+                           ('application', application)):
+            if self._selected(value):
+                mask &= table.equals(col, value)
+        return table.select(mask)
+
+
+_store: Optional[ColumnarStore] = None
+_store_version = None
+_store_lock = threading.Lock()
+
+
+def get_columnar_store(conn_factory) -> Optional[ColumnarStore]:
+    """Return the process-wide store, (re)loading it when its tables change.
+
+    Returns None when the store is disabled so callers fall back to SQL.
+    ``conn_factory`` is a context manager yielding a database connection.
+    """
+    global _store, _store_version
+    if not COLUMNAR_STORE_ENABLED:
+        return None
+    version = get_data_version(*STORE_TABLES)
+    if _store is None or _store_version != version:
+        with _store_lock:
+            if _store is None or _store_version != version:
+                with conn_factory() as conn:
+                    _store = ColumnarStore(conn)
+                _store_version = version
+    return _store
@@ -0,0 +1,137 @@
+"""
+Materialized home-page summary for Display Intelligence Dashboard.
+
+The Dashboard overview shows table counts, the latest month with real
+production and the average utilization for that month. Computing them takes
+several COUNT/AVG queries and a MAX(date) scan over utilization, so they are
+stored in a single ``dashboard_summary`` row instead. Importers refresh it in
+the same transaction as the data they load, and the shipments pipeline after
+its stages. Readers never write: if the stored row was built from older data
+versions than the current ones, they compute the summary without storing it.
+"""
+
+import json
+import sqlite3
+from datetime import datetime
+from typing import Optional
+
+from .data_version import bump_data_version, table_versions
+from .db_pool import DB_PATH, read_connection, write_connection
+
+# Tables the summary is computed from
+SUMMARY_TABLES = ('factories', 'utilization', 'equipment_orders', 'shipments')
+
+SUMMARY_COLUMNS = (
+    'total_factories', 'active_factories', 'manufacturers',
+    'utilization_records', 'equipment_orders', 'shipments',
+    'latest_actual_date', 'latest_input_date', 'avg_utilization',
+)
+
+
+def _ensure_summary_table(conn: sqlite3.Connection):
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS dashboard_summary (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            total_factories INTEGER,
+            active_factories INTEGER,
+            manufacturers INTEGER,
+            utilization_records INTEGER,
+            equipment_orders INTEGER,
+            shipments INTEGER,
+            latest_actual_date TEXT,    -- latest non-projection month with actual input
+            latest_input_date TEXT,     -- latest month with actual input, projections included
+            avg_utilization REAL,       -- mean utilization_pct in latest_input_date
+            source_versions TEXT,       -- JSON data versions of SUMMARY_TABLES
+            refreshed_at TEXT
+        )
+    """)
+
+
+def _scalar(conn: sqlite3.Connection, sql: str, default=None):
+    try:
+        row = conn.execute(sql).fetchone()
+    except sqlite3.OperationalError:
+        return default      # table not created yet
+    return row[0] if row and row[0] is not None else default
+
+
+def _compute_summary(conn: sqlite3.Connection) -> dict:
+    summary = {
+        'total_factories': _scalar(conn, "SELECT COUNT(*) FROM factories", 0),
+        'active_factories': _scalar(
+            conn, "SELECT COUNT(*) FROM factories WHERE status = 'operating'", 0),
+        'manufacturers': _scalar(conn, "SELECT COUNT(DISTINCT manufacturer) FROM factories", 0),
+        'utilization_records': _scalar(conn, "SELECT COUNT(*) FROM utilization", 0),
+        'equipment_orders': _scalar(conn, "SELECT COUNT(*) FROM equipment_orders", 0),
+        'shipments': _scalar(conn, "SELECT COUNT(*) FROM shipments", 0),
+        # Used by the capacity queries, which leave out projection rows
+        'latest_actual_date': _scalar(conn, """
+            SELECT MAX(date) FROM utilization
+            WHERE is_projection = 0 AND actual_input_ksheets > 0
+        """),
+        # Future capacity-only rows have actual_input=0 and util=0
+        'latest_input_date': _scalar(conn, """
+            SELECT MAX(date) FROM utilization WHERE actual_input_ksheets > 0
+        """),
+    }
+    summary['avg_utilization'] = None
+    if summary['latest_input_date'] is not None:
+        summary['avg_utilization'] = conn.execute("""
+            SELECT AVG(utilization_pct) FROM utilization
+            WHERE actual_input_ksheets > 0 AND date = ?
+        """, (summary['latest_input_date'],)).fetchone()[0]
+    return summary
+
+
+def refresh_dashboard_summary(conn: sqlite3.Connection) -> dict:
+    """Recompute and store the summary row.
+
+    Call with the writer connection after the data change (and its
+    bump_data_version) in the same transaction.
+    """
+    _ensure_summary_table(conn)
+    summary = _compute_summary(conn)
+    versions = json.dumps(table_versions(conn, *SUMMARY_TABLES))
+    conn.execute(f"""
+        INSERT OR REPLACE INTO dashboard_summary
+            (id, {', '.join(SUMMARY_COLUMNS)}, source_versions, refreshed_at)
+        VALUES (1, {', '.join('?' * len(SUMMARY_COLUMNS))}, ?, ?)
+    """, [summary[c] for c in SUMMARY_COLUMNS] + [versions, datetime.now().isoformat()])
+    bump_data_version(conn, 'dashboard_summary')
+    return summary
+
+
+def _stored_summary(conn: sqlite3.Connection) -> Optional[dict]:
+    """The stored row, or None if missing or built from older data."""
+    try:
+        row = conn.execute(
+            f"SELECT {', '.join(SUMMARY_COLUMNS)}, source_versions "
+            f"FROM dashboard_summary WHERE id = 1"
+        ).fetchone()
+    except sqlite3.OperationalError:
+        return None
+    if row is None:
+        return None
+    if tuple(json.loads(row[-1])) != table_versions(conn, *SUMMARY_TABLES):
+        return None
+    return dict(zip(SUMMARY_COLUMNS, row))
+
+
+def refresh_stale_dashboard_summary(db_path=None) -> bool:
+    """Store a fresh summary row if the stored one is missing or stale;
+    True if it was rebuilt. For writers that do not refresh it in their
+    own transaction."""
+    with write_connection(db_path or DB_PATH) as conn:
+        if _stored_summary(conn) is not None:
+            return False
+        refresh_dashboard_summary(conn)
+    return True
+
+
+def get_dashboard_summary(db_path=None) -> dict:
+    """Summary row for the home page; computed (not stored) if it is stale."""
+    with read_connection(db_path or DB_PATH) as conn:
+        summary = _stored_summary(conn)
+        if summary is None:
+            summary = _compute_summary(conn)
+    return summary
@@ -1,118 +1,235 @@
 """
 Data import utilities for Display Intelligence Dashboard.
 Imports utilization data from DSCC Excel reports.
+
+Run from the project root with: python -m utils.data_import [--incremental]
 """
 
 import pandas as pd
-import sqlite3
 from pathlib import Path
 from datetime import datetime
 from typing import Optional
 
-DB_PATH = Path(__file__).parent.parent / "displayintel.db"
+from .dashboard_summary import refresh_dashboard_summary
+from .data_version import bump_data_version
+from .db_pool import DB_PATH, bulk_write_connection, write_connection
+from .migrations import apply_migrations
+from .warmup import request_warmup
+from .workbook_cache import cached_sheet
+
 SOURCE_DATA_PATH = Path(__file__).parent.parent / "source_data"
 
 
-def import_utilization_data(
-    file_path: Optional[str] = None,
-    clear_existing: bool = False
-):
-    """
-    Import utilization data from DSCC Excel file.
+def _records(df: pd.DataFrame, columns: list) -> list:
+    """Rows as tuples of plain Python values (NaN → None) for executemany."""
+    frame = df[columns].astype(object)
+    return list(frame.where(frame.notna(), None).itertuples(index=False, name=None))
 
-    The StaticDB sheet contains detailed data with:
-    - Factory, Phase, Backplane, Frontplane info
-    - Monthly capacity and actual input
-    - Each row is a factory-phase-month combination
 
-    We aggregate by Factory + Backplane to get total capacity per backplane technology.
-    """
-    if file_path is None:
-        file_path = SOURCE_DATA_PATH / "2025Q4_Quarterly_All_Display_Fab_Utilization Report_RevA copy.xlsm"
+def _bulk_insert(conn, table: str, df: pd.DataFrame, columns: list):
+    placeholders = ', '.join('?' * len(columns))
+    conn.executemany(
+        f"INSERT OR REPLACE INTO {table} ({', '.join(columns)}) VALUES ({placeholders})",
+        _records(df, columns)
+    )
 
-    print(f"Reading from: {file_path}")
 
-    # Read StaticDB sheet
-    df = pd.read_excel(file_path, sheet_name='StaticDB', header=3)
-
-    print(f"Total rows in source: {len(df)}")
-
-    # Clean column names
-    df.columns = [c.strip().replace('\n', ' ') for c in df.columns]
-
-    # Rename columns for clarity
-    column_map = {
-        'Factory1': 'factory_name',
-        'Factory2 (Location)': 'location',
-        'Manufacturer': 'manufacturer',
-        'Region': 'region',
-        'Backplane': 'backplane',
-        'Frontplane': 'technology',
-        'TFT Gen1': 'generation',
-        'Substrate': 'substrate',
-        'Application Category': 'application_category',
-        'Month': 'date',
-        'Year': 'year',
-        'Q': 'quarter',
-        'Phase': 'phase',
-        'Eqpt PO': 'eqpt_po_year',
-        'Install': 'install_date',
-        'MP Ramp': 'mp_ramp_date',
-        'Probability': 'probability',
-        'Capacity (k Sheet/Month)': 'capacity_ksheets',
-        'Actual Input (k Sheet/Month)': 'actual_input_ksheets',
-        'Areal Input Capacity (1,000 m2/Month)': 'capacity_sqm_k',
-        'Areal Actual Input (1,000 m2/Month)': 'actual_input_sqm_k',
-        'Utilization )%': 'utilization_pct'
-    }
+def _drop_secondary_indexes(conn, tables: list) -> list:
+    """Drop the explicit indexes on tables and return the SQL to recreate them.
 
-    df = df.rename(columns=column_map)
-
-    # Filter out rows without required data
-    df = df[df['manufacturer'].notna() & df['factory_name'].notna()]
+    Constraint indexes (PRIMARY KEY / UNIQUE) have no SQL and are kept, so
+    INSERT OR REPLACE still sees them.
+    """
+    rows = conn.execute(f"""
+        SELECT name, sql FROM sqlite_master
+        WHERE type = 'index' AND sql IS NOT NULL
+          AND tbl_name IN ({', '.join('?' * len(tables))})
+    """, tables).fetchall()
+    for name, _ in rows:
+        conn.execute(f'DROP INDEX "{name}"')
+    return [sql for _, sql in rows]
+
+
+# StaticDB layout: the header is on the fourth row (pd.read_excel header=3)
+STATIC_DB_SHEET = 'StaticDB'
+STATIC_DB_HEADER_ROW = 3
+
+# StaticDB header → column name
+COLUMN_MAP = {
+    'Factory1': 'factory_name',
+    'Factory2 (Location)': 'location',
+    'Manufacturer': 'manufacturer',
+    'Region': 'region',
+    'Backplane': 'backplane',
+    'Frontplane': 'technology',
+    'TFT Gen1': 'generation',
+    'Substrate': 'substrate',
+    'Application Category': 'application_category',
+    'Month': 'date',
+    'Year': 'year',
+    'Q': 'quarter',
+    'Phase': 'phase',
+    'Eqpt PO': 'eqpt_po_year',
+    'Install': 'install_date',
+    'MP Ramp': 'mp_ramp_date',
+    'Probability': 'probability',
+    'Capacity (k Sheet/Month)': 'capacity_ksheets',
+    'Actual Input (k Sheet/Month)': 'actual_input_ksheets',
+    'Areal Input Capacity (1,000 m2/Month)': 'capacity_sqm_k',
+    'Areal Actual Input (1,000 m2/Month)': 'actual_input_sqm_k',
+    'Utilization )%': 'utilization_pct'
+}
+
+# Per factory-date aggregation: descriptive columns keep the first value seen,
+# measures are summed across phases
+FIRST_COLS = [
+    'manufacturer', 'factory_name', 'location', 'region', 'backplane', 'technology',
+    'generation', 'substrate', 'application_category', 'eqpt_po_year',
+    'install_date', 'mp_ramp_date', 'probability'
+]
+SUM_COLS = ['capacity_ksheets', 'actual_input_ksheets', 'capacity_sqm_k', 'actual_input_sqm_k']
+
+# Strings pandas' Excel reader treats as missing
+_NA_STRINGS = {
+    '', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan',
+    '1.#IND', '1.#QNAN', '<NA>', 'N/A', 'NA', 'NULL', 'NaN', 'None', 'n/a',
+    'nan', 'null'
+}
+
+
+def _cell_value(value):
+    """Excel cell value as pd.read_excel would see it (missing → None)."""
+    if value is None:
+        return None
+    if isinstance(value, str):
+        return None if value in _NA_STRINGS else value
+    if isinstance(value, float):
+        if value != value:
+            return None
+        return int(value) if value.is_integer() else value
+    return value
+
+
+def _is_number(value) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def read_static_db(file_path) -> tuple:
+    """Aggregated StaticDB rows, parsed once per workbook version.
+
+    Returns (aggregated DataFrame, number of non-blank source rows).
+    """
+    df = cached_sheet(file_path, STATIC_DB_SHEET, _parse_static_db)
+    return df, df.attrs['total_rows']
 
-    # Convert date to string format
-    df['date'] = pd.to_datetime(df['date']).dt.strftime('%Y-%m-%d')
 
-    # Extract month number
-    df['month'] = pd.to_datetime(df['date']).dt.month
+def _parse_static_db(file_path) -> pd.DataFrame:
+    """Stream the StaticDB sheet and aggregate phases per factory and month.
 
-    # Create factory_id: manufacturer_factory_backplane
-    df['factory_id'] = df.apply(
-        lambda r: f"{r['manufacturer']}_{r['factory_name']}_{r['backplane']}"
-        if pd.notna(r['backplane']) else f"{r['manufacturer']}_{r['factory_name']}",
-        axis=1
+    Reads the workbook in openpyxl read-only mode one row at a time, keeping
+    only the COLUMN_MAP columns and a running aggregate per
+    (factory_id, date), so memory does not grow with the sheet. The result
+    matches reading the sheet with pd.read_excel and grouping it with pandas.
+    The number of non-blank source rows is returned in ``attrs['total_rows']``.
+    """
+    import openpyxl
+
+    wb = openpyxl.load_workbook(file_path, read_only=True, data_only=True)
+    try:
+        rows = wb[STATIC_DB_SHEET].iter_rows(values_only=True)
+        for _ in range(STATIC_DB_HEADER_ROW):
+            next(rows, None)
+        header = next(rows, ())
+
+        positions = {}
+        for i, name in enumerate(header):
+            name = str(name).strip().replace('\n', ' ') if name is not None else None
+            if name in COLUMN_MAP and COLUMN_MAP[name] not in positions:
+                positions[COLUMN_MAP[name]] = i
+        projected = [(col, positions.get(col)) for col in set(COLUMN_MAP.values())]
+
+        groups = {}
+        total_rows = 0
+        # pandas makes a numeric column float64 when it has gaps; track that
+        # so integral values come out the same way
+        has_missing = dict.fromkeys(FIRST_COLS, False)
+        all_numeric = dict.fromkeys(FIRST_COLS, True)
+
+        for values in rows:
+            if all(v is None or v == '' for v in values):
+                continue
+            total_rows += 1
+            row = {
+                col: _cell_value(values[i]) if i is not None and i < len(values) else None
+                for col, i in projected
+            }
+            for col in FIRST_COLS:
+                value = row[col]
+                if value is None:
+                    has_missing[col] = True
+                elif not _is_number(value):
+                    all_numeric[col] = False
+
+            if row['manufacturer'] is None or row['factory_name'] is None or row['date'] is None:
+                continue
+            if row['year'] is None or row['quarter'] is None:
+                continue
+
+            month = pd.Timestamp(row['date'])
+            if row['backplane'] is not None:
+                factory_id = f"{row['manufacturer']}_{row['factory_name']}_{row['backplane']}"
+            else:
+                factory_id = f"{row['manufacturer']}_{row['factory_name']}"
+            key = (factory_id, month.strftime('%Y-%m-%d'), row['year'], row['quarter'], month.month)
+
+            group = groups.get(key)
+            if group is None:
+                group = groups[key] = dict.fromkeys(FIRST_COLS)
+                group.update(dict.fromkeys(SUM_COLS, 0.0))
+                group['phase_count'] = 0
+            for col in FIRST_COLS:
+                if group[col] is None:
+                    group[col] = row[col]
+            for col in SUM_COLS:
+                if _is_number(row[col]):
+                    group[col] += row[col]
+            if row['phase'] is not None:
+                group['phase_count'] += 1
+    finally:
+        wb.close()
+
+    key_cols = ['factory_id', 'date', 'year', 'quarter', 'month']
+    agg_df = pd.DataFrame(
+        [dict(zip(key_cols, key), **group) for key, group in sorted(groups.items())],
+        columns=key_cols + FIRST_COLS + SUM_COLS + ['phase_count']
     )
+    for col in FIRST_COLS:
+        if has_missing[col] and all_numeric[col]:
+            agg_df[col] = agg_df[col].map(lambda v: float(v) if v is not None else v)
+    agg_df.attrs['total_rows'] = total_rows
+    return agg_df
 
-    # Aggregate by factory_id + date (sum across phases)
-    agg_df = df.groupby(['factory_id', 'date', 'year', 'quarter', 'month']).agg({
-        'manufacturer': 'first',
-        'factory_name': 'first',
-        'location': 'first',
-        'region': 'first',
-        'backplane': 'first',
-        'technology': 'first',
-        'generation': 'first',
-        'substrate': 'first',
-        'application_category': 'first',
-        'eqpt_po_year': 'first',
-        'install_date': 'first',
-        'mp_ramp_date': 'first',
-        'probability': 'first',
-        'capacity_ksheets': 'sum',
-        'actual_input_ksheets': 'sum',
-        'capacity_sqm_k': 'sum',
-        'actual_input_sqm_k': 'sum',
-        'phase': 'count'  # Count of phases
-    }).reset_index()
 
-    agg_df = agg_df.rename(columns={'phase': 'phase_count'})
+FACTORY_COLS = [
+    'factory_id', 'manufacturer', 'factory_name', 'location', 'region', 'technology',
+    'backplane', 'generation', 'substrate', 'application_category',
+    'eqpt_po_year', 'install_date', 'mp_ramp_date', 'probability', 'status', 'created_at'
+]
+UTIL_COLS = [
+    'factory_id', 'date', 'year', 'quarter', 'month',
+    'utilization_pct', 'capacity_ksheets', 'actual_input_ksheets',
+    'capacity_sqm_k', 'actual_input_sqm_k', 'data_source', 'created_at', 'is_projection'
+]
+
 
+def prepare_utilization(agg_df: pd.DataFrame, data_source: str) -> tuple:
+    """Build the factories and utilization rows from aggregated StaticDB data.
+
+    Returns (factories_df, util_df) with FACTORY_COLS and UTIL_COLS columns.
+    """
     # Calculate utilization percentage
     agg_df['utilization_pct'] = (agg_df['actual_input_ksheets'] / agg_df['capacity_ksheets'] * 100).fillna(0)
 
-    print(f"Aggregated to {len(agg_df)} factory-backplane-date combinations")
-
     # Get unique factories for the factories table
     factories_df = agg_df.groupby('factory_id').agg({
         'manufacturer': 'first',
@@ -133,8 +250,9 @@ def import_utilization_data(
     # Add status based on capacity
     latest_date = agg_df['date'].max()
     latest_capacity = agg_df[agg_df['date'] == latest_date].set_index('factory_id')['capacity_ksheets']
-    factories_df['status'] = factories_df['factory_id'].apply(
-        lambda x: 'operating' if x in latest_capacity.index and latest_capacity[x] > 0 else 'planned'
+    operating = latest_capacity.index[latest_capacity > 0]
+    factories_df['status'] = factories_df['factory_id'].isin(operating).map(
+        {True: 'operating', False: 'planned'}
     )
 
     factories_df['created_at'] = datetime.now().isoformat()
@@ -146,75 +264,228 @@ def import_utilization_data(
                 lambda x: str(x) if pd.notna(x) else None
             )
 
-    print(f"Unique factories: {len(factories_df)}")
+    # Prepare utilization data
+    util_df = agg_df[UTIL_COLS[:10]].copy()
+    util_df['data_source'] = data_source
+    util_df['created_at'] = datetime.now().isoformat()
+    util_df['is_projection'] = 0
+
+    return factories_df[FACTORY_COLS], util_df
 
-    # Connect to database
-    conn = sqlite3.connect(DB_PATH)
+
+def load_utilization(conn, factories_df: pd.DataFrame, util_df: pd.DataFrame,
+                     clear_existing: bool = False):
+    """Write prepared factories/utilization rows with the bulk writer connection."""
+    indexes = _drop_secondary_indexes(conn, ['factories', 'utilization'])
 
     if clear_existing:
         print("Clearing existing data...")
         conn.execute("DELETE FROM utilization")
         conn.execute("DELETE FROM factories")
-        conn.commit()
-
-    # Prepare utilization data
-    util_cols = [
-        'factory_id', 'date', 'year', 'quarter', 'month',
-        'utilization_pct', 'capacity_ksheets', 'actual_input_ksheets',
-        'capacity_sqm_k', 'actual_input_sqm_k'
-    ]
-
-    util_df = agg_df[util_cols].copy()
-    util_df['data_source'] = str(file_path.name) if hasattr(file_path, 'name') else str(file_path).split('/')[-1]
-    util_df['created_at'] = datetime.now().isoformat()
-    util_df['is_projection'] = 0
 
     # Insert/update factories
     print("Updating factories table...")
-    for _, row in factories_df.iterrows():
-        conn.execute("""
-            INSERT OR REPLACE INTO factories
-            (factory_id, manufacturer, factory_name, location, region, technology,
-             backplane, generation, substrate, application_category,
-             eqpt_po_year, install_date, mp_ramp_date, probability, status, created_at)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
-            row['factory_id'], row['manufacturer'], row['factory_name'],
-            row['location'], row['region'], row['technology'],
-            row['backplane'], row['generation'], row['substrate'],
-            row['application_category'], row['eqpt_po_year'],
-            row['install_date'], row['mp_ramp_date'], row['probability'],
-            row['status'], row['created_at']
-        ))
+    _bulk_insert(conn, 'factories', factories_df, FACTORY_COLS)
 
     # Insert utilization data
     print("Updating utilization table...")
-    for _, row in util_df.iterrows():
-        conn.execute("""
-            INSERT OR REPLACE INTO utilization
-            (factory_id, date, year, quarter, month, utilization_pct,
-             capacity_ksheets, actual_input_ksheets, capacity_sqm_k,
-             actual_input_sqm_k, data_source, created_at, is_projection)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
-            row['factory_id'], row['date'], row['year'], row['quarter'],
-            row['month'], row['utilization_pct'], row['capacity_ksheets'],
-            row['actual_input_ksheets'], row['capacity_sqm_k'],
-            row['actual_input_sqm_k'], row['data_source'],
-            row['created_at'], row['is_projection']
-        ))
-
-    conn.commit()
-    conn.close()
+    _bulk_insert(conn, 'utilization', util_df, UTIL_COLS)
+
+    print(f"Rebuilding {len(indexes)} indexes...")
+    for sql in indexes:
+        conn.execute(sql)
+
+    # Record content hashes so later incremental imports can diff against them
+    _ensure_row_hash_table(conn)
+    if clear_existing:
+        conn.execute("DELETE FROM import_row_hashes WHERE table_name IN ('factories', 'utilization')")
+    for table, df in (('factories', factories_df), ('utilization', util_df)):
+        key_cols, hash_cols = _HASHED_TABLES[table]
+        _store_row_hashes(conn, table, _row_keys(df, key_cols), _row_hashes(df, hash_cols))
+
+    bump_data_version(conn, 'factories', 'utilization')
+    refresh_dashboard_summary(conn)
+
+
+# Key columns and the columns whose content decides whether a row changed
+# (created_at and data_source differ on every import, so they are left out)
+_HASHED_TABLES = {
+    'factories': (['factory_id'], [c for c in FACTORY_COLS if c != 'created_at']),
+    'utilization': (['factory_id', 'date'],
+                    [c for c in UTIL_COLS if c not in ('data_source', 'created_at')]),
+}
+
+
+def _ensure_row_hash_table(conn):
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS import_row_hashes (
+            table_name TEXT NOT NULL,
+            row_key TEXT NOT NULL,
+            row_hash TEXT NOT NULL,
+            PRIMARY KEY (table_name, row_key)
+        ) WITHOUT ROWID
+    """)
+
+
+def _row_keys(df: pd.DataFrame, key_cols: list) -> pd.Series:
+    keys = df[key_cols[0]].astype(str)
+    for col in key_cols[1:]:
+        keys = keys + '|' + df[col].astype(str)
+    return keys
+
+
+def _row_hashes(df: pd.DataFrame, cols: list) -> pd.Series:
+    """Stable per-row content hash (hex) of the given columns."""
+    hashed = pd.util.hash_pandas_object(df[cols].astype(object), index=False)
+    return hashed.map('{:016x}'.format)
+
+
+def _store_row_hashes(conn, table: str, keys: pd.Series, hashes: pd.Series):
+    conn.executemany(
+        "INSERT OR REPLACE INTO import_row_hashes (table_name, row_key, row_hash) VALUES (?, ?, ?)",
+        zip([table] * len(keys), keys.tolist(), hashes.tolist())
+    )
+
+
+def _diff_table(conn, table: str, df: pd.DataFrame) -> dict:
+    """Apply only the inserts, updates and deletes needed to make table match df."""
+    key_cols, hash_cols = _HASHED_TABLES[table]
+    columns = FACTORY_COLS if table == 'factories' else UTIL_COLS
+
+    new = df.reset_index(drop=True)
+    new_keys = _row_keys(new, key_cols)
+    new_hashes = _row_hashes(new, hash_cols)
+
+    stored = pd.read_sql_query(
+        f"SELECT {', '.join(key_cols)} FROM {table}", conn
+    )
+    stored_keys = set(_row_keys(stored, key_cols)) if len(stored) else set()
+    known = dict(conn.execute(
+        "SELECT row_key, row_hash FROM import_row_hashes WHERE table_name = ?", (table,)
+    ).fetchall())
+
+    exists = new_keys.isin(stored_keys)
+    same = exists & (new_keys.map(known) == new_hashes)
+    inserted = new[~exists]
+    updated = new[exists & ~same]
+    deleted_keys = stored_keys - set(new_keys)
+
+    if len(inserted):
+        _bulk_insert(conn, table, inserted, columns)
+    if len(updated):
+        set_cols = [c for c in columns if c not in key_cols]
+        conn.executemany(
+            f"UPDATE {table} SET {', '.join(f'{c} = ?' for c in set_cols)} "
+            f"WHERE {' AND '.join(f'{c} = ?' for c in key_cols)}",
+            _records(updated, set_cols + key_cols)
+        )
+    if deleted_keys:
+        deleted = stored[_row_keys(stored, key_cols).isin(deleted_keys)]
+        conn.executemany(
+            f"DELETE FROM {table} WHERE {' AND '.join(f'{c} = ?' for c in key_cols)}",
+            _records(deleted, key_cols)
+        )
+        conn.executemany(
+            "DELETE FROM import_row_hashes WHERE table_name = ? AND row_key = ?",
+            [(table, key) for key in deleted_keys]
+        )
+    changed = ~same
+    _store_row_hashes(conn, table, new_keys[changed], new_hashes[changed])
+
+    return {
+        'inserted': len(inserted),
+        'updated': len(updated),
+        'deleted': len(deleted_keys),
+        'unchanged': int(same.sum()),
+    }
+
+
+def load_utilization_incremental(conn, factories_df: pd.DataFrame,
+                                 util_df: pd.DataFrame) -> dict:
+    """Diff prepared rows against the database and write only what changed.
+
+    Rows are matched on factory_id (factories) or factory_id + date
+    (utilization) and compared by content hash. Rows missing from the new
+    data are deleted, so the result equals a clear_existing import. Only
+    tables that actually changed get a new data version.
+
+    Returns {table: {'inserted', 'updated', 'deleted', 'unchanged'}}.
+    """
+    _ensure_row_hash_table(conn)
+    summary = {
+        # Factories first so new utilization rows never reference a missing factory
+        'factories': _diff_table(conn, 'factories', factories_df),
+        'utilization': _diff_table(conn, 'utilization', util_df),
+    }
+    changed = [table for table, counts in summary.items()
+               if counts['inserted'] or counts['updated'] or counts['deleted']]
+    if changed:
+        bump_data_version(conn, *changed)
+        refresh_dashboard_summary(conn)
+    return summary
+
+
+def import_utilization_data(
+    file_path: Optional[str] = None,
+    clear_existing: bool = False,
+    incremental: bool = False
+):
+    """
+    Import utilization data from DSCC Excel file.
+
+    The StaticDB sheet contains detailed data with:
+    - Factory, Phase, Backplane, Frontplane info
+    - Monthly capacity and actual input
+    - Each row is a factory-phase-month combination
+
+    We aggregate by Factory + Backplane to get total capacity per backplane technology.
+    The sheet is streamed (see read_static_db), so memory stays bounded by the
+    number of factory-date combinations rather than the workbook size.
+
+    With incremental=True only rows whose content changed since the last
+    import are written (see load_utilization_incremental), and the change
+    summary is returned.
+    """
+    if file_path is None:
+        file_path = SOURCE_DATA_PATH / "2025Q4_Quarterly_All_Display_Fab_Utilization Report_RevA copy.xlsm"
+    file_path = Path(file_path)
+
+    print(f"Reading from: {file_path}")
+
+    agg_df, total_rows = read_static_db(file_path)
+
+    print(f"Total rows in source: {total_rows}")
+    print(f"Aggregated to {len(agg_df)} factory-backplane-date combinations")
+
+    factories_df, util_df = prepare_utilization(agg_df, file_path.name)
+
+    print(f"Unique factories: {len(factories_df)}")
+
+    summary = None
+    if incremental:
+        with write_connection(DB_PATH) as conn:
+            summary = load_utilization_incremental(conn, factories_df, util_df)
+    else:
+        with bulk_write_connection(DB_PATH) as conn:
+            load_utilization(conn, factories_df, util_df, clear_existing)
+    apply_migrations(DB_PATH)
+    request_warmup()
 
     print("Import complete!")
 
+    if summary is not None:
+        print("\n=== Changes ===")
+        for table, counts in summary.items():
+            print(f"{table}: {counts['inserted']} inserted, {counts['updated']} updated, "
+                  f"{counts['deleted']} deleted, {counts['unchanged']} unchanged")
+
     # Print summary
     print("\n=== Import Summary ===")
     print(f"Factories imported: {len(factories_df)}")
     print(f"Utilization records: {len(util_df)}")
 
     # Show sample of A3 data
+    latest_date = agg_df['date'].max()
     a3_data = agg_df[(agg_df['factory_name'] == 'A3') & (agg_df['date'] == latest_date)]
     if len(a3_data) > 0:
         print("\n=== A3 Capacity (latest month) ===")
@@ -222,6 +493,12 @@ def import_utilization_data(
             print(f"  {row['backplane']}: {row['capacity_ksheets']:.1f}K/mo ({row['phase_count']} phases)")
         print(f"  Total: {a3_data['capacity_ksheets'].sum():.1f}K/mo")
 
+    return summary
+
 
 if __name__ == "__main__":
-    import_utilization_data(clear_existing=True)
+    import sys
+    if "--incremental" in sys.argv[1:]:
+        import_utilization_data(incremental=True)
+    else:
+        import_utilization_data(clear_existing=True)
@@ -0,0 +1,139 @@
+"""
+Per-table data versions for Display Intelligence Dashboard.
+
+Every writer bumps a generation counter for the tables it touches, inside the
+same transaction as the data change. Cached query results are keyed on the
+generations of the tables they read, so they stay valid for as long as the
+data is unchanged and are invalidated as soon as a write commits.
+"""
+
+import hashlib
+import inspect
+import sqlite3
+from datetime import datetime
+from typing import Optional, Tuple
+
+from .db_pool import DB_PATH, read_connection
+from .result_cache import RESULT_CACHE, freeze
+
+
+def _ensure_versions_table(conn: sqlite3.Connection):
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS data_versions (
+            table_name TEXT PRIMARY KEY,
+            generation INTEGER NOT NULL DEFAULT 0,
+            updated_at TEXT
+        )
+    """)
+
+
+def bump_data_version(conn: sqlite3.Connection, *tables: str):
+    """Advance the generation of each table.
+
+    Call with the writer connection inside the transaction that changed the
+    data, so readers never see new rows with an old version.
+    """
+    _ensure_versions_table(conn)
+    now = datetime.now().isoformat()
+    for table in tables:
+        conn.execute("""
+            INSERT INTO data_versions (table_name, generation, updated_at)
+            VALUES (?, 1, ?)
+            ON CONFLICT(table_name) DO UPDATE SET
+                generation = generation + 1,
+                updated_at = excluded.updated_at
+        """, (table, now))
+
+
+def _ensure_meta_table(conn: sqlite3.Connection):
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS meta (
+            key TEXT PRIMARY KEY,
+            value TEXT,
+            updated_at TEXT
+        )
+    """)
+
+
+def get_meta(conn: sqlite3.Connection, key: str) -> Optional[str]:
+    """Read a value from the key/value meta table (None if unset)."""
+    try:
+        row = conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+    except sqlite3.OperationalError:
+        return None
+    return row[0] if row else None
+
+
+def set_meta(conn: sqlite3.Connection, key: str, value: str):
+    """Store a value in the meta table; call with the writer connection."""
+    _ensure_meta_table(conn)
+    conn.execute("""
+        INSERT INTO meta (key, value, updated_at) VALUES (?, ?, ?)
+        ON CONFLICT(key) DO UPDATE SET
+            value = excluded.value,
+            updated_at = excluded.updated_at
+    """, (key, value, datetime.now().isoformat()))
+
+
+def table_versions(conn: sqlite3.Connection, *tables: str) -> Tuple[int, ...]:
+    """Generation of each table as seen by ``conn``, including its own
+    uncommitted bumps (0 if it has never been written)."""
+    try:
+        rows = dict(conn.execute(
+            f"SELECT table_name, generation FROM data_versions "
+            f"WHERE table_name IN ({','.join('?' * len(tables))})",
+            tables
+        ).fetchall())
+    except sqlite3.OperationalError:
+        # Database predates data_versions; nothing has been bumped yet
+        rows = {}
+    return tuple(rows.get(table, 0) for table in tables)
+
+
+def get_data_version(*tables: str, db_path=None) -> Tuple[int, ...]:
+    """Current generation of each table (0 if it has never been written)."""
+    with read_connection(db_path or DB_PATH) as conn:
+        return table_versions(conn, *tables)
+
+
+def _source_key(func) -> str:
+    try:
+        source = inspect.getsource(func).encode()
+    except (OSError, TypeError):
+        source = func.__code__.co_code
+    return hashlib.md5(source).hexdigest()
+
+
+def versioned_cache(*tables: str):
+    """Cache a query function until one of ``tables`` is written.
+
+    Drop-in replacement for ``st.cache_data(ttl=...)`` on read-only queries.
+    Results carry no expiry; the cache key includes the current generation of
+    each listed table, so a write to any of them forces a re-query. Results
+    live in the process-wide RESULT_CACHE and are shared across sessions.
+    """
+    def decorator(func):
+        name = f"{func.__module__}.{func.__qualname__}"
+        source_key = _source_key(func)
+        signature = inspect.signature(func)
+
+        def wrapper(*args, **kwargs):
+            # Bind to parameter names so f(x), f(a=x) and f(x, None) share an entry
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            key = (name, source_key, get_data_version(*tables), freeze(bound.arguments))
+            return RESULT_CACHE.get_or_compute(key, lambda: func(*args, **kwargs))
+
+        def clear():
+            RESULT_CACHE.clear(lambda key: key[0] == name)
+
+        wrapper.__module__ = func.__module__
+        wrapper.__name__ = func.__name__
+        wrapper.__qualname__ = func.__qualname__
+        wrapper.__doc__ = func.__doc__
+        wrapper.clear = clear
+        wrapper.tables = tables
+        wrapper.uncached = func
+        return wrapper
+
+    return decorator
@@ -2,32 +2,45 @@
 Database query functions for Display Intelligence Dashboard
 """
 
-import sqlite3
 import pandas as pd
-from pathlib import Path
 from contextlib import contextmanager
-from typing import Optional, List, Tuple
-import streamlit as st
+from typing import Dict, Optional, List, Sequence, Tuple
 
-DB_PATH = Path(__file__).parent.parent / "displayintel.db"
+from .aggregates import AggregateSource, build_aggregate_query, case_expression
+from .columnar_store import get_columnar_store
+from .dashboard_summary import get_dashboard_summary
+from .data_version import versioned_cache
+from .db_pool import DB_PATH, read_connection
 
 
 @contextmanager
 def get_connection():
-    """Context manager for database connections."""
-    conn = sqlite3.connect(DB_PATH, check_same_thread=False)
-    conn.row_factory = sqlite3.Row
-    try:
+    """Context manager yielding this thread's pooled read-only connection.
+
+    Never writes: query indexes are created by utils.migrations at startup
+    and after imports.
+    """
+    with read_connection(DB_PATH) as conn:
         yield conn
-    finally:
-        conn.close()
+
+
+# Sidebar filter vocabularies served by get_dimension_catalog: name -> (table, column)
+DIMENSION_COLUMNS = {
+    'manufacturers': ('factories', 'manufacturer'),
+    'technologies': ('factories', 'technology'),
+    'regions': ('factories', 'region'),
+    'vendors': ('equipment_orders', 'vendor'),
+    'equipment_types': ('equipment_orders', 'equipment_type'),
+    'applications': ('shipments', 'application'),
+    'panel_makers': ('shipments', 'panel_maker'),
+}
 
 
 class DatabaseManager:
     """Manages all database queries for the dashboard."""
 
     @staticmethod
-    @st.cache_data(ttl=300)
+    @versioned_cache("factories")
     def get_factories(
         manufacturer: Optional[str] = None,
         technology: Optional[str] = None,
@@ -35,6 +48,10 @@ class DatabaseManager:
         status: Optional[str] = None
     ) -> pd.DataFrame:
         """Get factories with optional filters."""
+        store = get_columnar_store(get_connection)
+        if store is not None:
+            return store.factories(manufacturer, technology, region, status)
+
         query = "SELECT * FROM factories WHERE 1=1"
         params = []
 
@@ -57,7 +74,7 @@ class DatabaseManager:
             return pd.read_sql_query(query, conn, params=params)
 
     @staticmethod
-    @st.cache_data(ttl=300)
+    @versioned_cache("utilization", "factories")
     def get_utilization(
         start_date: Optional[str] = None,
         end_date: Optional[str] = None,
@@ -66,6 +83,10 @@ class DatabaseManager:
         manufacturer: Optional[str] = None
     ) -> pd.DataFrame:
         """Get utilization data with optional filters."""
+        store = get_columnar_store(get_connection)
+        if store is not None:
+            return store.utilization(start_date, end_date, factory_id, factory_name, manufacturer)
+
         query = """
             SELECT u.*, f.manufacturer, f.factory_name, f.technology, f.region, f.backplane
             FROM utilization u
@@ -96,7 +117,7 @@ class DatabaseManager:
             return pd.read_sql_query(query, conn, params=params)
 
     @staticmethod
-    @st.cache_data(ttl=300)
+    @versioned_cache("equipment_orders")
     def get_equipment_orders(
         start_year: Optional[int] = None,
         end_year: Optional[int] = None,
@@ -108,6 +129,10 @@ class DatabaseManager:
 
         Uses po_year for date filtering since po_date is often NULL.
         """
+        store = get_columnar_store(get_connection)
+        if store is not None:
+            return store.equipment_orders(start_year, end_year, manufacturer, vendor, equipment_type)
+
         query = "SELECT * FROM equipment_orders WHERE po_year IS NOT NULL"
         params = []
 
@@ -133,7 +158,7 @@ class DatabaseManager:
             return pd.read_sql_query(query, conn, params=params)
 
     @staticmethod
-    @st.cache_data(ttl=300)
+    @versioned_cache("shipments")
     def get_shipments(
         start_year: Optional[int] = None,
         end_year: Optional[int] = None,
@@ -144,17 +169,21 @@ class DatabaseManager:
         """Get shipment data with optional filters.
 
         Note: date column contains period strings like '2016-Q1 2016' not actual dates.
-        Filtering is done by extracting the year from the date string.
+        Filtering uses the year column parsed from it at import. Duplicate
+        rows are removed by the migration that adds the natural-key index.
         """
+        store = get_columnar_store(get_connection)
+        if store is not None:
+            return store.shipments(start_year, end_year, panel_maker, technology, application)
+
         query = "SELECT * FROM shipments WHERE 1=1"
         params = []
 
-        # Filter by year extracted from date string (first 4 chars)
         if start_year:
-            query += " AND CAST(SUBSTR(date, 1, 4) AS INTEGER) >= ?"
+            query += " AND year >= ?"
             params.append(start_year)
         if end_year:
-            query += " AND CAST(SUBSTR(date, 1, 4) AS INTEGER) <= ?"
+            query += " AND year <= ?"
             params.append(end_year)
         if panel_maker and panel_maker != "All":
             query += " AND panel_maker = ?"
@@ -169,20 +198,41 @@ class DatabaseManager:
         query += " ORDER BY date DESC"
 
         with get_connection() as conn:
-            df = pd.read_sql_query(query, conn, params=params)
-
-        # Deduplicate: source data contains identical rows from import
-        dedup_cols = ['date', 'panel_maker', 'brand', 'model', 'size_inches',
-                      'technology', 'application', 'units_k', 'revenue_m']
-        before = len(df)
-        df = df.drop_duplicates(subset=dedup_cols)
-        if before != len(df):
-            print(f"[data-quality] shipments: dropped {before - len(df):,} "
-                  f"duplicate rows ({before:,} → {len(df):,})")
-        return df
+            return pd.read_sql_query(query, conn, params=params)
+
+    @staticmethod
+    @versioned_cache("shipment_cube")
+    def get_shipment_cube(
+        start_year: Optional[int] = None,
+        end_year: Optional[int] = None,
+        panel_maker: Optional[str] = None,
+        application: Optional[str] = None
+    ) -> pd.DataFrame:
+        """Get pre-aggregated shipment sums with the same filters as get_shipments.
+
+        See utils.shipment_cube for the grain and the roll-up helpers.
+        """
+        query = "SELECT * FROM shipment_cube WHERE 1=1"
+        params = []
+
+        if start_year:
+            query += " AND year >= ?"
+            params.append(start_year)
+        if end_year:
+            query += " AND year <= ?"
+            params.append(end_year)
+        if panel_maker and panel_maker != "All":
+            query += " AND panel_maker = ?"
+            params.append(panel_maker)
+        if application and application != "All":
+            query += " AND application = ?"
+            params.append(application)
+
+        with get_connection() as conn:
+            return pd.read_sql_query(query, conn, params=params)
 
     @staticmethod
-    @st.cache_data(ttl=300)
+    @versioned_cache("financials")
     def get_financials(
         start_date: Optional[str] = None,
         end_date: Optional[str] = None,
@@ -208,7 +258,7 @@ class DatabaseManager:
             return pd.read_sql_query(query, conn, params=params)
 
     @staticmethod
-    @st.cache_data(ttl=300)
+    @versioned_cache("news")
     def get_news(
         start_date: Optional[str] = None,
         end_date: Optional[str] = None,
@@ -238,7 +288,7 @@ class DatabaseManager:
             return pd.read_sql_query(query, conn, params=params)
 
     @staticmethod
-    @st.cache_data(ttl=300)
+    @versioned_cache("insights")
     def get_insights(
         insight_type: Optional[str] = None,
         topic: Optional[str] = None
@@ -261,77 +311,68 @@ class DatabaseManager:
 
     # Filter options getters
     @staticmethod
-    @st.cache_data(ttl=600)
+    @versioned_cache(*sorted({table for table, _ in DIMENSION_COLUMNS.values()}))
+    def get_dimension_catalog() -> Dict[str, List[str]]:
+        """Every sidebar filter vocabulary, each starting with "All".
+
+        One statement on one connection, so all lists come from the same
+        snapshot. Keys are those of DIMENSION_COLUMNS; a list is just ["All"]
+        when its table does not exist yet.
+        """
+        with get_connection() as conn:
+            tables = {row[0] for row in conn.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'table'"
+            ).fetchall()}
+            parts = [
+                f"SELECT '{name}', {column} FROM {table} "
+                f"WHERE {column} IS NOT NULL AND {column} != '' GROUP BY {column}"
+                for name, (table, column) in DIMENSION_COLUMNS.items()
+                if table in tables
+            ]
+            catalog = {name: ["All"] for name in DIMENSION_COLUMNS}
+            if parts:
+                query = " UNION ALL ".join(parts) + " ORDER BY 1, 2"
+                for name, value in conn.execute(query).fetchall():
+                    catalog[name].append(value)
+        return catalog
+
+    @staticmethod
     def get_manufacturers() -> List[str]:
         """Get list of unique manufacturers."""
-        with get_connection() as conn:
-            cursor = conn.execute(
-                "SELECT DISTINCT manufacturer FROM factories ORDER BY manufacturer"
-            )
-            return ["All"] + [row[0] for row in cursor.fetchall() if row[0]]
+        return list(DatabaseManager.get_dimension_catalog()['manufacturers'])
 
     @staticmethod
-    @st.cache_data(ttl=600)
     def get_technologies() -> List[str]:
         """Get list of unique technologies."""
-        with get_connection() as conn:
-            cursor = conn.execute(
-                "SELECT DISTINCT technology FROM factories WHERE technology IS NOT NULL ORDER BY technology"
-            )
-            return ["All"] + [row[0] for row in cursor.fetchall() if row[0]]
+        return list(DatabaseManager.get_dimension_catalog()['technologies'])
 
     @staticmethod
-    @st.cache_data(ttl=600)
     def get_regions() -> List[str]:
         """Get list of unique regions."""
-        with get_connection() as conn:
-            cursor = conn.execute(
-                "SELECT DISTINCT region FROM factories WHERE region IS NOT NULL ORDER BY region"
-            )
-            return ["All"] + [row[0] for row in cursor.fetchall() if row[0]]
+        return list(DatabaseManager.get_dimension_catalog()['regions'])
 
     @staticmethod
-    @st.cache_data(ttl=600)
     def get_vendors() -> List[str]:
         """Get list of unique equipment vendors."""
-        with get_connection() as conn:
-            cursor = conn.execute(
-                "SELECT DISTINCT vendor FROM equipment_orders WHERE vendor IS NOT NULL ORDER BY vendor"
-            )
-            return ["All"] + [row[0] for row in cursor.fetchall() if row[0]]
+        return list(DatabaseManager.get_dimension_catalog()['vendors'])
 
     @staticmethod
-    @st.cache_data(ttl=600)
     def get_equipment_types() -> List[str]:
         """Get list of unique equipment types."""
-        with get_connection() as conn:
-            cursor = conn.execute(
-                "SELECT DISTINCT equipment_type FROM equipment_orders WHERE equipment_type IS NOT NULL ORDER BY equipment_type"
-            )
-            return ["All"] + [row[0] for row in cursor.fetchall() if row[0]]
+        return list(DatabaseManager.get_dimension_catalog()['equipment_types'])
 
     @staticmethod
-    @st.cache_data(ttl=600)
     def get_applications() -> List[str]:
         """Get list of unique applications."""
-        with get_connection() as conn:
-            cursor = conn.execute(
-                "SELECT DISTINCT application FROM shipments WHERE application IS NOT NULL ORDER BY application"
-            )
-            return ["All"] + [row[0] for row in cursor.fetchall() if row[0]]
+        return list(DatabaseManager.get_dimension_catalog()['applications'])
 
     @staticmethod
-    @st.cache_data(ttl=600)
     def get_panel_makers() -> List[str]:
         """Get list of unique panel makers from shipments."""
-        with get_connection() as conn:
-            cursor = conn.execute(
-                "SELECT DISTINCT panel_maker FROM shipments WHERE panel_maker IS NOT NULL ORDER BY panel_maker"
-            )
-            return ["All"] + [row[0] for row in cursor.fetchall() if row[0]]
+        return list(DatabaseManager.get_dimension_catalog()['panel_makers'])
 
     @staticmethod
-    @st.cache_data(ttl=600)
+    @versioned_cache("utilization")
     def get_date_range() -> Tuple[str, str]:
         """Get the date range available in utilization data."""
         with get_connection() as conn:
@@ -342,7 +383,7 @@ class DatabaseManager:
             return (row[0] or "2019-01-01", row[1] or "2026-12-31")
 
     @staticmethod
-    @st.cache_data(ttl=600)
+    @versioned_cache("factories")
     def get_factory_names(manufacturer: Optional[str] = None) -> List[str]:
         """Get list of unique factory names optionally filtered by manufacturer."""
         query = """
@@ -362,7 +403,7 @@ class DatabaseManager:
             return ["All Factories"] + names
 
     @staticmethod
-    @st.cache_data(ttl=300)
+    @versioned_cache("factories")
     def get_factory_by_name(factory_name: str) -> Optional[pd.DataFrame]:
         """Get all factory entries by name (may have multiple backplane variants)."""
         query = "SELECT * FROM factories WHERE factory_name = ? ORDER BY backplane"
@@ -371,7 +412,7 @@ class DatabaseManager:
             return df if len(df) > 0 else None
 
     @staticmethod
-    @st.cache_data(ttl=300)
+    @versioned_cache("utilization")
     def get_factory_ramp_date(factory_id: str) -> Optional[str]:
         """Get the first ramp date for a factory (first month with utilization > 0)."""
         query = """
@@ -385,7 +426,7 @@ class DatabaseManager:
             return row[0] if row and row[0] else None
 
     @staticmethod
-    @st.cache_data(ttl=300)
+    @versioned_cache("equipment_orders")
     def get_equipment_orders_for_factory(factory_id: str) -> pd.DataFrame:
         """Get equipment orders for a specific factory.
 
@@ -403,7 +444,7 @@ class DatabaseManager:
             return pd.read_sql_query(query, conn, params=[factory_id, base_factory_id])
 
     @staticmethod
-    @st.cache_data(ttl=300)
+    @versioned_cache("utilization")
     def get_all_factory_ramp_dates() -> dict:
         """Get ramp dates for all factories."""
         query = """
@@ -417,7 +458,7 @@ class DatabaseManager:
             return {row[0]: row[1] for row in cursor.fetchall()}
 
     @staticmethod
-    @st.cache_data(ttl=300)
+    @versioned_cache("factories", "utilization")
     def get_capacity_by_backplane(
         manufacturer: Optional[str] = None,
         factory_name: Optional[str] = None,
@@ -429,11 +470,10 @@ class DatabaseManager:
         Otherwise gets total capacity by backplane for manufacturer or all.
         """
         # Use latest date with actual input data if not specified
-        date_clause = "u.date = (SELECT MAX(date) FROM utilization WHERE is_projection = 0 AND actual_input_ksheets > 0)"
-        if date:
-            date_clause = "u.date = ?"
+        if not date:
+            date = get_dashboard_summary(DB_PATH)['latest_actual_date']
 
-        query = f"""
+        query = """
             SELECT
                 f.manufacturer,
                 f.factory_name,
@@ -446,11 +486,9 @@ class DatabaseManager:
                 u.date
             FROM factories f
             JOIN utilization u ON f.factory_id = u.factory_id
-            WHERE {date_clause}
+            WHERE u.date = ?
         """
-        params = []
-        if date:
-            params.append(date)
+        params = [date]
 
         if manufacturer and manufacturer != "All":
             query += " AND f.manufacturer = ?"
@@ -469,16 +507,13 @@ class DatabaseManager:
             return pd.read_sql_query(query, conn, params=params)
 
     @staticmethod
-    @st.cache_data(ttl=300)
+    @versioned_cache("factories", "utilization")
     def get_total_capacity_by_backplane(date: Optional[str] = None) -> pd.DataFrame:
         """Get total industry capacity grouped by backplane technology."""
-        date_clause = "u.date = (SELECT MAX(date) FROM utilization WHERE is_projection = 0 AND actual_input_ksheets > 0)"
-        params = []
-        if date:
-            date_clause = "u.date = ?"
-            params.append(date)
+        if not date:
+            date = get_dashboard_summary(DB_PATH)['latest_actual_date']
 
-        query = f"""
+        query = """
             SELECT
                 f.backplane,
                 f.technology,
@@ -488,64 +523,39 @@ class DatabaseManager:
                 COUNT(DISTINCT f.factory_id) as num_factories
             FROM factories f
             JOIN utilization u ON f.factory_id = u.factory_id
-            WHERE {date_clause}
+            WHERE u.date = ?
             AND f.backplane IS NOT NULL
             GROUP BY f.backplane, f.technology
             ORDER BY total_capacity_k DESC
         """
 
         with get_connection() as conn:
-            return pd.read_sql_query(query, conn, params=params)
+            return pd.read_sql_query(query, conn, params=[date])
 
     # Summary statistics
     @staticmethod
-    @st.cache_data(ttl=300)
+    @versioned_cache("factories", "utilization", "equipment_orders", "shipments")
     def get_summary_stats() -> dict:
-        """Get summary statistics for the dashboard."""
-        with get_connection() as conn:
-            stats = {}
-
-            # Factory count
-            cursor = conn.execute("SELECT COUNT(*) FROM factories")
-            stats['total_factories'] = cursor.fetchone()[0]
-
-            # Active factories
-            cursor = conn.execute("SELECT COUNT(*) FROM factories WHERE status = 'operating'")
-            stats['active_factories'] = cursor.fetchone()[0]
-
-            # Total records
-            cursor = conn.execute("SELECT COUNT(*) FROM utilization")
-            stats['utilization_records'] = cursor.fetchone()[0]
-
-            cursor = conn.execute("SELECT COUNT(*) FROM equipment_orders")
-            stats['equipment_orders'] = cursor.fetchone()[0]
-
-            cursor = conn.execute("SELECT COUNT(*) FROM shipments")
-            stats['shipments'] = cursor.fetchone()[0]
-
-            # Average utilization — use latest month that has real production
-            # (future capacity-only rows have actual_input=0 and util=0)
-            cursor = conn.execute("""
-                SELECT AVG(u.utilization_pct)
-                FROM utilization u
-                WHERE u.actual_input_ksheets > 0
-                  AND u.date = (
-                      SELECT MAX(u2.date) FROM utilization u2
-                      WHERE u2.actual_input_ksheets > 0
-                  )
-            """)
-            result = cursor.fetchone()[0]
-            stats['avg_utilization'] = round(float(result), 1) if result is not None else 0
-            print(f"[dashboard] avg_utilization = {stats['avg_utilization']}%")
-
-            # Unique manufacturers
-            cursor = conn.execute("SELECT COUNT(DISTINCT manufacturer) FROM factories")
-            stats['manufacturers'] = cursor.fetchone()[0]
-
-            return stats
+        """Get summary statistics for the dashboard.
+
+        Served from the materialized dashboard_summary row, which importers
+        refresh whenever they load data.
+        """
+        summary = get_dashboard_summary(DB_PATH)
+        stats = {
+            key: summary[key] for key in (
+                'total_factories', 'active_factories', 'utilization_records',
+                'equipment_orders', 'shipments', 'manufacturers', 'latest_actual_date',
+            )
+        }
+        # Average utilization — use latest month that has real production
+        result = summary['avg_utilization']
+        stats['avg_utilization'] = round(float(result), 1) if result is not None else 0
+        print(f"[dashboard] avg_utilization = {stats['avg_utilization']}%")
+        return stats
 
     @staticmethod
-    @st.cache_data(ttl=300)
+    @versioned_cache("utilization", "factories")
     def get_utilization_by_manufacturer(
         start_date: Optional[str] = None,
         end_date: Optional[str] = None
@@ -577,7 +587,7 @@ class DatabaseManager:
             return pd.read_sql_query(query, conn, params=params)
 
     @staticmethod
-    @st.cache_data(ttl=300)
+    @versioned_cache("equipment_orders")
     def get_equipment_spend_by_vendor(
         start_year: Optional[int] = None,
         end_year: Optional[int] = None
@@ -607,7 +617,7 @@ class DatabaseManager:
             return pd.read_sql_query(query, conn, params=params)
 
     @staticmethod
-    @st.cache_data(ttl=300)
+    @versioned_cache("shipments")
     def get_shipments_by_application(
         start_year: Optional[int] = None,
         end_year: Optional[int] = None
@@ -625,10 +635,10 @@ class DatabaseManager:
         params = []
 
         if start_year:
-            query += " AND CAST(SUBSTR(date, 1, 4) AS INTEGER) >= ?"
+            query += " AND year >= ?"
             params.append(start_year)
         if end_year:
-            query += " AND CAST(SUBSTR(date, 1, 4) AS INTEGER) <= ?"
+            query += " AND year <= ?"
             params.append(end_year)
 
         query += " GROUP BY date, application ORDER BY date"
@@ -636,6 +646,29 @@ class DatabaseManager:
         with get_connection() as conn:
             return pd.read_sql_query(query, conn, params=params)
 
+    @staticmethod
+    def aggregate(
+        source: str,
+        group_by: Sequence[str],
+        measures: Dict[str, Tuple[str, str]],
+        filters: Optional[dict] = None,
+        dropna: bool = True
+    ) -> pd.DataFrame:
+        """Group and aggregate in SQLite, returning only the aggregated rows.
+
+        ``source`` names an entry of AGGREGATE_SOURCES. ``measures`` maps each
+        output column to a (column, function) pair as in DataFrame.agg, e.g.
+        ``{'total_spend': ('amount_usd', 'sum')}``. ``filters`` maps dimensions
+        to a value, a list of values, or an inclusive (low, high) range.
+
+        Cached until one of the source's tables is written.
+        """
+        if source not in AGGREGATE_SOURCES:
+            raise ValueError(f"Unknown aggregate source {source!r}")
+        return _AGGREGATE_QUERIES[source](
+            source, list(group_by), dict(measures), dict(filters or {}), dropna
+        )
+
 
 # =============================================================================
 # Formatting Functions
@@ -739,3 +772,88 @@ def get_process_step_name(equipment_type):
     """Get process step name for equipment type."""
     step_num = get_process_step(equipment_type)
     return PROCESS_STEP_NAMES.get(step_num, 'Automation/Other')
+
+
+# =============================================================================
+# Aggregation Sources (see DatabaseManager.aggregate)
+# =============================================================================
+
+AGGREGATE_SOURCES = {
+    # Same rows as get_equipment_orders, with the page's derived columns
+    'equipment_orders': AggregateSource(
+        from_clause="equipment_orders",
+        tables=("equipment_orders",),
+        dimensions={
+            'po_year': "po_year",
+            'po_quarter': "po_quarter",
+            'manufacturer': "manufacturer",
+            'factory': "factory",
+            'factory_id': "factory_id",
+            'vendor': "vendor",
+            'equipment_type': "equipment_type",
+            # Display label: 'Others' is shown as 'Unknown'
+            'equipment_label': "CASE WHEN equipment_type = 'Others' THEN 'Unknown' ELSE equipment_type END",
+            'tool_category': "COALESCE(NULLIF(NULLIF(TRIM(tool_category), 'Other'), ''), 'Unknown')",
+            'process_step_num': case_expression("equipment_type", PROCESS_STEP_MAPPING, 8),
+            'process_step': case_expression(
+                "equipment_type",
+                {k: PROCESS_STEP_NAMES[v] for k, v in PROCESS_STEP_MAPPING.items()},
+                'Automation/Other'
+            ),
+        },
+        measures={
+            'id': "id",
+            'amount_usd': "amount_usd",
+            'units': "units",
+            # Only orders with a unit count, for per-unit costs
+            'priced_amount_usd': "CASE WHEN units > 0 THEN amount_usd END",
+            'priced_units': "CASE WHEN units > 0 THEN units END",
+        },
+        where="po_year IS NOT NULL",
+    ),
+    # Same rows as get_utilization
+    'utilization': AggregateSource(
+        from_clause="utilization u JOIN factories f ON u.factory_id = f.factory_id",
+        tables=("utilization", "factories"),
+        dimensions={
+            'date': "u.date",
+            'factory_id': "u.factory_id",
+            'is_projection': "u.is_projection",
+            'manufacturer': "f.manufacturer",
+            'factory_name': "f.factory_name",
+            'technology': "f.technology",
+            'region': "f.region",
+            'backplane': "f.backplane",
+            'status': "f.status",
+        },
+        measures={
+            'utilization_pct': "u.utilization_pct",
+            'capacity_ksheets': "u.capacity_ksheets",
+            'actual_input_ksheets': "u.actual_input_ksheets",
+            'capacity_sqm_k': "u.capacity_sqm_k",
+            'actual_input_sqm_k': "u.actual_input_sqm_k",
+        },
+    ),
+}
+
+
+def _run_aggregate(
+    source: str,
+    group_by: Sequence[str],
+    measures: Dict[str, Tuple[str, str]],
+    filters: Optional[dict] = None,
+    dropna: bool = True
+) -> pd.DataFrame:
+    query, params = build_aggregate_query(
+        AGGREGATE_SOURCES[source], group_by, measures, filters, dropna
+    )
+    with get_connection() as conn:
+        return pd.read_sql_query(query, conn, params=params)
+
+
+# One cache per source, each keyed on the versions of that source's tables
+_AGGREGATE_QUERIES = {
+    name: versioned_cache(*spec.tables)(_run_aggregate)
+    for name, spec in AGGREGATE_SOURCES.items()
+}
+DatabaseManager.aggregate.uncached = _run_aggregate
@@ -0,0 +1,188 @@
+"""
+Shared SQLite connection pool for Display Intelligence Dashboard.
+
+Readers get a per-thread, read-only connection that is reused across calls
+and closed when the thread exits; all writes go through one serialized
+writer connection per database file.
+Databases run in WAL mode so readers never wait on the writer.
+"""
+
+import os
+import sqlite3
+import threading
+import weakref
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Optional, Union
+
+DB_PATH = Path(__file__).parent.parent / "displayintel.db"
+
+# Applied to every pooled connection
+_CONNECTION_PRAGMAS = (
+    "PRAGMA busy_timeout = 5000",
+    "PRAGMA mmap_size = 268435456",    # 256 MB memory-mapped reads
+    "PRAGMA cache_size = -32768",      # 32 MB page cache
+    "PRAGMA temp_store = MEMORY",
+)
+
+
+def _configure(conn: sqlite3.Connection):
+    """Apply the shared pragmas and row factory to a new connection."""
+    for pragma in _CONNECTION_PRAGMAS:
+        conn.execute(pragma)
+    conn.row_factory = sqlite3.Row
+
+
+def _close_quietly(conn: sqlite3.Connection):
+    try:
+        conn.close()
+    except sqlite3.Error:
+        pass
+
+
+class _Reader:
+    """Holds one thread's read connection; only that thread's local storage
+    refers to it, so it is collected (and the connection closed) when the
+    thread exits."""
+    __slots__ = ("conn", "__weakref__")
+
+    def __init__(self, conn: sqlite3.Connection):
+        self.conn = conn
+
+
+class _ConnectionPool:
+    """Thread-local readers plus a single lock-guarded writer for one file."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.pid = os.getpid()
+        self._local = threading.local()
+        self._writer: Optional[sqlite3.Connection] = None
+        self._write_lock = threading.RLock()
+        # Weak, so Streamlit's short-lived script threads do not pin readers
+        self._readers: "weakref.WeakSet[_Reader]" = weakref.WeakSet()
+        self._readers_lock = threading.Lock()
+
+    def reader(self) -> sqlite3.Connection:
+        holder = getattr(self._local, "reader", None)
+        if holder is None:
+            # Make sure WAL is on before the first reader attaches
+            self.writer()
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            _configure(conn)
+            conn.execute("PRAGMA query_only = ON")
+            holder = _Reader(conn)
+            weakref.finalize(holder, _close_quietly, conn)
+            self._local.reader = holder
+            with self._readers_lock:
+                self._readers.add(holder)
+        return holder.conn
+
+    def writer(self) -> sqlite3.Connection:
+        with self._write_lock:
+            if self._writer is None:
+                conn = sqlite3.connect(self.path, check_same_thread=False)
+                _configure(conn)
+                conn.execute("PRAGMA journal_mode = WAL")
+                conn.execute("PRAGMA synchronous = NORMAL")
+                self._writer = conn
+            return self._writer
+
+    @contextmanager
+    def write(self):
+        with self._write_lock:
+            conn = self.writer()
+            try:
+                yield conn
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+
+    @contextmanager
+    def bulk_write(self):
+        with self._write_lock:
+            conn = self.writer()
+            conn.execute("PRAGMA synchronous = OFF")
+            try:
+                conn.execute("BEGIN")
+                try:
+                    yield conn
+                    conn.commit()
+                except Exception:
+                    conn.rollback()
+                    raise
+            finally:
+                conn.execute("PRAGMA synchronous = NORMAL")
+
+    def close(self):
+        with self._readers_lock:
+            for holder in list(self._readers):
+                _close_quietly(holder.conn)
+            self._readers = weakref.WeakSet()
+        self._local = threading.local()
+        with self._write_lock:
+            if self._writer is not None:
+                self._writer.close()
+                self._writer = None
+
+
+_pools: Dict[Path, _ConnectionPool] = {}
+_pools_lock = threading.Lock()
+
+
+def _get_pool(db_path: Optional[Union[str, Path]] = None) -> _ConnectionPool:
+    path = Path(db_path) if db_path is not None else DB_PATH
+    key = path.resolve()
+    pool = _pools.get(key)
+    # Connections must not cross a fork (e.g. ProcessPoolExecutor workers)
+    if pool is None or pool.pid != os.getpid():
+        with _pools_lock:
+            pool = _pools.get(key)
+            if pool is None or pool.pid != os.getpid():
+                pool = _ConnectionPool(path)
+                _pools[key] = pool
+    return pool
+
+
+@contextmanager
+def read_connection(db_path: Optional[Union[str, Path]] = None):
+    """Yield this thread's pooled read-only connection.
+
+    The connection stays open after the block; do not close it.
+    """
+    yield _get_pool(db_path).reader()
+
+
+@contextmanager
+def write_connection(db_path: Optional[Union[str, Path]] = None):
+    """Yield the serialized writer connection inside a transaction.
+
+    Commits when the block exits normally and rolls back on error. Writers
+    from other threads wait until the block finishes.
+    """
+    with _get_pool(db_path).write() as conn:
+        yield conn
+
+
+@contextmanager
+def bulk_write_connection(db_path: Optional[Union[str, Path]] = None):
+    """Like write_connection, tuned for large loads.
+
+    Runs the whole block as one explicit transaction (DDL included) with
+    synchronous=OFF, restoring the normal durability setting afterwards.
+    """
+    with _get_pool(db_path).bulk_write() as conn:
+        yield conn
+
+
+def close_pool(db_path: Optional[Union[str, Path]] = None):
+    """Close every pooled connection to a database file.
+
+    Needed before a database file is moved or replaced on disk.
+    """
+    path = Path(db_path) if db_path is not None else DB_PATH
+    with _pools_lock:
+        pool = _pools.pop(path.resolve(), None)
+    if pool is not None:
+        pool.close()
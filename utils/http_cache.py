@@ -0,0 +1,202 @@
+"""
+On-disk HTTP response cache for the news scrapers.
+
+Listing and article pages rarely change between refreshes. For every page
+fetched with a 200, the body is kept on disk with its ETag, Last-Modified and
+SHA-256. The next GET of the same URL is sent as a conditional request
+(If-None-Match / If-Modified-Since). A 304 is answered from the stored body,
+so the server sends no content at all. Sites that ignore the validators
+still re-send the page, but the body hash tells callers it is unchanged.
+
+Each URL is one file in CACHE_DIR: a JSON metadata line followed by the
+body, written to a temp file and moved into place, so a crash never leaves
+validators without their body. Entries unused for HTTP_CACHE_MAX_AGE_DAYS
+are pruned, then the least recently used ones until the directory is under
+DISPLAYINTEL_HTTP_CACHE_MB (default 200). Delete the directory to start over.
+
+Check the conditional-request path against a local stub server with:
+    python -m utils.http_cache_check
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+import requests
+
+CACHE_DIR = Path(__file__).parent.parent / ".http_cache"
+
+HTTP_CACHE_MAX_BYTES = int(float(os.environ.get("DISPLAYINTEL_HTTP_CACHE_MB", "200")) * 1024 * 1024)
+HTTP_CACHE_MAX_AGE_DAYS = 30
+# Entries written between two pruning passes (each pass lists the directory)
+PRUNE_EVERY = 50
+
+_ENTRY_SUFFIX = ".entry"
+
+
+def _atomic_write(target: Path, data: bytes):
+    target.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=target.parent, prefix=target.name, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp, target)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+
+
+class HttpCache:
+    """Validators and bodies of earlier 200 responses, keyed by URL."""
+
+    def __init__(self, cache_dir: Path = CACHE_DIR, max_bytes: int = HTTP_CACHE_MAX_BYTES,
+                 max_age_days: float = HTTP_CACHE_MAX_AGE_DAYS):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.max_age_days = max_age_days
+        self._lock = threading.Lock()
+        self._writes = 0
+        self.requests = 0
+        self.not_modified = 0       # 304s served from the stored body
+        self.unchanged = 0          # 200s whose body hash matched the stored one
+        self.bytes_saved = 0
+        self.pruned = 0
+
+    def _path(self, url: str) -> Path:
+        return self.cache_dir / f"{hashlib.sha1(url.encode()).hexdigest()}{_ENTRY_SUFFIX}"
+
+    def _read(self, url: str, with_body: bool) -> Tuple[Optional[dict], Optional[bytes]]:
+        try:
+            with open(self._path(url), "rb") as f:
+                meta = json.loads(f.readline())
+                body = f.read() if with_body else None
+        except (OSError, ValueError):
+            return None, None
+        if meta.get("url") != url:
+            return None, None
+        return meta, body
+
+    def lookup(self, url: str) -> Optional[dict]:
+        """Stored metadata for ``url``, or None."""
+        return self._read(url, with_body=False)[0]
+
+    def conditional_headers(self, meta: Optional[dict]) -> Dict[str, str]:
+        """If-None-Match / If-Modified-Since headers for a stored entry."""
+        headers = {}
+        if meta:
+            if meta.get("etag"):
+                headers["If-None-Match"] = meta["etag"]
+            if meta.get("last_modified"):
+                headers["If-Modified-Since"] = meta["last_modified"]
+        return headers
+
+    def _store(self, url: str, meta: dict, body: bytes):
+        _atomic_write(self._path(url), json.dumps(meta).encode() + b"\n" + body)
+        with self._lock:
+            self._writes += 1
+            prune = self._writes % PRUNE_EVERY == 1
+        if prune:
+            self.prune()
+
+    def resolve(self, url: str, meta: Optional[dict], response: requests.Response) -> requests.Response:
+        """Turn a response to a (possibly conditional) GET into a full one.
+
+        A 304 becomes a 200 carrying the stored body. A 200 is stored. Either
+        way ``response.from_cache`` and ``response.unchanged`` say whether
+        the body was served from disk and whether it matches the stored one.
+        """
+        response.from_cache = False
+        response.unchanged = False
+
+        if response.status_code == 304 and meta is not None:
+            stored, body = self._read(url, with_body=True)
+            if stored is None:
+                return response     # entry vanished; caller sees the bare 304
+            try:
+                # Recently used entries are pruned last
+                os.utime(self._path(url))
+            except OSError:
+                pass
+            response.status_code = 200
+            response._content = body
+            response.encoding = stored.get("encoding")
+            response.from_cache = True
+            response.unchanged = True
+            with self._lock:
+                self.requests += 1
+                self.not_modified += 1
+                self.bytes_saved += len(body)
+            return response
+
+        with self._lock:
+            self.requests += 1
+        if response.status_code != 200:
+            return response
+
+        body = response.content
+        digest = hashlib.sha256(body).hexdigest()
+        if meta is not None and meta.get("sha256") == digest:
+            response.unchanged = True
+            with self._lock:
+                self.unchanged += 1
+
+        self._store(url, {
+            "url": url,
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+            "sha256": digest,
+            "encoding": response.encoding,
+            "fetched_at": datetime.now().isoformat(),
+        }, body)
+        return response
+
+    def prune(self) -> int:
+        """Drop entries older than max_age_days, then the least recently
+        used until the cache fits in max_bytes. Returns entries removed."""
+        entries = []
+        for path in self.cache_dir.glob(f"*{_ENTRY_SUFFIX}"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        entries.sort()
+
+        cutoff = time.time() - self.max_age_days * 86400
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for mtime, size, path in entries:
+            if mtime >= cutoff and total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+            removed += 1
+        with self._lock:
+            self.pruned += removed
+        return removed
+
+    def clear(self):
+        """Remove every stored entry."""
+        if self.cache_dir.exists():
+            for path in self.cache_dir.glob(f"*{_ENTRY_SUFFIX}"):
+                path.unlink(missing_ok=True)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                'requests': self.requests,
+                'not_modified': self.not_modified,
+                'unchanged': self.unchanged,
+                'bytes_saved': self.bytes_saved,
+                'pruned': self.pruned,
+            }
+
+
+# The cache shared by every scraper request in this process
+HTTP_CACHE = HttpCache()
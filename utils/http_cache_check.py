@@ -0,0 +1,120 @@
+"""
+Conditional-request check for utils.http_cache.
+
+Starts a stub HTTP server on localhost that honours If-None-Match, then
+fetches from it the way http_get does, through an HttpCache in a temporary
+directory: the first GET must be stored, the second must come back as a 304
+answered from the stored body, a changed page must replace the entry, and
+pruning must hold the directory to its size cap.
+
+Run from the project root with:
+    python -m utils.http_cache_check        # exits non-zero on a failure
+"""
+
+import hashlib
+import sys
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+from .http_cache import HttpCache
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    # Path -> body; the ETag is derived from the body
+    pages = {}
+    not_modified_sent = 0
+
+    def do_GET(self):
+        body = self.pages.get(self.path)
+        if body is None:
+            self.send_response(404)
+            self.end_headers()
+            return
+        etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+        if self.headers.get("If-None-Match") == etag:
+            type(self).not_modified_sent += 1
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", etag)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def _fetch(cache: HttpCache, url: str) -> requests.Response:
+    meta = cache.lookup(url)
+    response = requests.get(url, headers=cache.conditional_headers(meta), timeout=5)
+    return cache.resolve(url, meta, response)
+
+
+def check_http_cache() -> list:
+    """[(description, passed)] for each step of the conditional-request path."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    page = b"<html><body>" + b"panel shipments " * 500 + b"</body></html>"
+    _StubHandler.pages = {"/article": page}
+    results = []
+
+    try:
+        with tempfile.TemporaryDirectory() as cache_dir:
+            cache = HttpCache(cache_dir)
+            url = f"{base}/article"
+
+            first = _fetch(cache, url)
+            results.append(("first GET is a 200 from the server and is stored",
+                            first.status_code == 200 and not first.from_cache
+                            and cache.lookup(url) is not None))
+
+            second = _fetch(cache, url)
+            results.append(("second GET is a 304 answered from the stored body",
+                            _StubHandler.not_modified_sent == 1 and second.status_code == 200
+                            and second.from_cache and second.content == page))
+
+            stats = cache.stats()
+            results.append(("stats count the 304 and the bytes it saved",
+                            stats['requests'] == 2 and stats['not_modified'] == 1
+                            and stats['bytes_saved'] == len(page)))
+
+            _StubHandler.pages["/article"] = page + b"<!-- updated -->"
+            third = _fetch(cache, url)
+            results.append(("a changed page replaces the stored entry",
+                            not third.from_cache and not third.unchanged
+                            and cache.lookup(url)['sha256'] == hashlib.sha256(third.content).hexdigest()))
+
+            for i in range(5):
+                _StubHandler.pages[f"/page{i}"] = page
+                _fetch(cache, f"{base}/page{i}")
+            cache.max_bytes = 2 * (len(page) + 1024)
+            removed = cache.prune()
+            kept = sum(1 for p in cache.cache_dir.iterdir() if p.suffix == ".entry")
+            results.append(("pruning keeps the cache under its size cap",
+                            removed == 4 and kept == 2 and cache.lookup(f"{base}/page4") is not None))
+    finally:
+        server.shutdown()
+        server.server_close()
+    return results
+
+
+def main():
+    results = check_http_cache()
+    for description, passed in results:
+        print(f"[{'ok' if passed else 'FAIL':>4}] {description}")
+    failures = [d for d, passed in results if not passed]
+    print(f"\n{len(results)} checks, {len(failures)} failed")
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
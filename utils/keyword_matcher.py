@@ -0,0 +1,65 @@
+"""
+Multi-keyword matching for the news classifiers.
+
+The relevance filter, the supplier/technology/product taggers, the category
+rules and the sentiment counts all ask the same question: which of these
+keywords occur anywhere in the (lowercased) article? KeywordMatcher answers
+it for the whole vocabulary in one pass over the text, with a single regex
+compiled from a trie of the keywords.
+
+Matching is plain substring matching, as with ``keyword in text``: 'fab'
+is found inside 'fabrication', and 'oled' inside 'qd-oled'.
+"""
+
+import re
+from typing import Dict, FrozenSet, Iterable
+
+
+def _trie_pattern(keywords: Iterable[str]) -> str:
+    """Regex matching the longest keyword that starts at the current position."""
+    trie: Dict = {}
+    for keyword in keywords:
+        node = trie
+        for ch in keyword:
+            node = node.setdefault(ch, {})
+        node[''] = True
+
+    def build(node: Dict) -> str:
+        branches = [re.escape(ch) + build(child)
+                    for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        # A keyword ends here: the longer continuations are optional
+        return f'(?:{body})?' if '' in node else body
+
+    return build(trie)
+
+
+class KeywordMatcher:
+    """Finds every keyword of a fixed vocabulary in a text in one scan."""
+
+    def __init__(self, keywords: Iterable[str]):
+        self.keywords: FrozenSet[str] = frozenset(k.lower() for k in keywords if k)
+        first_chars = ''.join(sorted({re.escape(k[0]) for k in self.keywords}))
+        # Zero-width, so a match is tried at every position and overlapping
+        # keywords are all seen; each match is the longest one starting there
+        self._pattern = re.compile(f'(?=[{first_chars}])(?=({_trie_pattern(self.keywords)}))')
+        # Keywords implied by a longer match at the same position
+        # ('samsung display' -> 'samsung')
+        self._prefixes: Dict[str, FrozenSet[str]] = {
+            keyword: frozenset(k for k in self.keywords if keyword.startswith(k))
+            for keyword in self.keywords
+        }
+
+    def scan(self, text: str) -> FrozenSet[str]:
+        """The keywords that occur in ``text`` (case-insensitive)."""
+        if not text:
+            return frozenset()
+        longest = {match.group(1) for match in self._pattern.finditer(text.lower())}
+        if len(longest) == 1:
+            return self._prefixes[longest.pop()]
+        hits = set()
+        for keyword in longest:
+            hits.update(self._prefixes[keyword])
+        return frozenset(hits)
@@ -0,0 +1,267 @@
+"""
+Schema migrations for Display Intelligence Dashboard.
+
+Indexes backing the DatabaseManager filter paths live here rather than next
+to each query, so they can be created on any existing database and checked
+as a set (see utils.query_plan_check). Migrations only ever add indexes, and
+skip any whose table or columns are missing from this database. A UNIQUE
+index that existing data would violate first runs its one-off cleanup from
+CLEANUPS (e.g. deleting duplicate shipment rows); without one it is skipped
+while the table still holds rows that violate it.
+
+Run from the project root with: python -m utils.migrations
+"""
+
+import re
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from .dashboard_summary import refresh_dashboard_summary
+from .data_version import bump_data_version
+from .db_pool import DB_PATH, read_connection, write_connection
+
+
+class Index(NamedTuple):
+    table: str
+    columns: str            # index expression list, e.g. "manufacturer, factory_name"
+    where: Optional[str] = None     # partial index predicate
+    unique: bool = False
+
+
+# Shipment columns that identify a row; rows equal on all of them are duplicates
+SHIPMENT_KEY_COLUMNS = ['date', 'panel_maker', 'brand', 'model', 'size_inches',
+                        'technology', 'application', 'units_k', 'revenue_m']
+
+# Named after the queries they serve; see DatabaseManager for the SQL.
+INDEXES: Dict[str, Index] = {
+    # get_factories (filters + ORDER BY manufacturer, factory_name),
+    # get_dimension_catalog, get_factory_names(manufacturer)
+    "idx_factories_manufacturer_name": Index("factories", "manufacturer, factory_name"),
+    # get_factory_by_name (ORDER BY backplane), get_utilization(factory_name)
+    "idx_factories_name_backplane": Index("factories", "factory_name, backplane"),
+    "idx_factories_technology": Index("factories", "technology"),
+    "idx_factories_region": Index("factories", "region"),
+    "idx_factories_status": Index("factories", "status"),
+
+    # Date-range filters and the u.date = ? capacity joins; covers get_date_range
+    "idx_utilization_date_factory": Index("utilization", "date, factory_id"),
+    # get_utilization(factory_id / factory_name / manufacturer) join lookups
+    "idx_utilization_factory_date": Index("utilization", "factory_id, date"),
+    # Latest actual month: MAX(date) WHERE is_projection = 0 AND actual_input_ksheets > 0
+    "idx_utilization_latest_actual": Index(
+        "utilization", "is_projection, date", "actual_input_ksheets > 0"),
+    # get_summary_stats average utilization (no is_projection filter)
+    "idx_utilization_actual_date": Index(
+        "utilization", "date, utilization_pct", "actual_input_ksheets > 0"),
+    # get_factory_ramp_date / get_all_factory_ramp_dates: MIN(date) WHERE utilization_pct > 0
+    "idx_utilization_ramp": Index("utilization", "factory_id, date", "utilization_pct > 0"),
+
+    # get_equipment_orders year range + ORDER BY po_year DESC, po_quarter DESC
+    "idx_equipment_orders_year_quarter": Index("equipment_orders", "po_year, po_quarter"),
+    "idx_equipment_orders_manufacturer": Index("equipment_orders", "manufacturer, po_year"),
+    # Covers get_equipment_spend_by_vendor and the vendor list in get_dimension_catalog
+    "idx_equipment_orders_vendor_spend": Index(
+        "equipment_orders", "vendor, po_year, amount_usd, units"),
+    "idx_equipment_orders_type": Index("equipment_orders", "equipment_type, po_year"),
+    "idx_equipment_orders_factory": Index("equipment_orders", "factory_id"),
+
+    # Year filters in get_shipments / get_shipments_by_application and
+    # quarterly series (columns filled by utils.shipments_pipeline)
+    "idx_shipments_year_period": Index("shipments", "year, period_key"),
+    "idx_shipments_period": Index("shipments", "is_annual_total, period_key"),
+    "idx_shipments_date": Index("shipments", "date"),
+    "idx_shipments_panel_maker": Index("shipments", "panel_maker"),
+    "idx_shipments_technology": Index("shipments", "technology"),
+    # Covers get_shipments_by_application and the application list in get_dimension_catalog
+    "idx_shipments_application": Index(
+        "shipments", "application, date, units_k, revenue_m"),
+    # Natural key: keeps duplicate rows out (see _delete_duplicate_shipments).
+    # SQLite treats NULLs as distinct in UNIQUE indexes, so each nullable
+    # column is indexed as COALESCE(col, X'00'): the blob sentinel never
+    # equals a real text or number value.
+    "idx_shipments_natural_key": Index(
+        "shipments",
+        ", ".join(f"COALESCE({col}, X'00')" for col in SHIPMENT_KEY_COLUMNS),
+        unique=True),
+
+    # get_shipment_cube filters (table built by utils.shipment_cube)
+    "idx_shipment_cube_filters": Index("shipment_cube", "year, panel_maker, application"),
+
+    "idx_financials_date_manufacturer": Index("financials", "date, manufacturer"),
+    "idx_financials_manufacturer": Index("financials", "manufacturer, date"),
+
+    "idx_news_published_date": Index("news", "published_date"),
+    "idx_news_category": Index("news", "category, published_date"),
+    "idx_news_impact_level": Index("news", "impact_level, published_date"),
+    # Duplicate keys for save_articles_to_db (and the stored-URL check before scraping)
+    "idx_news_article_url": Index("news", "article_url", unique=True),
+    "idx_news_source_title": Index("news", "source, title", unique=True),
+
+    "idx_insights_relevance": Index("insights", "relevance_score"),
+    "idx_insights_type": Index("insights", "insight_type, relevance_score"),
+    "idx_insights_topic": Index("insights", "topic, relevance_score"),
+}
+
+# Indexes earlier versions created that no query uses any more
+OBSOLETE_INDEXES = (
+    "idx_shipments_year",   # CAST(SUBSTR(date, 1, 4)), replaced by the year column
+)
+
+# PRAGMA schema_version of each database when this process last brought it
+# up to date; any later CREATE/ALTER changes it and triggers another check
+_applied: Dict[Path, int] = {}
+_applied_lock = threading.Lock()
+
+
+def index_sql(name: str, index: Index) -> str:
+    kind = "UNIQUE INDEX" if index.unique else "INDEX"
+    sql = f"CREATE {kind} IF NOT EXISTS {name} ON {index.table}({index.columns})"
+    if index.where:
+        sql += f" WHERE {index.where}"
+    return sql
+
+
+def _referenced_columns(index: Index) -> set:
+    text = f"{index.columns} {index.where or ''}"
+    words = set(re.findall(r"[A-Za-z_][A-Za-z0-9_]*", text))
+    return words - {"CAST", "SUBSTR", "COALESCE", "X", "AS", "INTEGER", "AND", "OR",
+                    "NOT", "NULL", "IS"}
+
+
+def _delete_duplicate_shipments(conn: sqlite3.Connection) -> int:
+    """Delete shipment rows identical on SHIPMENT_KEY_COLUMNS, keeping the
+    lowest id of each group. Returns the number of rows deleted."""
+    deleted = conn.execute(f"""
+        DELETE FROM shipments WHERE id NOT IN (
+            SELECT MIN(id) FROM shipments GROUP BY {', '.join(SHIPMENT_KEY_COLUMNS)}
+        )
+    """).rowcount
+    if deleted:
+        print(f"[data-quality] shipments: deleted {deleted:,} duplicate rows")
+        bump_data_version(conn, "shipments")
+        refresh_dashboard_summary(conn)
+    return deleted
+
+
+# One-off data fixes run (in the same transaction) just before the index
+# they make possible is created; once it exists they never run again
+CLEANUPS: Dict[str, Callable[[sqlite3.Connection], int]] = {
+    "idx_shipments_natural_key": _delete_duplicate_shipments,
+}
+
+
+def _table_columns(conn: sqlite3.Connection) -> Dict[str, set]:
+    tables = [row[0] for row in conn.execute(
+        "SELECT name FROM sqlite_master WHERE type = 'table'"
+    ).fetchall()]
+    return {
+        table: {row[1] for row in conn.execute(f"PRAGMA table_info({table})").fetchall()}
+        for table in tables
+    }
+
+
+def _indexed_prefixes(conn: sqlite3.Connection, table: str) -> set:
+    """Column tuples already led by a full (non-partial) index on ``table``,
+    including the automatic indexes behind UNIQUE and PRIMARY KEY."""
+    prefixes = set()
+    for row in conn.execute(f"PRAGMA index_list({table})").fetchall():
+        if row[4]:      # partial
+            continue
+        cols = tuple(info[2] for info in conn.execute(f"PRAGMA index_info({row[1]})").fetchall())
+        prefixes.update(cols[:n] for n in range(1, len(cols) + 1))
+    return prefixes
+
+
+def pending_indexes(conn: sqlite3.Connection) -> List[Tuple[str, Index]]:
+    """Indexes from INDEXES that this database can have but does not yet."""
+    existing = {row[0] for row in conn.execute(
+        "SELECT name FROM sqlite_master WHERE type = 'index'"
+    ).fetchall()}
+    columns = _table_columns(conn)
+    pending = []
+    for name, index in INDEXES.items():
+        if name in existing or index.table not in columns:
+            continue
+        if not _referenced_columns(index) <= columns[index.table]:
+            continue
+        # Skip plain indexes an existing one already serves (e.g. UNIQUE(factory_id, date))
+        if index.where is None and not index.unique:
+            plain = tuple(c.strip() for c in index.columns.split(","))
+            if plain in _indexed_prefixes(conn, index.table):
+                continue
+        pending.append((name, index))
+    return pending
+
+
+def _schema_version(conn: sqlite3.Connection) -> int:
+    return conn.execute("PRAGMA schema_version").fetchone()[0]
+
+
+def _obsolete_indexes(conn: sqlite3.Connection) -> List[str]:
+    return [row[0] for row in conn.execute(
+        f"SELECT name FROM sqlite_master WHERE type = 'index' "
+        f"AND name IN ({','.join('?' * len(OBSOLETE_INDEXES))})",
+        OBSOLETE_INDEXES
+    ).fetchall()]
+
+
+def apply_migrations(db_path=None) -> List[str]:
+    """Create any missing indexes (dropping obsolete ones); returns the
+    names of those created.
+
+    A database is checked again only after its schema has changed (a table
+    or column was added), so this costs one PRAGMA when there is nothing to
+    do: call it at startup and after anything that creates tables.
+    """
+    path = Path(db_path or DB_PATH).resolve()
+    with read_connection(path) as conn:
+        schema_version = _schema_version(conn)
+        with _applied_lock:
+            if _applied.get(path) == schema_version:
+                return []
+        pending = pending_indexes(conn)
+        obsolete = _obsolete_indexes(conn)
+    if pending or obsolete:
+        try:
+            with write_connection(path) as conn:
+                # Re-check under the writer lock in case another thread got here first
+                pending = pending_indexes(conn)
+                for name in _obsolete_indexes(conn):
+                    conn.execute(f"DROP INDEX IF EXISTS {name}")
+                created = []
+                for name, index in pending:
+                    try:
+                        if name in CLEANUPS:
+                            CLEANUPS[name](conn)
+                        conn.execute(index_sql(name, index))
+                        created.append((name, index))
+                    except sqlite3.IntegrityError:
+                        # Existing duplicate rows; UNIQUE is retried next startup
+                        print(f"[migrations] {name} skipped: {index.table} has duplicate ({index.columns}) rows")
+                pending = created
+                # Refresh planner statistics for the newly indexed tables
+                conn.execute("PRAGMA optimize")
+                schema_version = _schema_version(conn)
+        except sqlite3.OperationalError as e:
+            # Queries still work without the indexes, just slower
+            print(f"[migrations] could not create indexes on {path.name}: {e}")
+            pending = []
+    with _applied_lock:
+        _applied[path] = schema_version
+    return [name for name, _ in pending]
+
+
+def main():
+    created = apply_migrations()
+    if created:
+        print(f"Created {len(created)} indexes:")
+        for name in created:
+            print(f"  {name}")
+    else:
+        print("Schema is up to date.")
+
+
+if __name__ == "__main__":
+    main()
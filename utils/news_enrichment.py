@@ -0,0 +1,298 @@
+"""
+AI enrichment of stored news articles for Display Intelligence Dashboard.
+
+Articles without a sentiment (or, when a summarizer is available, without a
+summary) are put on a queue kept in the database, news_enrichment_queue.
+Worker threads fetch missing article text, ask the summarizer for a summary
+and re-tag suppliers, technologies and products, several articles at a time
+under a shared rate limit. Results are written back in batches, one
+transaction each, and a finished article leaves the queue in the same
+transaction as its update. Work interrupted by a crash or restart stays
+queued and is picked up by the next run; an article that keeps failing is
+given up after MAX_ATTEMPTS until the queue is reset.
+
+Run from the project root with:
+    python -m utils.news_enrichment [--limit N] [--workers N] [--retry-failed] [--summaries]
+
+Summaries are only generated with --summaries, which uses the configured
+Anthropic API key (Streamlit secrets or ANTHROPIC_API_KEY).
+"""
+
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+from typing import Callable, List, Optional
+
+from .data_version import bump_data_version
+from .db_pool import DB_PATH, read_connection, write_connection
+from .http_client import TokenBucket
+from .news_scraper import (
+    analyze_sentiment, extract_products_from_text, extract_suppliers_from_text,
+    extract_technologies_from_text, fetch_article_content, generate_ai_summary,
+    get_anthropic_api_key, scan_article,
+)
+
+# Articles enriched at once
+ENRICHMENT_WORKERS = 4
+# Summarizer calls per second across all workers, and the burst allowed
+SUMMARY_RATE_PER_SECOND = 2.0
+SUMMARY_BURST = 2
+# Articles written back per transaction
+ENRICHMENT_BATCH_SIZE = 10
+# Failed runs after which an article is left alone
+MAX_ATTEMPTS = 3
+
+# (title, full_text) -> summary, or None if none could be generated
+Summarizer = Callable[[str, Optional[str]], Optional[str]]
+
+_QUEUE_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS news_enrichment_queue (
+        news_id INTEGER PRIMARY KEY,
+        attempts INTEGER NOT NULL DEFAULT 0,
+        last_error TEXT,
+        queued_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+"""
+
+_UPDATE_ARTICLE = """
+    UPDATE news SET
+        full_text = COALESCE(?, full_text),
+        summary = COALESCE(?, summary),
+        sentiment = ?,
+        suppliers_mentioned = COALESCE(?, suppliers_mentioned),
+        technologies_mentioned = COALESCE(?, technologies_mentioned),
+        products_mentioned = COALESCE(?, products_mentioned)
+    WHERE id = ?
+"""
+
+_thread: Optional[threading.Thread] = None
+_thread_lock = threading.Lock()
+# Progress of the background run: {'running', 'started_at', 'finished_at', 'processed', ...}
+enrichment_status: dict = {}
+
+
+def default_summarizer(api_key: str = None) -> Optional[Summarizer]:
+    """generate_ai_summary bound to ``api_key``, or None without one.
+
+    The configured key is never picked up here: summaries are paid API
+    calls, so they only run when the caller passes a key.
+    """
+    if not api_key:
+        return None
+    return lambda title, full_text: generate_ai_summary(title, full_text, api_key)
+
+
+def enrich_article(article_id: int, title: str, url: str, full_text: Optional[str],
+                   existing_summary: Optional[str],
+                   summarize: Optional[Summarizer] = None) -> dict:
+    """Fetch, summarize and tag one article without touching the database.
+
+    Returns the update_article_with_ai result dict plus the column values
+    for write_enrichments().
+    """
+    result = {'id': article_id, 'title': title[:50]}
+
+    fetched_text = None
+    if not full_text and url:
+        fetched_text = fetch_article_content(url)
+        if fetched_text:
+            full_text = fetched_text
+            result['fetched_content'] = True
+
+    summary = None
+    if not existing_summary and summarize is not None:
+        summary = summarize(title, full_text)
+        if summary:
+            result['generated_summary'] = True
+        else:
+            result['summary_failed'] = True
+
+    content = f"{title} {full_text or ''}"
+    hits = scan_article(title, full_text or "")
+    result['sentiment'] = analyze_sentiment(title, full_text or "", hits)
+    result['values'] = (
+        fetched_text,
+        summary,
+        result['sentiment'],
+        # Update supplier/tech/product tags from full content
+        extract_suppliers_from_text(content, hits),
+        extract_technologies_from_text(content, hits),
+        extract_products_from_text(content, hits),
+        article_id,
+    )
+    return result
+
+
+def write_enrichments(conn, results: List[dict]):
+    """Write enrich_article() results and take finished articles off the queue."""
+    if not results:
+        return
+    conn.executemany(_UPDATE_ARTICLE, [r['values'] for r in results])
+    conn.execute(_QUEUE_SCHEMA)
+    done = [(r['id'],) for r in results if not r.get('summary_failed')]
+    failed = [("summary not generated", r['id']) for r in results if r.get('summary_failed')]
+    conn.executemany("DELETE FROM news_enrichment_queue WHERE news_id = ?", done)
+    conn.executemany(
+        "UPDATE news_enrichment_queue SET attempts = attempts + 1, last_error = ? WHERE news_id = ?",
+        failed
+    )
+    bump_data_version(conn, 'news')
+
+
+def enqueue_pending(with_summaries: bool) -> int:
+    """Queue every article still missing a sentiment, or a summary when
+    summaries can be generated. Returns the number newly queued."""
+    condition = "sentiment IS NULL OR summary IS NULL" if with_summaries else "sentiment IS NULL"
+    with write_connection(DB_PATH) as conn:
+        conn.execute(_QUEUE_SCHEMA)
+        # Drop jobs whose article has been deleted
+        conn.execute("DELETE FROM news_enrichment_queue WHERE news_id NOT IN (SELECT id FROM news)")
+        cursor = conn.execute(f"""
+            INSERT OR IGNORE INTO news_enrichment_queue (news_id)
+            SELECT id FROM news WHERE {condition}
+        """)
+        return cursor.rowcount
+
+
+def reset_failed():
+    """Give articles that reached MAX_ATTEMPTS another chance."""
+    with write_connection(DB_PATH) as conn:
+        conn.execute(_QUEUE_SCHEMA)
+        conn.execute("UPDATE news_enrichment_queue SET attempts = 0, last_error = NULL")
+
+
+def _queued_articles(limit: Optional[int]) -> list:
+    query = """
+        SELECT n.id, n.title, n.article_url, n.full_text, n.summary
+        FROM news_enrichment_queue q JOIN news n ON n.id = q.news_id
+        WHERE q.attempts < ?
+        ORDER BY n.published_date DESC
+    """
+    params = [MAX_ATTEMPTS]
+    if limit is not None:
+        query += " LIMIT ?"
+        params.append(limit)
+    with read_connection(DB_PATH) as conn:
+        return [tuple(row) for row in conn.execute(query, params).fetchall()]
+
+
+def enrich_articles(
+    api_key: str = None,
+    summarizer: Optional[Summarizer] = None,
+    limit: Optional[int] = None,
+    workers: int = ENRICHMENT_WORKERS,
+    rate_per_second: float = SUMMARY_RATE_PER_SECOND,
+    batch_size: int = ENRICHMENT_BATCH_SIZE,
+    progress: Optional[Callable[[dict], None]] = None,
+) -> dict:
+    """Enrich queued articles concurrently; resumes whatever a previous run left.
+
+    ``summarizer`` defaults to generate_ai_summary with ``api_key``; without
+    either, only sentiment and tags are updated.
+    At most ``limit`` articles are processed, newest first. ``progress`` is
+    called with the running totals after every batch is written.
+    """
+    if summarizer is None:
+        summarizer = default_summarizer(api_key)
+    enqueue_pending(with_summaries=summarizer is not None)
+    articles = _queued_articles(limit)
+
+    totals = {
+        'total': len(articles),
+        'summaries_generated': 0,
+        'sentiments_updated': 0,
+        'content_fetched': 0,
+        'errors': 0,
+    }
+    if not articles:
+        return totals
+
+    summarize = None
+    if summarizer is not None:
+        bucket = TokenBucket(rate_per_second, SUMMARY_BURST)
+
+        def summarize(title, full_text):
+            bucket.acquire()
+            return summarizer(title, full_text)
+
+    def flush(batch, failures):
+        with write_connection(DB_PATH) as conn:
+            write_enrichments(conn, batch)
+            conn.executemany(
+                "UPDATE news_enrichment_queue SET attempts = attempts + 1, last_error = ? WHERE news_id = ?",
+                failures
+            )
+        for r in batch:
+            totals['summaries_generated'] += bool(r.get('generated_summary'))
+            totals['sentiments_updated'] += bool(r.get('sentiment'))
+            totals['content_fetched'] += bool(r.get('fetched_content'))
+            totals['errors'] += bool(r.get('summary_failed'))
+        totals['errors'] += len(failures)
+        if progress is not None:
+            progress(dict(totals))
+
+    batch, failures = [], []
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        futures = {pool.submit(enrich_article, *row, summarize=summarize): row[0] for row in articles}
+        for future in as_completed(futures):
+            try:
+                batch.append(future.result())
+            except Exception as e:
+                failures.append((str(e)[:500], futures[future]))
+            if len(batch) + len(failures) >= batch_size:
+                flush(batch, failures)
+                batch, failures = [], []
+    flush(batch, failures)
+    return totals
+
+
+def _run(kwargs: dict):
+    enrichment_status.clear()
+    enrichment_status.update(running=True, started_at=datetime.now().isoformat())
+    try:
+        totals = enrich_articles(progress=enrichment_status.update, **kwargs)
+        enrichment_status.update(totals)
+    except Exception as e:
+        enrichment_status['error'] = str(e)
+    finally:
+        enrichment_status.update(running=False, finished_at=datetime.now().isoformat())
+
+
+def start_enrichment(**kwargs) -> bool:
+    """Run enrich_articles(**kwargs) in a background thread, once at a time;
+    True if this call started it. Progress is in ``enrichment_status``."""
+    global _thread
+    with _thread_lock:
+        if _thread is not None and _thread.is_alive():
+            return False
+        _thread = threading.Thread(target=_run, args=(kwargs,), name="news-enrichment", daemon=True)
+        _thread.start()
+        return True
+
+
+def main():
+    args = sys.argv[1:]
+    limit = int(args[args.index("--limit") + 1]) if "--limit" in args else None
+    workers = int(args[args.index("--workers") + 1]) if "--workers" in args else ENRICHMENT_WORKERS
+    api_key = None
+    if "--summaries" in args:
+        api_key = get_anthropic_api_key()
+        if not api_key:
+            print("--summaries needs anthropic_api_key in Streamlit secrets or ANTHROPIC_API_KEY")
+            sys.exit(1)
+        print("Generating AI summaries with the configured Anthropic API key")
+    if "--retry-failed" in args:
+        reset_failed()
+    start = time.perf_counter()
+    totals = enrich_articles(
+        api_key=api_key, limit=limit, workers=workers,
+        progress=lambda t: print(f"  {t['sentiments_updated']:,} updated, "
+                                 f"{t['summaries_generated']:,} summaries, {t['errors']:,} errors")
+    )
+    print(f"Enriched {totals['total']:,} articles in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
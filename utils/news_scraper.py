@@ -3,16 +3,24 @@ News Scraper for Display Intelligence Dashboard
 Scrapes display panel industry news from Korean sources.
 """
 
-import requests
 from bs4 import BeautifulSoup
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, date
-import sqlite3
-from pathlib import Path
+import os
 import re
-import time
 
-# Database path
-DB_PATH = Path(__file__).parent.parent / "displayintel.db"
+from .data_version import bump_data_version
+from .db_pool import DB_PATH, read_connection, write_connection
+from .http_client import DEFAULT_HEADERS, get_session, http_get
+from .keyword_matcher import KeywordMatcher
+from .migrations import apply_migrations
+
+# Article pages fetched at once per source; the per-host rate limit in
+# utils.http_client still applies across all of them
+DETAIL_FETCH_WORKERS = 4
+
+# Messages endpoint used for AI summaries; point it at a stub server to test
+SUMMARY_API_URL = os.environ.get("ANTHROPIC_API_URL", "https://api.anthropic.com/v1/messages")
 
 # =============================================================================
 # Relevance Filtering
@@ -64,41 +72,142 @@ EXCLUDE_KEYWORDS = [
     'autonomous driving', 'robot vacuum'
 ]
 
+# Terms that keep an article despite an exclusion keyword
+DISPLAY_SIGNAL_KEYWORDS = ['display', 'oled', 'lcd', 'panel']
+
+# =============================================================================
+# Tagging and Classification Keywords
+# =============================================================================
+
+# Keyword -> supplier, in the order suppliers are listed
+SUPPLIER_KEYWORDS = {
+    'samsung display': 'Samsung',
+    'samsung': 'Samsung',
+    'sdc': 'Samsung',
+    'lg display': 'LGD',
+    'lgd': 'LGD',
+    'boe': 'BOE',
+    'csot': 'CSOT',
+    'tcl csot': 'CSOT',
+    'china star': 'CSOT',
+    'auo': 'AUO',
+    'au optronics': 'AUO',
+    'innolux': 'Innolux',
+    'sharp': 'Sharp',
+    'jdi': 'JDI',
+    'japan display': 'JDI',
+    'tianma': 'Tianma',
+    'visionox': 'Visionox',
+    'everdisplay': 'EDO',
+    'edo': 'EDO'
+}
+
+TECHNOLOGY_KEYWORDS = {
+    'oled': 'OLED',
+    'amoled': 'OLED',
+    'qd-oled': 'QD-OLED',
+    'woled': 'OLED',
+    'lcd': 'LCD',
+    'ltpo': 'LTPO',
+    'microled': 'MicroLED',
+    'micro-led': 'MicroLED',
+    'miniled': 'MiniLED',
+    'mini-led': 'MiniLED',
+    'foldable': 'Foldable',
+    'flexible display': 'Foldable'
+}
+
+PRODUCT_KEYWORDS = {
+    'smartphone': 'Smartphone',
+    'mobile': 'Smartphone',
+    'phone': 'Smartphone',
+    'tablet': 'Tablet',
+    'ipad': 'Tablet',
+    'tv': 'TV',
+    'television': 'TV',
+    'monitor': 'Monitor',
+    'laptop': 'IT',
+    'notebook': 'IT',
+    'it panel': 'IT',
+    'automotive': 'Automotive',
+    'car display': 'Automotive',
+    'vehicle': 'Automotive',
+    'wearable': 'Wearable',
+    'watch': 'Wearable'
+}
+
+# Checked in order; the first category with a keyword wins, else 'Technology'
+CATEGORY_KEYWORDS = [
+    ('Investment', ['invest', 'billion', 'million', 'funding', 'capex']),
+    ('Factory', ['factory', 'fab', 'production', 'mass production', 'facility']),
+    ('Financials', ['revenue', 'profit', 'earnings', 'quarterly', 'financial']),
+    ('M&A', ['acquire', 'merger', 'acquisition', 'deal', 'partnership']),
+    ('Supply Chain', ['supply', 'order', 'shipment', 'demand']),
+    ('Product Launch', ['launch', 'release', 'announce', 'new product', 'unveil']),
+]
+
+POSITIVE_KEYWORDS = [
+    'growth', 'profit', 'surge', 'increase', 'expand', 'investment',
+    'breakthrough', 'success', 'milestone', 'record', 'win', 'gains',
+    'strong', 'recovery', 'improve', 'boost', 'advance', 'innovation',
+    'partnership', 'deal', 'order', 'contract', 'launch', 'ramp'
+]
+
+NEGATIVE_KEYWORDS = [
+    'loss', 'decline', 'drop', 'fall', 'cut', 'layoff', 'closure',
+    'halt', 'delay', 'problem', 'issue', 'concern', 'risk', 'weak',
+    'slowdown', 'downturn', 'struggle', 'challenge', 'crisis', 'fail',
+    'shortage', 'deficit', 'warning', 'suspend'
+]
+
+# Every keyword above, matched in one pass per article by scan_article()
+KEYWORD_MATCHER = KeywordMatcher(
+    DISPLAY_COMPANIES + DISPLAY_KEYWORDS + EXCLUDE_KEYWORDS + DISPLAY_SIGNAL_KEYWORDS
+    + list(SUPPLIER_KEYWORDS) + list(TECHNOLOGY_KEYWORDS) + list(PRODUCT_KEYWORDS)
+    + [kw for _, keywords in CATEGORY_KEYWORDS for kw in keywords]
+    + POSITIVE_KEYWORDS + NEGATIVE_KEYWORDS
+)
+
 
-def is_display_relevant(title: str, text: str = "") -> bool:
+def scan_article(title: str, text: str = "") -> frozenset:
+    """Keywords found in an article, for the classifiers' ``scan`` argument.
+
+    Scan the same title and text the classifier would be given; the
+    extract_*_from_text functions take the joined f"{title} {text}".
+    """
+    return KEYWORD_MATCHER.scan(f"{title} {text}")
+
+
+def _keyword_hits(text: str, scan: frozenset = None) -> frozenset:
+    return KEYWORD_MATCHER.scan(text) if scan is None else scan
+
+
+def is_display_relevant(title: str, text: str = "", scan: frozenset = None) -> bool:
     """
     Check if article is relevant to display panel industry.
 
     Args:
         title: Article title
         text: Article summary or full text (optional)
+        scan: scan_article(title, text), if already computed
 
     Returns:
         True if article is about display industry
     """
-    # Combine title and text for searching
-    content = f"{title} {text}".lower()
-
-    # First check exclusions - skip if clearly not about displays
-    for exclude in EXCLUDE_KEYWORDS:
-        if exclude in content:
-            # But allow if also contains strong display signals
-            has_display_signal = any(
-                kw in content for kw in ['display', 'oled', 'lcd', 'panel']
-            )
-            if not has_display_signal:
-                return False
+    hits = _keyword_hits(f"{title} {text}", scan)
 
-    # Check for company names
-    for company in DISPLAY_COMPANIES:
-        if company in content:
-            return True
+    # First check exclusions - skip if clearly not about displays,
+    # but allow if also contains strong display signals
+    if any(kw in hits for kw in EXCLUDE_KEYWORDS):
+        if not any(kw in hits for kw in DISPLAY_SIGNAL_KEYWORDS):
+            return False
 
-    # Check for display keywords
-    keyword_matches = sum(1 for kw in DISPLAY_KEYWORDS if kw in content)
+    # Check for company names
+    if any(company in hits for company in DISPLAY_COMPANIES):
+        return True
 
-    # Require at least 1 keyword match
-    return keyword_matches >= 1
+    # Require at least 1 display keyword match
+    return any(kw in hits for kw in DISPLAY_KEYWORDS)
 
 
 def parse_date(date_str: str) -> str:
@@ -135,116 +244,38 @@ def parse_date(date_str: str) -> str:
     return date.today().isoformat()
 
 
-def extract_suppliers_from_text(text: str) -> str:
-    """Extract mentioned suppliers from article text."""
-    text_lower = text.lower()
-    suppliers = []
-
-    supplier_map = {
-        'samsung display': 'Samsung',
-        'samsung': 'Samsung',
-        'sdc': 'Samsung',
-        'lg display': 'LGD',
-        'lgd': 'LGD',
-        'boe': 'BOE',
-        'csot': 'CSOT',
-        'tcl csot': 'CSOT',
-        'china star': 'CSOT',
-        'auo': 'AUO',
-        'au optronics': 'AUO',
-        'innolux': 'Innolux',
-        'sharp': 'Sharp',
-        'jdi': 'JDI',
-        'japan display': 'JDI',
-        'tianma': 'Tianma',
-        'visionox': 'Visionox',
-        'everdisplay': 'EDO',
-        'edo': 'EDO'
-    }
+def _tags(keyword_map: dict, hits: frozenset) -> str:
+    """Comma-separated values of ``keyword_map`` whose keyword was found."""
+    tags = []
+    for keyword, tag in keyword_map.items():
+        if keyword in hits and tag not in tags:
+            tags.append(tag)
+    return ', '.join(tags) if tags else None
 
-    for keyword, supplier in supplier_map.items():
-        if keyword in text_lower and supplier not in suppliers:
-            suppliers.append(supplier)
 
-    return ', '.join(suppliers) if suppliers else None
+def extract_suppliers_from_text(text: str, scan: frozenset = None) -> str:
+    """Extract mentioned suppliers from article text."""
+    return _tags(SUPPLIER_KEYWORDS, _keyword_hits(text, scan))
 
 
-def extract_technologies_from_text(text: str) -> str:
+def extract_technologies_from_text(text: str, scan: frozenset = None) -> str:
     """Extract mentioned technologies from article text."""
-    text_lower = text.lower()
-    technologies = []
-
-    tech_map = {
-        'oled': 'OLED',
-        'amoled': 'OLED',
-        'qd-oled': 'QD-OLED',
-        'woled': 'OLED',
-        'lcd': 'LCD',
-        'ltpo': 'LTPO',
-        'microled': 'MicroLED',
-        'micro-led': 'MicroLED',
-        'miniled': 'MiniLED',
-        'mini-led': 'MiniLED',
-        'foldable': 'Foldable',
-        'flexible display': 'Foldable'
-    }
+    return _tags(TECHNOLOGY_KEYWORDS, _keyword_hits(text, scan))
 
-    for keyword, tech in tech_map.items():
-        if keyword in text_lower and tech not in technologies:
-            technologies.append(tech)
 
-    return ', '.join(technologies) if technologies else None
-
-
-def extract_products_from_text(text: str) -> str:
+def extract_products_from_text(text: str, scan: frozenset = None) -> str:
     """Extract mentioned products from article text."""
-    text_lower = text.lower()
-    products = []
-
-    product_map = {
-        'smartphone': 'Smartphone',
-        'mobile': 'Smartphone',
-        'phone': 'Smartphone',
-        'tablet': 'Tablet',
-        'ipad': 'Tablet',
-        'tv': 'TV',
-        'television': 'TV',
-        'monitor': 'Monitor',
-        'laptop': 'IT',
-        'notebook': 'IT',
-        'it panel': 'IT',
-        'automotive': 'Automotive',
-        'car display': 'Automotive',
-        'vehicle': 'Automotive',
-        'wearable': 'Wearable',
-        'watch': 'Wearable'
-    }
-
-    for keyword, product in product_map.items():
-        if keyword in text_lower and product not in products:
-            products.append(product)
+    return _tags(PRODUCT_KEYWORDS, _keyword_hits(text, scan))
 
-    return ', '.join(products) if products else None
 
-
-def categorize_article(title: str, text: str) -> str:
+def categorize_article(title: str, text: str, scan: frozenset = None) -> str:
     """Categorize article based on content."""
-    content = f"{title} {text}".lower()
-
-    if any(kw in content for kw in ['invest', 'billion', 'million', 'funding', 'capex']):
-        return 'Investment'
-    elif any(kw in content for kw in ['factory', 'fab', 'production', 'mass production', 'facility']):
-        return 'Factory'
-    elif any(kw in content for kw in ['revenue', 'profit', 'earnings', 'quarterly', 'financial']):
-        return 'Financials'
-    elif any(kw in content for kw in ['acquire', 'merger', 'acquisition', 'deal', 'partnership']):
-        return 'M&A'
-    elif any(kw in content for kw in ['supply', 'order', 'shipment', 'demand']):
-        return 'Supply Chain'
-    elif any(kw in content for kw in ['launch', 'release', 'announce', 'new product', 'unveil']):
-        return 'Product Launch'
-    else:
-        return 'Technology'
+    hits = _keyword_hits(f"{title} {text}", scan)
+
+    for category, keywords in CATEGORY_KEYWORDS:
+        if any(kw in hits for kw in keywords):
+            return category
+    return 'Technology'
 
 
 # =============================================================================
@@ -253,11 +284,7 @@ def categorize_article(title: str, text: str) -> str:
 
 def get_headers():
     """Return headers for requests."""
-    return {
-        'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-        'Accept-Language': 'en-US,en;q=0.5',
-    }
+    return dict(DEFAULT_HEADERS)
 
 
 def fetch_article_details(url: str) -> dict:
@@ -273,7 +300,7 @@ def fetch_article_details(url: str) -> dict:
     result = {'date': None, 'content': None, 'summary': None}
 
     try:
-        response = requests.get(url, headers=get_headers(), timeout=15)
+        response = http_get(url)
         if response.status_code != 200:
             return result
 
@@ -321,6 +348,82 @@ def fetch_article_details(url: str) -> dict:
     return result
 
 
+def fetch_article_details_many(urls: list) -> list:
+    """fetch_article_details for each URL, several at a time, in input order."""
+    if not urls:
+        return []
+    with ThreadPoolExecutor(max_workers=DETAIL_FETCH_WORKERS) as pool:
+        return list(pool.map(fetch_article_details, urls))
+
+
+def stored_article_urls(urls: list) -> set:
+    """The subset of ``urls`` already saved in the news table."""
+    urls = list(dict.fromkeys(urls))
+    stored = set()
+    with read_connection(DB_PATH) as conn:
+        # Chunked to stay under SQLite's bound-parameter limit
+        for i in range(0, len(urls), 500):
+            chunk = urls[i:i + 500]
+            cursor = conn.execute(
+                f"SELECT article_url FROM news WHERE article_url IN ({','.join('?' * len(chunk))})",
+                chunk
+            )
+            stored.update(row[0] for row in cursor.fetchall())
+    return stored
+
+
+def _detailed_articles(candidates: list, source: str, source_url: str,
+                       summary_limit: int = None) -> list:
+    """Article dicts for (title, url) candidates, fetching only new article pages.
+
+    Articles already in the news table are returned without details;
+    save_articles_to_db counts them as duplicates.
+    """
+    stored = stored_article_urls([url for _, url in candidates]) if candidates else set()
+    new = [(title, url) for title, url in candidates if url not in stored]
+    details = dict(zip([url for _, url in new], fetch_article_details_many([url for _, url in new])))
+
+    articles = []
+    for title, article_url in candidates:
+        if article_url in stored:
+            articles.append({
+                'title': title,
+                'source': source,
+                'source_url': source_url,
+                'article_url': article_url,
+            })
+        else:
+            articles.append(_detailed_article(
+                title, article_url, details[article_url], source, source_url, summary_limit
+            ))
+    return articles
+
+
+def _detailed_article(title: str, article_url: str, details: dict, source: str,
+                      source_url: str, summary_limit: int = None) -> dict:
+    """Article dict for a source whose article pages were fetched."""
+    pub_date = details['date'] or date.today().isoformat()
+    summary = details['summary']
+    content = details['content'] or ""
+    if summary and summary_limit:
+        summary = summary[:summary_limit]
+    hits = scan_article(title, content)
+    return {
+        'title': title,
+        'source': source,
+        'source_url': source_url,
+        'article_url': article_url,
+        'published_date': pub_date,
+        'summary': summary,
+        'full_text': content,
+        'suppliers_mentioned': extract_suppliers_from_text(f"{title} {content}", hits),
+        'technologies_mentioned': extract_technologies_from_text(f"{title} {content}", hits),
+        'products_mentioned': extract_products_from_text(f"{title} {content}", hits),
+        'category': categorize_article(title, content, hits),
+        'sentiment': analyze_sentiment(title, content, hits)
+    }
+
+
 def scrape_the_elec() -> list:
     """
     Scrape The Elec (thelec.net) for display industry news.
@@ -329,6 +432,7 @@ def scrape_the_elec() -> list:
         List of article dicts
     """
     articles = []
+    candidates = []
     seen_urls = set()
     base_url = "https://thelec.net"
 
@@ -340,7 +444,7 @@ def scrape_the_elec() -> list:
 
     for url in urls_to_try:
         try:
-            response = requests.get(url, headers=get_headers(), timeout=15)
+            response = http_get(url)
             if response.status_code != 200:
                 continue
 
@@ -374,28 +478,7 @@ def scrape_the_elec() -> list:
                     if not is_display_relevant(title, ""):
                         continue
 
-                    # Fetch article details (date, content, summary)
-                    details = fetch_article_details(article_url)
-                    pub_date = details['date'] or date.today().isoformat()
-                    summary = details['summary']
-                    content = details['content'] or ""
-
-                    articles.append({
-                        'title': title,
-                        'source': 'The Elec',
-                        'source_url': 'https://thelec.net',
-                        'article_url': article_url,
-                        'published_date': pub_date,
-                        'summary': summary[:500] if summary else None,
-                        'full_text': content,
-                        'suppliers_mentioned': extract_suppliers_from_text(f"{title} {content}"),
-                        'technologies_mentioned': extract_technologies_from_text(f"{title} {content}"),
-                        'products_mentioned': extract_products_from_text(f"{title} {content}"),
-                        'category': categorize_article(title, content),
-                        'sentiment': analyze_sentiment(title, content)
-                    })
-
-                    time.sleep(0.2)  # Rate limiting
+                    candidates.append((title, article_url))
 
                 except Exception:
                     continue
@@ -403,6 +486,9 @@ def scrape_the_elec() -> list:
         except Exception:
             continue
 
+    # Fetch article details (date, content, summary) for articles not yet stored
+    articles.extend(_detailed_articles(candidates, 'The Elec', base_url, summary_limit=500))
+
     return articles
 
 
@@ -418,7 +504,7 @@ def scrape_display_daily() -> list:
     base_url = "https://displaydaily.com"
 
     try:
-        response = requests.get(base_url, headers=get_headers(), timeout=15)
+        response = http_get(base_url)
         if response.status_code != 200:
             return articles
 
@@ -456,7 +542,8 @@ def scrape_display_daily() -> list:
                 seen_urls.add(article_url)
 
                 # Check relevance
-                if not is_display_relevant(title, ""):
+                hits = scan_article(title)
+                if not is_display_relevant(title, "", hits):
                     continue
 
                 articles.append({
@@ -466,10 +553,10 @@ def scrape_display_daily() -> list:
                     'article_url': article_url,
                     'published_date': date.today().isoformat(),
                     'summary': None,
-                    'suppliers_mentioned': extract_suppliers_from_text(title),
-                    'technologies_mentioned': extract_technologies_from_text(title),
-                    'products_mentioned': extract_products_from_text(title),
-                    'category': categorize_article(title, "")
+                    'suppliers_mentioned': extract_suppliers_from_text(title, hits),
+                    'technologies_mentioned': extract_technologies_from_text(title, hits),
+                    'products_mentioned': extract_products_from_text(title, hits),
+                    'category': categorize_article(title, "", hits)
                 })
 
             except Exception:
@@ -500,7 +587,7 @@ def scrape_korea_times() -> list:
 
     for url in urls_to_try:
         try:
-            response = requests.get(url, headers=get_headers(), timeout=15)
+            response = http_get(url)
             if response.status_code != 200:
                 continue
 
@@ -536,7 +623,8 @@ def scrape_korea_times() -> list:
                     seen_urls.add(article_url)
 
                     # Check relevance - Korea Times has general news so filter strictly
-                    if not is_display_relevant(title, ""):
+                    hits = scan_article(title)
+                    if not is_display_relevant(title, "", hits):
                         continue
 
                     articles.append({
@@ -546,17 +634,15 @@ def scrape_korea_times() -> list:
                         'article_url': article_url,
                         'published_date': date.today().isoformat(),
                         'summary': None,
-                        'suppliers_mentioned': extract_suppliers_from_text(title),
-                        'technologies_mentioned': extract_technologies_from_text(title),
-                        'products_mentioned': extract_products_from_text(title),
-                        'category': categorize_article(title, "")
+                        'suppliers_mentioned': extract_suppliers_from_text(title, hits),
+                        'technologies_mentioned': extract_technologies_from_text(title, hits),
+                        'products_mentioned': extract_products_from_text(title, hits),
+                        'category': categorize_article(title, "", hits)
                     })
 
                 except Exception:
                     continue
 
-            time.sleep(0.3)  # Be polite between requests
-
         except Exception:
             continue
 
@@ -571,6 +657,7 @@ def scrape_business_korea() -> list:
         List of article dicts
     """
     articles = []
+    candidates = []
     seen_urls = set()
     base_url = "https://www.businesskorea.co.kr"
 
@@ -580,7 +667,7 @@ def scrape_business_korea() -> list:
     for term in search_terms:
         try:
             url = f"{base_url}/news/articleList.html?sc_word={term}"
-            response = requests.get(url, headers=get_headers(), timeout=15)
+            response = http_get(url)
             if response.status_code != 200:
                 continue
 
@@ -608,28 +695,7 @@ def scrape_business_korea() -> list:
                     if not is_display_relevant(title, ""):
                         continue
 
-                    # Fetch article details
-                    details = fetch_article_details(article_url)
-                    pub_date = details['date'] or date.today().isoformat()
-                    summary = details['summary']
-                    content = details['content'] or ""
-
-                    articles.append({
-                        'title': title,
-                        'source': 'BusinessKorea',
-                        'source_url': base_url,
-                        'article_url': article_url,
-                        'published_date': pub_date,
-                        'summary': summary,
-                        'full_text': content,
-                        'suppliers_mentioned': extract_suppliers_from_text(f"{title} {content}"),
-                        'technologies_mentioned': extract_technologies_from_text(f"{title} {content}"),
-                        'products_mentioned': extract_products_from_text(f"{title} {content}"),
-                        'category': categorize_article(title, content),
-                        'sentiment': analyze_sentiment(title, content)
-                    })
-
-                    time.sleep(0.2)
+                    candidates.append((title, article_url))
 
                 except Exception:
                     continue
@@ -637,6 +703,9 @@ def scrape_business_korea() -> list:
         except Exception:
             continue
 
+    # Fetch article details for articles not yet stored
+    articles.extend(_detailed_articles(candidates, 'BusinessKorea', base_url))
+
     return articles
 
 
@@ -659,7 +728,7 @@ def scrape_digitimes() -> list:
 
     for url in urls_to_try:
         try:
-            response = requests.get(url, headers=get_headers(), timeout=15)
+            response = http_get(url)
             if response.status_code != 200:
                 continue
 
@@ -690,7 +759,8 @@ def scrape_digitimes() -> list:
                         article_url = href
 
                     # Filter for display-related content
-                    if not is_display_relevant(title, ""):
+                    hits = scan_article(title)
+                    if not is_display_relevant(title, "", hits):
                         continue
 
                     articles.append({
@@ -700,11 +770,11 @@ def scrape_digitimes() -> list:
                         'article_url': article_url,
                         'published_date': date.today().isoformat(),
                         'summary': None,
-                        'suppliers_mentioned': extract_suppliers_from_text(title),
-                        'technologies_mentioned': extract_technologies_from_text(title),
-                        'products_mentioned': extract_products_from_text(title),
-                        'category': categorize_article(title, ""),
-                        'sentiment': analyze_sentiment(title, "")
+                        'suppliers_mentioned': extract_suppliers_from_text(title, hits),
+                        'technologies_mentioned': extract_technologies_from_text(title, hits),
+                        'products_mentioned': extract_products_from_text(title, hits),
+                        'category': categorize_article(title, "", hits),
+                        'sentiment': analyze_sentiment(title, "", hits)
                     })
 
                 except Exception:
@@ -729,7 +799,7 @@ def scrape_trendforce() -> list:
 
     try:
         url = f"{base_url}/news"
-        response = requests.get(url, headers=get_headers(), timeout=15)
+        response = http_get(url)
         if response.status_code != 200:
             return articles
 
@@ -764,7 +834,8 @@ def scrape_trendforce() -> list:
                     article_url = href
 
                 # Filter for display-related content
-                if not is_display_relevant(title, ""):
+                hits = scan_article(title)
+                if not is_display_relevant(title, "", hits):
                     continue
 
                 articles.append({
@@ -774,11 +845,11 @@ def scrape_trendforce() -> list:
                     'article_url': article_url,
                     'published_date': date.today().isoformat(),
                     'summary': None,
-                    'suppliers_mentioned': extract_suppliers_from_text(title),
-                    'technologies_mentioned': extract_technologies_from_text(title),
-                    'products_mentioned': extract_products_from_text(title),
-                    'category': categorize_article(title, ""),
-                    'sentiment': analyze_sentiment(title, "")
+                    'suppliers_mentioned': extract_suppliers_from_text(title, hits),
+                    'technologies_mentioned': extract_technologies_from_text(title, hits),
+                    'products_mentioned': extract_products_from_text(title, hits),
+                    'category': categorize_article(title, "", hits),
+                    'sentiment': analyze_sentiment(title, "", hits)
                 })
 
             except Exception:
@@ -794,74 +865,74 @@ def scrape_trendforce() -> list:
 # Database Functions
 # =============================================================================
 
+# Columns save_articles_to_db writes, in the order of the staging table
+_ARTICLE_COLUMNS = (
+    'title', 'source', 'source_url', 'article_url', 'published_date',
+    'summary', 'full_text', 'suppliers_mentioned', 'technologies_mentioned',
+    'products_mentioned', 'category', 'sentiment', 'created_at',
+)
+
 def save_articles_to_db(articles: list) -> tuple:
     """
     Save articles to database, skipping duplicates.
 
+    An article is a duplicate if its URL, or its title from the same source,
+    is already stored or appears earlier in the batch. The batch is staged in
+    a temp table and inserted with one anti-join, in a single transaction.
+    Articles without a title or source are neither saved nor counted.
+
     Args:
         articles: List of article dicts
 
     Returns:
         Tuple of (saved_count, duplicate_count)
     """
-    if not articles:
+    created_at = datetime.now().isoformat()
+    rows = [
+        tuple(article.get(column) for column in _ARTICLE_COLUMNS[:-1]) + (created_at,)
+        for article in articles
+        if article.get('title') and article.get('source')
+    ]
+    if not rows:
         return 0, 0
 
-    conn = sqlite3.connect(DB_PATH)
-    saved = 0
-    duplicates = 0
+    # UNIQUE indexes on article_url and (source, title); if old duplicate
+    # rows prevent them, the anti-join below still keeps new duplicates out
+    apply_migrations(DB_PATH)
 
-    for article in articles:
+    columns = ", ".join(_ARTICLE_COLUMNS)
+    with write_connection(DB_PATH) as conn:
+        conn.execute("DROP TABLE IF EXISTS temp.news_batch")
+        conn.execute(f"CREATE TEMP TABLE news_batch (seq INTEGER PRIMARY KEY, {columns})")
         try:
-            # Check for duplicate by URL
-            cursor = conn.execute(
-                "SELECT id FROM news WHERE article_url = ?",
-                (article['article_url'],)
+            conn.executemany(
+                f"INSERT INTO temp.news_batch ({columns}) "
+                f"VALUES ({', '.join('?' * len(_ARTICLE_COLUMNS))})",
+                rows
             )
-            if cursor.fetchone():
-                duplicates += 1
-                continue
-
-            # Also check by title (in case URL format changed)
-            cursor = conn.execute(
-                "SELECT id FROM news WHERE title = ? AND source = ?",
-                (article['title'], article['source'])
-            )
-            if cursor.fetchone():
-                duplicates += 1
-                continue
-
-            # Insert new article
-            conn.execute("""
-                INSERT INTO news (
-                    title, source, source_url, article_url, published_date,
-                    summary, full_text, suppliers_mentioned, technologies_mentioned,
-                    products_mentioned, category, sentiment, created_at
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                article['title'],
-                article['source'],
-                article.get('source_url'),
-                article['article_url'],
-                article.get('published_date'),
-                article.get('summary'),
-                article.get('full_text'),
-                article.get('suppliers_mentioned'),
-                article.get('technologies_mentioned'),
-                article.get('products_mentioned'),
-                article.get('category'),
-                article.get('sentiment'),
-                datetime.now().isoformat()
-            ))
-            saved += 1
-
-        except Exception as e:
-            continue
-
-    conn.commit()
-    conn.close()
-
-    return saved, duplicates
+            # Anti-join against stored articles and earlier rows of the batch;
+            # OR IGNORE lets the UNIQUE indexes settle anything left over
+            cursor = conn.execute(f"""
+                INSERT OR IGNORE INTO news ({columns})
+                SELECT {columns} FROM temp.news_batch b
+                WHERE NOT EXISTS (SELECT 1 FROM news n WHERE n.article_url = b.article_url)
+                  AND NOT EXISTS (SELECT 1 FROM news n WHERE n.source = b.source AND n.title = b.title)
+                  AND NOT EXISTS (
+                      SELECT 1 FROM temp.news_batch e
+                      WHERE e.seq < b.seq
+                        AND (e.article_url = b.article_url
+                             OR (e.source = b.source AND e.title = b.title))
+                  )
+                ORDER BY b.seq
+            """)
+            saved = cursor.rowcount
+        finally:
+            conn.execute("DROP TABLE IF EXISTS temp.news_batch")
+
+        if saved:
+            bump_data_version(conn, 'news')
+
+    return saved, len(rows) - saved
 
 
 def scrape_all_korea_sources() -> dict:
@@ -889,9 +960,14 @@ def scrape_all_korea_sources() -> dict:
         ('Korea Times', scrape_korea_times),
     ]
 
-    for source_name, scraper_func in scrapers:
+    # Sources run in parallel; the per-host rate limits keep each site polite,
+    # so the whole refresh takes about as long as the slowest source
+    with ThreadPoolExecutor(max_workers=len(scrapers)) as pool:
+        futures = [(name, pool.submit(func)) for name, func in scrapers]
+
+    for source_name, future in futures:
         try:
-            articles = scraper_func()
+            articles = future.result()
             saved, duplicates = save_articles_to_db(articles)
 
             results['sources'][source_name] = {
@@ -926,11 +1002,11 @@ def get_anthropic_api_key():
     except:
         pass
 
-    import os
     return os.environ.get("ANTHROPIC_API_KEY", None)
 
 
-def generate_ai_summary(title: str, full_text: str = None, api_key: str = None) -> str:
+def generate_ai_summary(title: str, full_text: str = None, api_key: str = None,
+                        api_url: str = None) -> str:
     """
     Generate AI summary using Claude Haiku.
 
@@ -938,6 +1014,7 @@ def generate_ai_summary(title: str, full_text: str = None, api_key: str = None)
         title: Article title
         full_text: Article full text (optional)
         api_key: Anthropic API key
+        api_url: Messages endpoint (defaults to SUMMARY_API_URL)
 
     Returns:
         2-3 sentence summary or None if failed
@@ -953,8 +1030,8 @@ def generate_ai_summary(title: str, full_text: str = None, api_key: str = None)
         content = f"Title: {title}\n\nArticle: {full_text[:2000]}"
 
     try:
-        response = requests.post(
-            "https://api.anthropic.com/v1/messages",
+        response = get_session().post(
+            api_url or SUMMARY_API_URL,
             headers={
                 "x-api-key": api_key,
                 "anthropic-version": "2023-06-01",
@@ -985,35 +1062,22 @@ Summary:"""
     return None
 
 
-def analyze_sentiment(title: str, text: str = "") -> str:
+def analyze_sentiment(title: str, text: str = "", scan: frozenset = None) -> str:
     """
     Analyze sentiment based on keywords.
 
     Args:
         title: Article title
         text: Article text
+        scan: scan_article(title, text), if already computed
 
     Returns:
         'Positive', 'Negative', 'Neutral', or 'Mixed'
     """
-    content = f"{title} {text}".lower()
+    hits = _keyword_hits(f"{title} {text}", scan)
 
-    positive_keywords = [
-        'growth', 'profit', 'surge', 'increase', 'expand', 'investment',
-        'breakthrough', 'success', 'milestone', 'record', 'win', 'gains',
-        'strong', 'recovery', 'improve', 'boost', 'advance', 'innovation',
-        'partnership', 'deal', 'order', 'contract', 'launch', 'ramp'
-    ]
-
-    negative_keywords = [
-        'loss', 'decline', 'drop', 'fall', 'cut', 'layoff', 'closure',
-        'halt', 'delay', 'problem', 'issue', 'concern', 'risk', 'weak',
-        'slowdown', 'downturn', 'struggle', 'challenge', 'crisis', 'fail',
-        'shortage', 'deficit', 'warning', 'suspend'
-    ]
-
-    positive_count = sum(1 for kw in positive_keywords if kw in content)
-    negative_count = sum(1 for kw in negative_keywords if kw in content)
+    positive_count = sum(1 for kw in POSITIVE_KEYWORDS if kw in hits)
+    negative_count = sum(1 for kw in NEGATIVE_KEYWORDS if kw in hits)
 
     if positive_count > 0 and negative_count > 0:
         if positive_count > negative_count * 2:
@@ -1040,7 +1104,7 @@ def fetch_article_content(url: str) -> str:
         Article text content or empty string
     """
     try:
-        response = requests.get(url, headers=get_headers(), timeout=15)
+        response = http_get(url)
         if response.status_code != 200:
             return ""
 
@@ -1083,114 +1147,50 @@ def update_article_with_ai(article_id: int, api_key: str = None) -> dict:
     Returns:
         Dict with update results
     """
-    conn = sqlite3.connect(DB_PATH)
+    from .news_enrichment import default_summarizer, enrich_article, write_enrichments
 
     # Get article
-    cursor = conn.execute(
-        "SELECT title, article_url, full_text, summary FROM news WHERE id = ?",
-        (article_id,)
-    )
-    row = cursor.fetchone()
+    with read_connection(DB_PATH) as conn:
+        cursor = conn.execute(
+            "SELECT title, article_url, full_text, summary FROM news WHERE id = ?",
+            (article_id,)
+        )
+        row = cursor.fetchone()
     if not row:
-        conn.close()
         return {'error': 'Article not found'}
 
-    title, url, full_text, existing_summary = row
-    results = {'id': article_id, 'title': title[:50]}
+    # Network calls happen before taking the writer so other writes aren't blocked
+    summarize = default_summarizer(api_key)
+    results = enrich_article(article_id, *row, summarize=summarize)
 
-    # Fetch content if needed
-    if not full_text:
-        full_text = fetch_article_content(url)
-        if full_text:
-            conn.execute(
-                "UPDATE news SET full_text = ? WHERE id = ?",
-                (full_text, article_id)
-            )
-            results['fetched_content'] = True
-
-    # Generate AI summary if missing
-    if not existing_summary and api_key:
-        summary = generate_ai_summary(title, full_text, api_key)
-        if summary:
-            conn.execute(
-                "UPDATE news SET summary = ? WHERE id = ?",
-                (summary, article_id)
-            )
-            results['generated_summary'] = True
-
-    # Update sentiment
-    content = f"{title} {full_text or ''}"
-    sentiment = analyze_sentiment(title, full_text or "")
-    conn.execute(
-        "UPDATE news SET sentiment = ? WHERE id = ?",
-        (sentiment, article_id)
-    )
-    results['sentiment'] = sentiment
-
-    # Update supplier/tech/product tags from full content
-    suppliers = extract_suppliers_from_text(content)
-    technologies = extract_technologies_from_text(content)
-    products = extract_products_from_text(content)
-
-    conn.execute("""
-        UPDATE news SET
-            suppliers_mentioned = COALESCE(?, suppliers_mentioned),
-            technologies_mentioned = COALESCE(?, technologies_mentioned),
-            products_mentioned = COALESCE(?, products_mentioned)
-        WHERE id = ?
-    """, (suppliers, technologies, products, article_id))
-
-    conn.commit()
-    conn.close()
+    with write_connection(DB_PATH) as conn:
+        write_enrichments(conn, [results])
 
+    del results['values']
     return results
 
 
-def update_all_articles_with_ai(api_key: str = None) -> dict:
+def update_all_articles_with_ai(api_key: str = None, limit: int = 50) -> dict:
     """
-    Update all articles with AI summaries and enhanced tags.
+    Update articles with AI summaries and enhanced tags.
+
+    Runs the enrichment worker in utils.news_enrichment in the foreground:
+    up to ``limit`` queued articles, newest first, several at a time.
 
     Args:
         api_key: Anthropic API key
+        limit: Most articles to process in this call (None for all)
 
     Returns:
         Dict with summary of updates
     """
-    conn = sqlite3.connect(DB_PATH)
-
-    # Get articles needing updates
-    cursor = conn.execute("""
-        SELECT id, title FROM news
-        WHERE summary IS NULL OR sentiment IS NULL
-        ORDER BY published_date DESC
-        LIMIT 50
-    """)
-    articles = cursor.fetchall()
-    conn.close()
-
-    results = {
-        'total': len(articles),
-        'summaries_generated': 0,
-        'sentiments_updated': 0,
-        'errors': 0
-    }
-
-    for article_id, title in articles:
-        try:
-            update_result = update_article_with_ai(article_id, api_key)
-            if update_result.get('generated_summary'):
-                results['summaries_generated'] += 1
-            if update_result.get('sentiment'):
-                results['sentiments_updated'] += 1
-            time.sleep(0.5)  # Rate limiting
-        except Exception:
-            results['errors'] += 1
+    from .news_enrichment import enrich_articles
 
-    return results
+    return enrich_articles(api_key=api_key, limit=limit)
 
 
 if __name__ == "__main__":
-    # Test the scrapers
+    # Test the scrapers (run with: python -m utils.news_scraper)
     print("Testing The Elec scraper...")
     articles = scrape_the_elec()
     print(f"Found {len(articles)} relevant articles from The Elec")
@@ -0,0 +1,27 @@
+"""
+Default filter values of the dashboard pages.
+
+The pages use these as their initial sidebar selections, and utils.warmup
+runs the pages' default queries with them, so the warm-up fills exactly the
+cache entries a fresh page view asks for. Change a default here, not in the
+page.
+"""
+
+from datetime import date, datetime
+
+# Suppliers: equipment order years
+SUPPLIERS_YEAR_OPTIONS = list(range(2018, 2027))
+SUPPLIERS_YEARS = (2018, 2026)
+
+# Market Intelligence: shipment years
+MARKET_YEAR_OPTIONS = list(range(2016, 2030))
+MARKET_YEARS = (2022, 2026)
+
+# Factories: utilization date range starts here and ends today
+UTILIZATION_START = date(2023, 1, 1)
+
+
+def default_utilization_end(max_date: str) -> date:
+    """Today, or the last month in the data if that is earlier (projections
+    run years into the future)."""
+    return min(date.today(), datetime.strptime(max_date, "%Y-%m-%d").date())
@@ -0,0 +1,282 @@
+"""
+Query-plan regression check for DatabaseManager.
+
+Runs each DatabaseManager query through its real code path (bypassing the
+result cache and the columnar store), captures the SQL it sends to SQLite,
+and asks EXPLAIN QUERY PLAN how each statement is executed. A statement that
+reads a table with a plain full scan (no index at all) is a regression:
+either a query changed shape or an index in utils.migrations went missing.
+
+Queries that touch every row by design (counts, DISTINCT lists, whole-table
+GROUP BYs) are expected to scan a covering index instead, which passes.
+
+By default the plans are checked on a fixture database built in a temporary
+directory from FIXTURE_SCHEMA, the shipments pipeline and the migrations, so
+the check does not depend on a populated dashboard database. A case the
+fixture cannot run (a table or column it lacks) is a failure: extend
+FIXTURE_SCHEMA along with the query. With --live the plans of the dashboard
+database itself are checked instead; cases it cannot run are listed as SKIP.
+
+Run from the project root with:
+    python -m utils.query_plan_check [--live] [-v]     # exits non-zero on a regression
+"""
+
+import re
+import sqlite3
+import sys
+import tempfile
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Tuple
+
+from . import columnar_store, database
+from .database import DatabaseManager
+from .db_pool import DB_PATH, close_pool, read_connection, write_connection
+from .migrations import apply_migrations
+from .shipments_pipeline import refresh_shipment_derived_data
+
+# The imported tables the queries read, with the columns they use. Derived
+# columns, the shipment cube and all indexes are added by the pipeline and
+# the migrations, as on a real database.
+FIXTURE_SCHEMA = """
+    CREATE TABLE factories (
+        factory_id TEXT PRIMARY KEY, manufacturer TEXT, factory_name TEXT,
+        location TEXT, region TEXT, technology TEXT, backplane TEXT,
+        generation TEXT, substrate TEXT, application_category TEXT,
+        eqpt_po_year INTEGER, install_date TEXT, mp_ramp_date TEXT,
+        probability TEXT, status TEXT, data_source TEXT, created_at TEXT
+    );
+    CREATE TABLE utilization (
+        id INTEGER PRIMARY KEY AUTOINCREMENT, factory_id TEXT, date TEXT,
+        year INTEGER, quarter INTEGER, month INTEGER, utilization_pct REAL,
+        capacity_ksheets REAL, actual_input_ksheets REAL, capacity_sqm_k REAL,
+        actual_input_sqm_k REAL, is_projection INTEGER DEFAULT 0,
+        data_source TEXT, created_at TEXT, UNIQUE(factory_id, date)
+    );
+    CREATE TABLE equipment_orders (
+        id INTEGER PRIMARY KEY AUTOINCREMENT, po_date TEXT, po_year INTEGER,
+        po_quarter TEXT, manufacturer TEXT, factory TEXT, factory_id TEXT,
+        equipment_type TEXT, tool_category TEXT, vendor TEXT, units INTEGER,
+        amount_usd REAL, is_projection INTEGER
+    );
+    CREATE TABLE shipments (
+        id INTEGER PRIMARY KEY AUTOINCREMENT, date TEXT, panel_maker TEXT,
+        brand TEXT, model TEXT, size_inches REAL, technology TEXT,
+        application TEXT, units_k REAL, revenue_m REAL, data_source TEXT
+    );
+    CREATE TABLE financials (
+        id INTEGER PRIMARY KEY AUTOINCREMENT, date TEXT, manufacturer TEXT,
+        revenue REAL
+    );
+    CREATE TABLE news (
+        id INTEGER PRIMARY KEY AUTOINCREMENT, title TEXT NOT NULL,
+        source TEXT NOT NULL, source_url TEXT, article_url TEXT,
+        published_date DATE, summary TEXT, full_text TEXT,
+        suppliers_mentioned TEXT, technologies_mentioned TEXT,
+        products_mentioned TEXT, category TEXT, impact_level TEXT,
+        sentiment TEXT, created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    );
+    CREATE TABLE insights (
+        id INTEGER PRIMARY KEY AUTOINCREMENT, insight_type TEXT, topic TEXT,
+        insight_text TEXT, relevance_score REAL
+    );
+"""
+
+# (DatabaseManager method, keyword arguments) for every filter path worth
+# guarding. Values only need the right type; they are not expected to match rows.
+QUERY_CASES = [
+    ("get_factories", {"manufacturer": "SDC"}),
+    ("get_factories", {"technology": "OLED"}),
+    ("get_factories", {"region": "China"}),
+    ("get_factories", {"status": "operating"}),
+    ("get_utilization", {"start_date": "2024-01-01", "end_date": "2024-12-31"}),
+    ("get_utilization", {"factory_id": "SDC_A3_LTPO"}),
+    ("get_utilization", {"factory_name": "A3"}),
+    ("get_utilization", {"manufacturer": "SDC"}),
+    ("get_equipment_orders", {"start_year": 2020, "end_year": 2024}),
+    ("get_equipment_orders", {"manufacturer": "SDC"}),
+    ("get_equipment_orders", {"vendor": "Canon"}),
+    ("get_equipment_orders", {"equipment_type": "CVD"}),
+    ("get_shipments", {"start_year": 2020, "end_year": 2024}),
+    ("get_shipments", {"panel_maker": "SDC"}),
+    ("get_shipments", {"technology": "OLED"}),
+    ("get_shipments", {"application": "Smartphone"}),
+    ("get_shipment_cube", {"start_year": 2020, "end_year": 2024}),
+    ("get_shipment_cube", {"start_year": 2020, "end_year": 2024, "panel_maker": "SDC"}),
+    ("get_financials", {"start_date": "2024-01-01", "end_date": "2024-12-31"}),
+    ("get_financials", {"manufacturer": "SDC"}),
+    ("get_news", {"start_date": "2024-01-01", "end_date": "2024-12-31"}),
+    ("get_news", {"category": "Technology"}),
+    ("get_news", {"impact_level": "High"}),
+    ("get_insights", {"insight_type": "trend"}),
+    ("get_insights", {"topic": "OLED"}),
+    ("get_dimension_catalog", {}),
+    ("get_date_range", {}),
+    ("get_factory_names", {"manufacturer": "SDC"}),
+    ("get_factory_by_name", {"factory_name": "A3"}),
+    ("get_factory_ramp_date", {"factory_id": "SDC_A3_LTPO"}),
+    ("get_equipment_orders_for_factory", {"factory_id": "SDC_A3_LTPO"}),
+    ("get_all_factory_ramp_dates", {}),
+    ("get_capacity_by_backplane", {}),
+    ("get_capacity_by_backplane", {"manufacturer": "SDC"}),
+    ("get_capacity_by_backplane", {"factory_name": "A3", "date": "2024-12-01"}),
+    ("get_total_capacity_by_backplane", {}),
+    ("get_total_capacity_by_backplane", {"date": "2024-12-01"}),
+    ("get_summary_stats", {}),
+    ("get_utilization_by_manufacturer", {"start_date": "2024-01-01", "end_date": "2024-12-31"}),
+    ("get_equipment_spend_by_vendor", {}),
+    ("get_equipment_spend_by_vendor", {"start_year": 2020, "end_year": 2024}),
+    ("get_shipments_by_application", {}),
+    ("get_shipments_by_application", {"start_year": 2020, "end_year": 2024}),
+    ("aggregate", {"source": "equipment_orders", "group_by": ["vendor"],
+                   "measures": {"total": ("amount_usd", "sum")},
+                   "filters": {"po_year": (2018, 2026)}}),
+    ("aggregate", {"source": "equipment_orders", "group_by": ["process_step"],
+                   "measures": {"total": ("amount_usd", "sum")},
+                   "filters": {"po_year": (2018, 2026), "manufacturer": "SDC"}}),
+    ("aggregate", {"source": "utilization", "group_by": ["date"],
+                   "measures": {"capacity": ("capacity_ksheets", "sum")},
+                   "filters": {"date": ("2024-01-01", "2024-12-31")}}),
+    ("aggregate", {"source": "utilization", "group_by": ["region"],
+                   "measures": {"capacity": ("capacity_ksheets", "sum")},
+                   "filters": {"date": "2024-12-01"}}),
+]
+
+# Bookkeeping statements issued alongside the queries themselves
+_IGNORED = re.compile(r"\b(data_versions|meta|sqlite_master)\b|^\s*PRAGMA", re.IGNORECASE)
+
+# "SCAN factories" or "SCAN u" (tables are shown by alias) -- a scan with no
+# index. Scans of materialized subqueries and CTEs are excluded separately.
+_FULL_SCAN = re.compile(r"^SCAN (\w+)$")
+_SUBQUERY = re.compile(r"^(?:MATERIALIZE|CO-ROUTINE) (\w+)$")
+
+
+class PlanResult(NamedTuple):
+    method: str
+    kwargs: dict
+    sql: str
+    plan: List[str]
+    full_scans: List[str]     # tables read with a plain full scan
+
+
+class SkippedCase(NamedTuple):
+    method: str
+    kwargs: dict
+    error: str
+
+
+def build_fixture(db_path: Path):
+    """Create the dashboard schema, derived columns and indexes (no rows)."""
+    with write_connection(db_path) as conn:
+        conn.executescript(FIXTURE_SCHEMA)
+    refresh_shipment_derived_data(db_path=db_path)
+    # Again, for the indexes on the columns and tables the pipeline added
+    apply_migrations(db_path)
+
+
+def _capture_statements(method: str, kwargs: dict, db_path: Path) -> List[str]:
+    """Run a DatabaseManager query and return the SELECTs it executed."""
+    statements = []
+    with read_connection(db_path) as conn:
+        # Same thread-local connection DatabaseManager will be handed
+        conn.set_trace_callback(statements.append)
+        try:
+            getattr(DatabaseManager, method).uncached(**kwargs)
+        finally:
+            conn.set_trace_callback(None)
+    return [
+        sql for sql in statements
+        if sql.lstrip().upper().startswith("SELECT") and not _IGNORED.search(sql)
+    ]
+
+
+def explain(conn: sqlite3.Connection, sql: str) -> List[str]:
+    """EXPLAIN QUERY PLAN detail lines, indented by nesting depth."""
+    rows = conn.execute(f"EXPLAIN QUERY PLAN {sql}").fetchall()
+    depth: Dict[int, int] = {0: -1}
+    lines = []
+    for node_id, parent, _, detail in rows:
+        depth[node_id] = depth.get(parent, -1) + 1
+        lines.append("  " * depth[node_id] + detail)
+    return lines
+
+
+def check_query_plans(cases=QUERY_CASES, db_path=None) -> Tuple[List[PlanResult], List[SkippedCase]]:
+    """Explain every statement issued by each case against ``db_path``
+    (the dashboard database by default).
+
+    Cases whose table or column does not exist in that database are
+    returned separately as skipped.
+    """
+    db_path = Path(db_path or DB_PATH)
+    results, skipped = [], []
+    saved = columnar_store.COLUMNAR_STORE_ENABLED, database.DB_PATH
+    columnar_store.COLUMNAR_STORE_ENABLED = False
+    # DatabaseManager reads database.DB_PATH on every call
+    database.DB_PATH = db_path
+    try:
+        for method, kwargs in cases:
+            try:
+                statements = _capture_statements(method, kwargs, db_path)
+            except Exception as e:
+                if "no such table" in str(e) or "no such column" in str(e):
+                    skipped.append(SkippedCase(method, kwargs, str(e)))
+                    continue
+                raise
+            with read_connection(db_path) as conn:
+                for sql in statements:
+                    plan = explain(conn, sql)
+                    lines = [line.strip() for line in plan]
+                    derived = {m.group(1) for m in map(_SUBQUERY.match, lines) if m}
+                    scans = [m.group(1) for m in map(_FULL_SCAN.match, lines)
+                             if m and m.group(1) not in derived]
+                    results.append(PlanResult(method, kwargs, sql, plan, scans))
+    finally:
+        columnar_store.COLUMNAR_STORE_ENABLED, database.DB_PATH = saved
+    return results, skipped
+
+
+def _format_args(kwargs: dict) -> str:
+    return ", ".join(f"{k}={v!r}" for k, v in kwargs.items())
+
+
+def main():
+    args = sys.argv[1:]
+    verbose = "-v" in args
+    live = "--live" in args
+    if live:
+        if not DB_PATH.exists():
+            print(f"{DB_PATH.name} not found; nothing to check.")
+            sys.exit(1)
+        results, skipped = check_query_plans()
+    else:
+        with tempfile.TemporaryDirectory() as tmp:
+            fixture = Path(tmp) / "query_plan_fixture.db"
+            build_fixture(fixture)
+            try:
+                results, skipped = check_query_plans(db_path=fixture)
+            finally:
+                close_pool(fixture)
+    failures = [r for r in results if r.full_scans]
+
+    for r in results:
+        status = "FAIL" if r.full_scans else "ok"
+        print(f"[{status:>4}] {r.method}({_format_args(r.kwargs)})")
+        if r.full_scans or verbose:
+            print("       " + " ".join(r.sql.split())[:200])
+            for line in r.plan:
+                print(f"         {line}")
+    for case in skipped:
+        print(f"[{'SKIP' if live else 'FAIL'}] {case.method}({_format_args(case.kwargs)}): {case.error}")
+
+    print(f"\n{len(results)} statements checked, {len(failures)} with full table scans, "
+          f"{len(skipped)} cases not run")
+    if failures:
+        print("Run python -m utils.migrations, or add an index for the new filter path.")
+    if skipped and not live:
+        print("The fixture lacks a table or column these queries use; extend FIXTURE_SCHEMA.")
+    if failures or (skipped and not live):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
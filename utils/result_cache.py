@@ -0,0 +1,136 @@
+"""
+Process-wide query result cache for Display Intelligence Dashboard.
+
+One cache is shared by every session served by this process. Results are
+stored once. Under copy-on-write (always on from pandas 3) a DataFrame hit
+is a shallow copy whose columns share memory with the cached frame, and any
+change a caller makes lands in its own copy. On older pandas without
+copy-on-write enabled, hits are deep copies so callers still cannot change
+the cached entry; this module never changes pandas options itself. Memory
+is bounded by a byte budget; the least recently used entries are evicted first.
+
+Set the budget with DISPLAYINTEL_RESULT_CACHE_MB (default 512).
+"""
+
+import os
+import pickle
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Tuple
+
+import pandas as pd
+
+RESULT_CACHE_BYTES = int(float(os.environ.get("DISPLAYINTEL_RESULT_CACHE_MB", "512")) * 1024 * 1024)
+
+
+def _result_size(value) -> int:
+    """Approximate bytes held by a cached result."""
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(index=True, deep=True).sum())
+    if isinstance(value, (pd.Series, pd.Index)):
+        return int(value.memory_usage(deep=True))
+    try:
+        return len(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+    except Exception:
+        return 1024
+
+
+def _copy_on_write() -> bool:
+    if int(pd.__version__.split(".")[0]) >= 3:
+        return True
+    return pd.get_option("mode.copy_on_write") is True
+
+
+def _shared(value):
+    """What a cache hit returns: callers cannot change the cached entry.
+    With copy-on-write no data is copied."""
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        return value.copy(deep=not _copy_on_write())
+    if isinstance(value, (list, dict, set)):
+        return value.copy()
+    return value
+
+
+def freeze(value) -> Hashable:
+    """Hashable stand-in for a call argument (dicts, lists and sets included)."""
+    if isinstance(value, dict):
+        return ("__dict__",) + tuple(sorted((k, freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple)):
+        return (type(value).__name__,) + tuple(freeze(v) for v in value)
+    if isinstance(value, (set, frozenset)):
+        return ("__set__",) + tuple(sorted((freeze(v) for v in value), key=repr))
+    try:
+        hash(value)
+    except TypeError:
+        return repr(value)
+    return value
+
+
+class ResultCache:
+    """Thread-safe LRU mapping of call keys to results, bounded in bytes."""
+
+    def __init__(self, max_bytes: int = RESULT_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Hashable, Tuple[Any, int]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return _shared(entry[0])
+            self.misses += 1
+
+        # Computed outside the lock so slow queries do not block other hits
+        value = compute()
+        self.put(key, value)
+        return _shared(value)
+
+    def put(self, key: Hashable, value):
+        size = _result_size(value)
+        if size > self.max_bytes:
+            return      # would evict everything else; serve it uncached
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old[1]
+            self._entries[key] = (value, size)
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self._bytes -= evicted
+                self.evictions += 1
+
+    def clear(self, predicate: Callable[[Hashable], bool] = None):
+        """Drop every entry, or those whose key matches ``predicate``."""
+        with self._lock:
+            for key in [k for k in self._entries if predicate is None or predicate(k)]:
+                self._bytes -= self._entries.pop(key)[1]
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'max_bytes': self.max_bytes,
+            }
+
+
+# The cache shared by all DatabaseManager queries in this process
+RESULT_CACHE = ResultCache()
+
+
+def result_cache_stats() -> Dict[str, float]:
+    """Hit/miss/eviction counts and memory use of the shared result cache."""
+    return RESULT_CACHE.stats()
@@ -0,0 +1,78 @@
+"""
+ScenarioByFab capacity scenarios for Display Intelligence Dashboard.
+
+The Factory Comparison tab reads per-phase capacity plans from the
+ScenarioByFab sheet of the CapSpendReport CapacityData workbook. Parsing it
+with openpyxl is slow, so the parsed sheet is kept on disk by
+utils.workbook_cache and in memory by the shared result cache.
+"""
+
+from pathlib import Path
+from typing import Optional
+
+import pandas as pd
+
+from .result_cache import RESULT_CACHE
+from .workbook_cache import cached_sheet, file_signature
+
+SOURCE_DATA_PATH = Path(__file__).parent.parent / "source_data"
+SCENARIO_SHEET = "ScenarioByFab"
+
+# Headers on row 7, data starts row 9
+_SCENARIO_COLUMNS = {
+    3: "region", 4: "manufacturer", 5: "factory1", 6: "location",
+    7: "phase", 8: "backplane",
+    9: "tft_mg_v", 10: "tft_mg_h", 11: "tft_gen",
+    12: "tft_max_input", 13: "octa_ksheets", 14: "octa_mp",
+    15: "oled_mg_v", 16: "oled_mg_h", 17: "oled_gen",
+    18: "oled_max_input",
+    19: "application", 20: "main_application",
+    21: "type", 22: "substrate", 23: "depo", 24: "encapsulation",
+    25: "eqpt_po", 26: "install", 27: "mp_ramp", 28: "end",
+    29: "status", 30: "probability", 31: "client",
+    32: "standard_panel",
+}
+
+
+def _parse_scenario_by_fab(fpath):
+    """Parse the ScenarioByFab sheet of a CapacityData workbook."""
+    import openpyxl
+    try:
+        wb = openpyxl.load_workbook(fpath, data_only=True, read_only=True)
+    except Exception:
+        return pd.DataFrame()
+    if SCENARIO_SHEET not in wb.sheetnames:
+        wb.close()
+        return pd.DataFrame()
+    ws = wb[SCENARIO_SHEET]
+    rows = []
+    for row in ws.iter_rows(min_row=9, max_col=32, values_only=True):
+        if row[2] is None and row[3] is None:
+            continue  # skip empty
+        rows.append({
+            name: row[ci - 1] if ci - 1 < len(row) else None
+            for ci, name in _SCENARIO_COLUMNS.items()
+        })
+    wb.close()
+    df = pd.DataFrame(rows)
+    # Convert numeric columns
+    for c in ["tft_max_input", "octa_ksheets", "oled_max_input"]:
+        df[c] = pd.to_numeric(df[c], errors="coerce").fillna(0)
+    return df
+
+
+def scenario_workbook(source_dir: Optional[Path] = None) -> Optional[Path]:
+    """The CapacityData workbook holding ScenarioByFab, if there is one."""
+    candidates = list((source_dir or SOURCE_DATA_PATH).glob("*CapSpendReport*CapacityData*"))
+    return candidates[0] if candidates else None
+
+
+def load_scenario_by_fab(source_dir: Optional[Path] = None) -> pd.DataFrame:
+    """ScenarioByFab rows, parsed once per workbook version."""
+    path = scenario_workbook(source_dir)
+    if path is None:
+        return pd.DataFrame()
+    key = ("scenario_by_fab", str(path.resolve()), file_signature(path))
+    return RESULT_CACHE.get_or_compute(
+        key, lambda: cached_sheet(path, SCENARIO_SHEET, _parse_scenario_by_fab)
+    )
@@ -0,0 +1,150 @@
+"""
+Pre-aggregated shipment cube for the Market Intelligence page.
+
+Every Market Intelligence chart is a sum of revenue/units over some subset of
+(period, panel_maker, application, brand, inferred_product). The cube stores
+those sums once per distinct combination, so the page aggregates a few
+thousand cube rows instead of every shipment on each rerun.
+
+The cube is rebuilt by the shipments pipeline (utils.shipments_pipeline)
+whenever the shipments table has changed since it was last built.
+"""
+
+import sqlite3
+from typing import Iterable, Sequence
+
+import pandas as pd
+
+from .data_version import bump_data_version, get_meta, set_meta, table_versions
+from .db_pool import DB_PATH, read_connection, write_connection
+from .migrations import INDEXES, index_sql
+
+# Grain of the cube. year and is_annual_total follow from period_key but are
+# kept for indexed filtering; inference_confidence lets the product charts
+# keep only high/medium inferences.
+CUBE_DIMENSIONS = [
+    'year', 'period_key', 'is_annual_total', 'panel_maker', 'application',
+    'brand', 'inferred_product', 'inference_confidence',
+]
+CUBE_MEASURES = ['revenue_m', 'units_k', 'row_count']
+
+# meta key holding the shipments data version the cube was built from
+CUBE_SOURCE_VERSION_KEY = "shipments.cube_source_version"
+
+CUBE_INDEXES = ("idx_shipment_cube_filters",)
+
+
+def _ensure_cube_table(conn: sqlite3.Connection):
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS shipment_cube (
+            year INTEGER,
+            period_key TEXT,
+            is_annual_total INTEGER,
+            panel_maker TEXT,
+            application TEXT,
+            brand TEXT,
+            inferred_product TEXT,
+            inference_confidence TEXT,
+            revenue_m REAL,
+            units_k REAL,
+            row_count INTEGER
+        )
+    """)
+    for name in CUBE_INDEXES:
+        conn.execute(index_sql(name, INDEXES[name]))
+
+
+def _source_version(conn: sqlite3.Connection) -> str:
+    return str(table_versions(conn, 'shipments')[0])
+
+
+def cube_stale(db_path=None) -> bool:
+    """True when shipments changed since the cube was built."""
+    with read_connection(db_path or DB_PATH) as conn:
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(shipments)").fetchall()}
+        if not columns:
+            return False
+        return get_meta(conn, CUBE_SOURCE_VERSION_KEY) != _source_version(conn)
+
+
+def build_shipment_cube(force: bool = False, db_path=None) -> int:
+    """Rebuild the cube from shipments if they changed; returns its row count.
+
+    Needs the period and inference columns, so run it after the other
+    pipeline stages. Returns 0 when the cube was already current.
+    """
+    with write_connection(db_path or DB_PATH) as conn:
+        version = _source_version(conn)
+        if not force and get_meta(conn, CUBE_SOURCE_VERSION_KEY) == version:
+            return 0
+        _ensure_cube_table(conn)
+        conn.execute("DELETE FROM shipment_cube")
+        dims = ", ".join(CUBE_DIMENSIONS)
+        conn.execute(f"""
+            INSERT INTO shipment_cube ({dims}, revenue_m, units_k, row_count)
+            SELECT {dims}, SUM(revenue_m), SUM(units_k), COUNT(*)
+            FROM shipments
+            GROUP BY {dims}
+        """)
+        rows = conn.execute("SELECT COUNT(*) FROM shipment_cube").fetchone()[0]
+        set_meta(conn, CUBE_SOURCE_VERSION_KEY, version)
+        bump_data_version(conn, 'shipment_cube')
+    return rows
+
+
+def cube_from_shipments(shipments: pd.DataFrame) -> pd.DataFrame:
+    """The rows build_shipment_cube would store for ``shipments``, computed
+    in memory. ``shipments`` needs the period and inference columns (see
+    shipments_pipeline.derive_shipment_columns)."""
+    return shipments.groupby(CUBE_DIMENSIONS, dropna=False).agg(
+        revenue_m=('revenue_m', 'sum'),
+        units_k=('units_k', 'sum'),
+        row_count=('revenue_m', 'size'),
+    ).reset_index()
+
+
+# ---------------------------------------------------------------------------
+# Roll-ups
+#
+# These take the frame returned by DatabaseManager.get_shipment_cube and
+# mirror the filters and groupbys the page used to run over raw shipments.
+# ---------------------------------------------------------------------------
+
+def rollup(cube: pd.DataFrame, by: Sequence[str],
+           measures: Iterable[str] = ('revenue_m', 'units_k')) -> pd.DataFrame:
+    """Sum ``measures`` over every dimension not in ``by``.
+
+    Rows with a missing value in any ``by`` column are left out, as with
+    DataFrame.groupby.
+    """
+    return cube.groupby(list(by))[list(measures)].sum().reset_index()
+
+
+def ranked(cube: pd.DataFrame, column: str, measure: str = 'revenue_m') -> pd.Series:
+    """Total ``measure`` per value of ``column``, largest first."""
+    return cube.groupby(column)[measure].sum().sort_values(ascending=False)
+
+
+def valid_makers(cube: pd.DataFrame) -> pd.DataFrame:
+    """Rows for individual panel makers (no 'ALL' or '/Others' aggregates)."""
+    maker = cube['panel_maker']
+    return cube[
+        maker.notna() &
+        (maker != '') &
+        (maker != 'ALL') &
+        (~maker.str.contains('/Others', na=False))
+    ]
+
+
+def valid_applications(cube: pd.DataFrame) -> pd.DataFrame:
+    return cube[cube['application'].notna() & (cube['application'] != '')]
+
+
+def quarterly(cube: pd.DataFrame) -> pd.DataFrame:
+    """Quarterly rows (annual totals excluded), with period_key as 'period'."""
+    return cube[cube['is_annual_total'] == 0].rename(columns={'period_key': 'period'})
+
+
+def confident_products(cube: pd.DataFrame) -> pd.DataFrame:
+    """Rows whose product was inferred with high or medium confidence."""
+    return cube[cube['inference_confidence'].isin(['high', 'medium'])]
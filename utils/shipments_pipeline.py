@@ -0,0 +1,275 @@
+"""
+Import-time pipeline stages for the shipments table.
+
+Derived shipment columns are computed once when shipments are loaded (or
+the rules behind them change) and stored in SQLite, so pages read them
+directly instead of recomputing them on every render. Nothing here runs
+from a page: anything that writes the shipments table must call
+refresh_shipment_derived_data() (or run this module) afterwards.
+
+Duplicate rows are deleted by the migration that creates the UNIQUE
+natural-key index (see utils.migrations), which the refresh applies first.
+From then on a plain INSERT of an existing row raises IntegrityError, so
+loaders must insert with INSERT OR IGNORE.
+
+Run from the project root with:
+    python -m utils.shipments_pipeline [--force]
+"""
+
+import json
+import sys
+import sqlite3
+
+import pandas as pd
+
+from product_inference import enrich_shipments, infer_products, rules_version
+
+from .dashboard_summary import refresh_stale_dashboard_summary
+from .data_version import bump_data_version, get_meta, set_meta, versioned_cache
+from .db_pool import DB_PATH, read_connection, write_connection
+from .migrations import INDEXES, apply_migrations, index_sql
+from .shipment_cube import build_shipment_cube, cube_stale
+
+# meta key holding the rules_version() the stored inferences were built with
+RULES_VERSION_KEY = "shipments.product_rules_version"
+
+INFERENCE_COLUMNS = {
+    "inferred_product": "TEXT",
+    "inference_confidence": "TEXT",
+    "inference_alternatives": "TEXT",   # JSON list of other candidate products
+}
+
+
+def _shipment_columns(conn: sqlite3.Connection) -> set:
+    return {row[1] for row in conn.execute("PRAGMA table_info(shipments)").fetchall()}
+
+
+def ensure_inference_columns(conn: sqlite3.Connection):
+    """Add the inferred product columns and index if they are missing."""
+    existing = _shipment_columns(conn)
+    for column, sql_type in INFERENCE_COLUMNS.items():
+        if column not in existing:
+            conn.execute(f"ALTER TABLE shipments ADD COLUMN {column} {sql_type}")
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_shipments_inferred_product "
+        "ON shipments(inferred_product)"
+    )
+
+
+def inferred_products_stale(db_path=None) -> bool:
+    """True when stored inferences are missing or built from older rules."""
+    with read_connection(db_path or DB_PATH) as conn:
+        columns = _shipment_columns(conn)
+        if not columns:
+            return False    # no shipments table yet
+        if not set(INFERENCE_COLUMNS) <= columns:
+            return True
+        if get_meta(conn, RULES_VERSION_KEY) != rules_version():
+            return True
+        return conn.execute(
+            "SELECT 1 FROM shipments WHERE inferred_product IS NULL LIMIT 1"
+        ).fetchone() is not None
+
+
+def materialize_inferred_products(force: bool = False, db_path=None) -> int:
+    """Store infer_product results for shipment rows that need them.
+
+    Recomputes every row when PRODUCT_RULES (or the supplier tables) changed
+    since the last run, or when ``force`` is set; otherwise only fills rows
+    imported since then. Returns the number of rows written.
+    """
+    version = rules_version()
+    with write_connection(db_path or DB_PATH) as conn:
+        ensure_inference_columns(conn)
+        rebuild = force or get_meta(conn, RULES_VERSION_KEY) != version
+
+        query = "SELECT id, brand, application, size_inches, panel_maker FROM shipments"
+        if not rebuild:
+            query += " WHERE inferred_product IS NULL"
+        df = pd.read_sql_query(query, conn)
+
+        if len(df) > 0:
+            results = infer_products(df)
+            conn.executemany("""
+                UPDATE shipments SET
+                    inferred_product = ?,
+                    inference_confidence = ?,
+                    inference_alternatives = ?
+                WHERE id = ?
+            """, zip(
+                results["inferred_product"].tolist(),
+                results["inference_confidence"].tolist(),
+                [json.dumps(alts) for alts in results["inference_alternatives"]],
+                df["id"].tolist(),
+            ))
+
+        set_meta(conn, RULES_VERSION_KEY, version)
+        if len(df) > 0:
+            bump_data_version(conn, "shipments")
+
+    return len(df)
+
+
+# ---------------------------------------------------------------------------
+# Periods
+#
+# The date column holds period strings such as '2016-Q1 2016', or
+# '2016-ALL 2016' for annual totals. They are parsed once into typed columns
+# so year filters and period grouping can use indexes.
+# ---------------------------------------------------------------------------
+
+PERIOD_COLUMNS = {
+    "year": "INTEGER",
+    "quarter": "INTEGER",           # NULL for annual totals
+    "period_key": "TEXT",           # '2016-Q1' / '2016-ALL'; sorts chronologically
+    "is_annual_total": "INTEGER",   # 1 for '...ALL...' rows; NULL until parsed
+}
+
+# Indexes (defined in utils.migrations) that need the period columns
+PERIOD_INDEXES = ("idx_shipments_year_period", "idx_shipments_period")
+
+
+def parse_periods(dates: pd.Series) -> pd.DataFrame:
+    """Split shipment period strings into PERIOD_COLUMNS."""
+    dates = dates.astype(object).where(dates.notna(), None)
+    text = dates.fillna("").astype(str)
+    period_key = text.str.split(" ").str[0]
+    is_annual = text.str.contains("ALL", regex=False)
+    quarter = pd.to_numeric(period_key.str.extract(r"Q([1-4])", expand=False), errors="coerce")
+    return pd.DataFrame({
+        "year": pd.to_numeric(text.str[:4], errors="coerce").astype("Int64"),
+        "quarter": quarter.where(~is_annual).astype("Int64"),
+        "period_key": period_key.where(dates.notna(), None),
+        "is_annual_total": is_annual.astype(int),
+    }, index=dates.index)
+
+
+def ensure_period_columns(conn: sqlite3.Connection):
+    """Add the period columns and their indexes if they are missing."""
+    existing = _shipment_columns(conn)
+    for column, sql_type in PERIOD_COLUMNS.items():
+        if column not in existing:
+            conn.execute(f"ALTER TABLE shipments ADD COLUMN {column} {sql_type}")
+    for name in PERIOD_INDEXES:
+        conn.execute(index_sql(name, INDEXES[name]))
+
+
+def periods_stale(db_path=None) -> bool:
+    """True when some shipment rows have not had their period parsed."""
+    with read_connection(db_path or DB_PATH) as conn:
+        columns = _shipment_columns(conn)
+        if not columns:
+            return False
+        if not set(PERIOD_COLUMNS) <= columns:
+            return True
+        return conn.execute(
+            "SELECT 1 FROM shipments WHERE is_annual_total IS NULL LIMIT 1"
+        ).fetchone() is not None
+
+
+def materialize_periods(force: bool = False, db_path=None) -> int:
+    """Fill the period columns for rows imported since the last run.
+
+    Rows are updated one distinct date string at a time, since a shipments
+    table has thousands of rows per period. Returns the number of rows written.
+    """
+    with write_connection(db_path or DB_PATH) as conn:
+        ensure_period_columns(conn)
+        where = "" if force else " WHERE is_annual_total IS NULL"
+        dates = pd.read_sql_query(
+            f"SELECT date, COUNT(*) AS n FROM shipments{where} GROUP BY date", conn
+        )
+        if len(dates) == 0:
+            return 0
+
+        parsed = parse_periods(dates["date"])
+        params = [
+            (None if pd.isna(year) else int(year),
+             None if pd.isna(quarter) else int(quarter),
+             key, int(annual), date)
+            for year, quarter, key, annual, date in zip(
+                parsed["year"], parsed["quarter"], parsed["period_key"],
+                parsed["is_annual_total"], dates["date"],
+            )
+        ]
+        set_clause = "year = ?, quarter = ?, period_key = ?, is_annual_total = ?"
+        conn.executemany(
+            f"UPDATE shipments SET {set_clause} WHERE date = ?",
+            [p for p in params if p[-1] is not None]
+        )
+        conn.executemany(
+            f"UPDATE shipments SET {set_clause} WHERE date IS NULL",
+            [p[:-1] for p in params if p[-1] is None]
+        )
+        bump_data_version(conn, "shipments")
+    return int(dates["n"].sum())
+
+
+def derive_shipment_columns(shipments: pd.DataFrame) -> pd.DataFrame:
+    """Raw shipment rows with the period and inferred product columns
+    computed in memory, as the pipeline stages would store them.
+
+    For pages reading a database the pipeline has not run on yet.
+    """
+    if 'inferred_product' not in shipments.columns:
+        shipments = enrich_shipments(shipments)
+    else:
+        shipments = shipments.copy()
+    periods = parse_periods(shipments['date'])
+    for column in PERIOD_COLUMNS:
+        shipments[column] = periods[column]
+    return shipments
+
+
+def shipment_derived_data_stale(db_path=None) -> bool:
+    """True when any derived-data stage has rows to (re)compute."""
+    return (periods_stale(db_path) or inferred_products_stale(db_path)
+            or cube_stale(db_path))
+
+
+@versioned_cache("shipments", "shipment_cube")
+def shipment_derived_data_status() -> str:
+    """'missing' if the pipeline has never run on the loaded shipments,
+    'stale' if some stage has rows to (re)compute, else 'current'.
+
+    Cached until shipments or the cube are written, so pages can check it
+    on every render; it never writes anything itself.
+    """
+    with read_connection(DB_PATH) as conn:
+        columns = _shipment_columns(conn)
+        has_cube = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'shipment_cube'"
+        ).fetchone() is not None
+    if columns and (not has_cube or not set(PERIOD_COLUMNS) <= columns):
+        return "missing"
+    return "stale" if shipment_derived_data_stale() else "current"
+
+
+def refresh_shipment_derived_data(force: bool = False, db_path=None) -> dict:
+    """Run the shipments pipeline stages; call after importing shipments.
+
+    Migrations run first, so duplicate rows are gone (and kept out by the
+    natural-key index) before anything is aggregated.
+    """
+    summary = {
+        "indexes_created": len(apply_migrations(db_path)),
+        "periods": materialize_periods(force=force, db_path=db_path),
+        "inferred_products": materialize_inferred_products(force=force, db_path=db_path),
+        # Last: aggregates the columns the stages above fill in
+        "cube_rows": build_shipment_cube(force=force, db_path=db_path),
+    }
+    # The stages bump the shipments version the home-page summary is keyed on
+    refresh_stale_dashboard_summary(db_path)
+    return summary
+
+
+def main():
+    args = sys.argv[1:]
+    summary = refresh_shipment_derived_data(force="--force" in args)
+    print(f"Product rules version: {rules_version()}")
+    for stage, rows in summary.items():
+        print(f"  {stage}: {rows:,} rows")
+
+
+if __name__ == "__main__":
+    main()
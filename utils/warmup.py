@@ -0,0 +1,203 @@
+"""
+Background cache warm-up for Display Intelligence Dashboard.
+
+After a deploy, or once an import has changed the data, the first analyst to
+open each page would otherwise pay for every cold query. start_warmup() runs
+the queries behind each page's default view in a daemon thread, so their
+results are already in the shared result cache (utils.result_cache) when
+someone asks for them. The thread then watches the data versions and warms
+again whenever a write lands, whichever process made it; importers running
+in this process can also call request_warmup() to skip the wait.
+
+The calls below must use the same arguments as the pages, or they warm
+entries nobody reads; default filter values come from utils.page_defaults,
+which the pages use too.
+"""
+
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from typing import Callable, List, Optional, Tuple
+
+import pandas as pd
+
+from .data_version import get_data_version
+from .database import DatabaseManager
+from .page_defaults import (
+    MARKET_YEARS, SUPPLIERS_YEARS, UTILIZATION_START, default_utilization_end,
+)
+from .scenario import load_scenario_by_fab
+from .shipments_pipeline import shipment_derived_data_status
+
+# Tables whose writes trigger another warm-up
+WARMUP_TABLES = (
+    'factories', 'utilization', 'equipment_orders', 'shipments',
+    'shipment_cube', 'insights', 'dashboard_summary',
+)
+
+# How often the thread checks for writes made by other processes
+WARMUP_POLL_SECONDS = 30
+
+_thread: Optional[threading.Thread] = None
+_thread_lock = threading.Lock()
+_wake = threading.Event()
+# Outcome of the last pass: {'finished_at', 'seconds', 'queries', 'errors'}
+last_warmup: dict = {}
+
+
+def _dashboard_queries() -> List[Tuple[str, Callable]]:
+    return [
+        ("get_summary_stats", DatabaseManager.get_summary_stats),
+        # Sidebar filter lists for every page
+        ("get_dimension_catalog", DatabaseManager.get_dimension_catalog),
+    ]
+
+
+def _suppliers_queries() -> List[Tuple[str, Callable]]:
+    start_year, end_year = SUPPLIERS_YEARS
+    filters = {
+        'po_year': SUPPLIERS_YEARS,
+        'manufacturer': "All",
+        'vendor': "All",
+        'equipment_type': "All",
+    }
+    spend = ('amount_usd', 'sum')
+
+    def totals(group_by, **measures):
+        return lambda: DatabaseManager.aggregate('equipment_orders', group_by, measures, filters)
+
+    return [
+        ("get_equipment_orders", lambda: DatabaseManager.get_equipment_orders(
+            start_year=start_year, end_year=end_year,
+            manufacturer="All", vendor="All", equipment_type="All")),
+        ("get_equipment_spend_by_vendor", lambda: DatabaseManager.get_equipment_spend_by_vendor(
+            start_year=start_year, end_year=end_year)),
+        ("aggregate po_year", totals(['po_year'], amount_usd=spend)),
+        ("aggregate equipment_label", totals(
+            ['equipment_label'], amount_usd=spend, id=('id', 'count'))),
+        ("aggregate process_step", totals(['process_step'], amount_usd=spend)),
+        ("aggregate vendor", totals(
+            ['vendor', 'equipment_label'], amount_usd=spend,
+            units=('units', 'sum'), id=('id', 'count'))),
+        ("aggregate manufacturer", totals(
+            ['manufacturer'], amount_usd=spend,
+            units=('units', 'sum'), id=('id', 'count'))),
+        ("aggregate unit economics", totals(
+            ['equipment_label', 'tool_category', 'process_step'],
+            amount_usd=('priced_amount_usd', 'sum'), units=('priced_units', 'sum'))),
+    ]
+
+
+def _factories_queries() -> List[Tuple[str, Callable]]:
+    def utilization_range():
+        # Factories page defaults
+        _, max_date = DatabaseManager.get_date_range()
+        end = default_utilization_end(max_date)
+        return UTILIZATION_START.strftime("%Y-%m-%d"), end.strftime("%Y-%m-%d")
+
+    def utilization():
+        start, end = utilization_range()
+        return DatabaseManager.get_utilization(start_date=start, end_date=end, manufacturer=None)
+
+    def capacity():
+        # Capacity Overview tab: totals up to the end of the current quarter
+        start, end = utilization_range()
+        quarter_end = pd.Timestamp.today().to_period('Q').end_time.strftime("%Y-%m-%d")
+        filters = {'date': (start, min(end, quarter_end))}
+        capacity_ksheets = {'capacity_ksheets': ('capacity_ksheets', 'sum')}
+        by_date = DatabaseManager.aggregate('utilization', ['date'], {
+            'capacity_ksheets': ('capacity_ksheets', 'sum'),
+            'actual_input_ksheets': ('actual_input_ksheets', 'sum'),
+            'capacity_sqm_k': ('capacity_sqm_k', 'sum')
+        }, filters)
+        for dimension in ('technology', 'region'):
+            DatabaseManager.aggregate('utilization', [dimension], capacity_ksheets, filters)
+        if len(by_date) > 0:
+            DatabaseManager.aggregate('utilization', ['manufacturer'], capacity_ksheets,
+                                      {'date': by_date['date'].max()})
+
+    return [
+        ("get_factory_names", lambda: DatabaseManager.get_factory_names("All")),
+        ("get_date_range", DatabaseManager.get_date_range),
+        ("get_factories", lambda: DatabaseManager.get_factories(
+            manufacturer="All", technology="All", region="All", status="All")),
+        ("get_all_factory_ramp_dates", DatabaseManager.get_all_factory_ramp_dates),
+        ("get_utilization", utilization),
+        ("capacity aggregates", capacity),
+        ("load_scenario_by_fab", load_scenario_by_fab),
+        # Factory Comparison falls back to the database without ScenarioByFab
+        ("get_factories", DatabaseManager.get_factories),
+    ]
+
+
+def _market_queries() -> List[Tuple[str, Callable]]:
+    start_year, end_year = MARKET_YEARS
+
+    return [
+        ("shipment_derived_data_status", shipment_derived_data_status),
+        ("get_shipments", lambda: DatabaseManager.get_shipments(
+            start_year=start_year, end_year=end_year, panel_maker="All", application="All")),
+        ("get_shipment_cube", lambda: DatabaseManager.get_shipment_cube(
+            start_year=start_year, end_year=end_year, panel_maker="All", application="All")),
+        ("get_insights", DatabaseManager.get_insights),
+    ]
+
+
+def warmup_queries() -> List[Tuple[str, Callable]]:
+    """(label, call) for every default page view, Dashboard first."""
+    return (_dashboard_queries() + _suppliers_queries()
+            + _factories_queries() + _market_queries())
+
+
+def warm_caches() -> dict:
+    """Run every warm-up query once; failures are recorded, not raised."""
+    start = time.perf_counter()
+    queries = warmup_queries()
+    errors = {}
+    for label, call in queries:
+        try:
+            call()
+        except Exception as e:
+            errors[label] = str(e)
+    result = {
+        'finished_at': datetime.now().isoformat(),
+        'seconds': time.perf_counter() - start,
+        'queries': len(queries),
+        'errors': errors,
+    }
+    last_warmup.clear()
+    last_warmup.update(result)
+    return result
+
+
+def _run():
+    versions = None
+    while True:
+        try:
+            current = get_data_version(*WARMUP_TABLES)
+            if current != versions or _wake.is_set():
+                _wake.clear()
+                warm_caches()
+                versions = current
+        except sqlite3.Error as e:
+            # Database missing or being replaced; try again on the next poll
+            print(f"[warmup] {e}")
+        _wake.wait(WARMUP_POLL_SECONDS)
+
+
+def start_warmup() -> bool:
+    """Start the warm-up thread once per process; True if this call started it."""
+    global _thread
+    with _thread_lock:
+        if _thread is not None and _thread.is_alive():
+            return False
+        _thread = threading.Thread(target=_run, name="cache-warmup", daemon=True)
+        _thread.start()
+        return True
+
+
+def request_warmup():
+    """Warm again now (after an import), if the warm-up thread is running."""
+    _wake.set()
+
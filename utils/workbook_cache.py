@@ -0,0 +1,218 @@
+"""
+On-disk cache of parsed Excel sheets for Display Intelligence Dashboard.
+
+Parsing the DSCC .xlsm reports with openpyxl is the slowest step in the app.
+The first time a sheet is parsed, the resulting DataFrame is written to an
+Arrow IPC file; later reads memory-map that file instead of opening the
+workbook. Entries are keyed on the workbook's content hash (re-hashed only
+when its size or mtime changes) and on the source of the module defining the
+parser, so editing the workbook, the parser or any helper or constant next
+to it (COLUMN_MAP, _cell_value, ...) invalidates them. Writing a new entry
+deletes the ones it supersedes for the same workbook path and sheet.
+"""
+
+import datetime as dt
+import hashlib
+import inspect
+import json
+import os
+import tempfile
+import threading
+from pathlib import Path
+from typing import Callable, Dict, Tuple, Union
+
+import pandas as pd
+import pyarrow as pa
+
+CACHE_DIR = Path(__file__).parent.parent / ".workbook_cache"
+
+# Schema metadata keys
+_ATTRS_KEY = b"displayintel.attrs"
+_MIXED_KEY = b"displayintel.mixed_columns"
+
+# (resolved path, size, mtime_ns) → content hash, so unchanged files are not re-read
+_digests: Dict[Tuple[str, int, int], str] = {}
+_digests_lock = threading.Lock()
+
+
+def file_signature(path: Union[str, Path]) -> Tuple[int, int, str]:
+    """(size, mtime_ns, sha256) of a file, hashing only when size/mtime change."""
+    path = Path(path).resolve()
+    stat = path.stat()
+    memo_key = (str(path), stat.st_size, stat.st_mtime_ns)
+    with _digests_lock:
+        digest = _digests.get(memo_key)
+    if digest is None:
+        sig_file = CACHE_DIR / f"{hashlib.sha1(str(path).encode()).hexdigest()[:16]}.sig"
+        try:
+            sig = json.loads(sig_file.read_text())
+            if (sig["size"], sig["mtime_ns"]) == (stat.st_size, stat.st_mtime_ns):
+                digest = sig["sha256"]
+        except (OSError, ValueError, KeyError):
+            pass
+        if digest is None:
+            h = hashlib.sha256()
+            with open(path, "rb") as f:
+                for chunk in iter(lambda: f.read(1 << 20), b""):
+                    h.update(chunk)
+            digest = h.hexdigest()
+            _atomic_write(sig_file, json.dumps({
+                "path": str(path), "size": stat.st_size,
+                "mtime_ns": stat.st_mtime_ns, "sha256": digest,
+            }).encode())
+        with _digests_lock:
+            _digests[memo_key] = digest
+    return stat.st_size, stat.st_mtime_ns, digest
+
+
+def _atomic_write(target: Path, data: bytes):
+    target.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=target.parent, prefix=target.name, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp, target)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+
+
+def _parser_key(parser: Callable) -> str:
+    """Hash of the parser's whole module, since parsers read module-level
+    helpers and tables that getsource(parser) alone would miss."""
+    try:
+        source = inspect.getsource(inspect.getmodule(parser)).encode()
+    except (OSError, TypeError):
+        source = parser.__code__.co_code
+    return hashlib.sha1(source + parser.__qualname__.encode()).hexdigest()[:12]
+
+
+def _entry_prefix(path: Path, sheet: str) -> str:
+    """Fixed-length prefix shared by every entry for one workbook sheet."""
+    return hashlib.sha1(f"{path.resolve()}\0{sheet}".encode()).hexdigest()[:16]
+
+
+def _prune_superseded(prefix: str, keep: Path):
+    for old in CACHE_DIR.glob(f"{prefix}-*.arrow"):
+        if old != keep:
+            old.unlink(missing_ok=True)
+
+
+# ---------------------------------------------------------------------------
+# Mixed-type columns
+#
+# Excel columns often hold dates in some cells and text like "2024-Q1" in
+# others. Arrow needs one type per column, so such columns are stored as
+# tagged strings and decoded back to the original Python values on load.
+# ---------------------------------------------------------------------------
+
+def _encode_value(value):
+    if value is None or (isinstance(value, float) and value != value):
+        return None
+    if isinstance(value, bool):
+        return f"b:{int(value)}"
+    if isinstance(value, int):
+        return f"i:{value}"
+    if isinstance(value, float):
+        return f"f:{value!r}"
+    if isinstance(value, pd.Timestamp):
+        return f"T:{value.isoformat()}"
+    if isinstance(value, dt.datetime):
+        return f"D:{value.isoformat()}"
+    if isinstance(value, dt.date):
+        return f"d:{value.isoformat()}"
+    if isinstance(value, dt.time):
+        return f"t:{value.isoformat()}"
+    return f"s:{value}"
+
+
+_DECODERS = {
+    "b": lambda v: bool(int(v)),
+    "i": int,
+    "f": float,
+    "T": pd.Timestamp,
+    "D": dt.datetime.fromisoformat,
+    "d": dt.date.fromisoformat,
+    "t": dt.time.fromisoformat,
+    "s": str,
+}
+
+
+def _decode_value(value):
+    if not isinstance(value, str):
+        return None     # missing values come back as None or NaN
+    tag, _, payload = value.partition(":")
+    return _DECODERS[tag](payload)
+
+
+def _to_arrow(df: pd.DataFrame) -> pa.Table:
+    df = df.copy()
+    mixed = []
+    for col in df.columns:
+        if df[col].dtype != object:
+            continue
+        try:
+            pa.array(df[col], from_pandas=True)
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            df[col] = df[col].map(_encode_value).astype(object)
+            mixed.append(col)
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    metadata = dict(table.schema.metadata or {})
+    metadata[_MIXED_KEY] = json.dumps(mixed).encode()
+    metadata[_ATTRS_KEY] = json.dumps(df.attrs, default=str).encode()
+    return table.replace_schema_metadata(metadata)
+
+
+def _from_arrow(table: pa.Table) -> pd.DataFrame:
+    metadata = table.schema.metadata or {}
+    df = table.to_pandas()
+    for col in json.loads(metadata.get(_MIXED_KEY, b"[]")):
+        df[col] = pd.Series([_decode_value(v) for v in df[col].to_numpy(dtype=object)],
+                            index=df.index, dtype=object)
+    df.attrs.update(json.loads(metadata.get(_ATTRS_KEY, b"{}")))
+    return df
+
+
+def cached_sheet(
+    path: Union[str, Path],
+    sheet: str,
+    parser: Callable[[Path], pd.DataFrame],
+) -> pd.DataFrame:
+    """Return ``parser(path)``, reusing the stored result while nothing changed.
+
+    ``parser`` reads ``sheet`` from the workbook at ``path`` and returns a
+    DataFrame; anything in ``df.attrs`` must be JSON-serializable and is kept.
+    """
+    path = Path(path)
+    _, _, digest = file_signature(path)
+    prefix = _entry_prefix(path, sheet)
+    entry = CACHE_DIR / f"{prefix}-{digest[:24]}-{_parser_key(parser)}.arrow"
+
+    if entry.exists():
+        try:
+            with pa.memory_map(str(entry), "r") as source:
+                return _from_arrow(pa.ipc.open_file(source).read_all())
+        except (OSError, pa.ArrowInvalid):
+            pass    # truncated or unreadable entry; rebuild it
+
+    df = parser(path)
+    if len(df) == 0:
+        return df   # not stored, so a failed read is retried next time
+    table = _to_arrow(df)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_file(sink, table.schema) as writer:
+        writer.write_table(table)
+    _atomic_write(entry, sink.getvalue().to_pybytes())
+    # Older workbook contents or parser versions are never read again
+    _prune_superseded(prefix, entry)
+    return df
+
+
+def clear_workbook_cache():
+    """Delete every cached sheet and file signature."""
+    with _digests_lock:
+        _digests.clear()
+    if CACHE_DIR.exists():
+        for entry in CACHE_DIR.iterdir():
+            if entry.suffix in (".arrow", ".sig"):
+                entry.unlink(missing_ok=True)